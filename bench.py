@@ -0,0 +1,35 @@
+import argparse
+import json
+from src.benchmark.scenario_runner import run_suite
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CyberSurvivor Pro 场景化性能基准")
+    parser.add_argument("scenarios", nargs="*", help="场景 ID (data/configs/scenarios)，缺省跑全部")
+    parser.add_argument("--duration", type=float, default=None, help="覆盖场景声明的时长 (秒)")
+    parser.add_argument("--render", action="store_true", help="同时测量渲染管线 (dummy 视频驱动)")
+    parser.add_argument("--trace-memory", action="store_true", help="用 tracemalloc 统计 Python 堆峰值 (较慢)")
+    parser.add_argument("--out", default=None, help="结果 JSON 路径，缺省打印到终端")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    from src.core.registry import registry
+    registry.load_all(load_assets=False)
+
+    ids = args.scenarios or sorted(registry.scenarios)
+    missing = [s for s in ids if s not in registry.scenarios]
+    if missing:
+        raise SystemExit(f"❌ 未知场景: {missing}，可用: {sorted(registry.scenarios)}")
+
+    results = run_suite([registry.scenarios[s] for s in ids], args.render, args.trace_memory, args.duration)
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"📊 [Bench] 结果已写入 {args.out}")
+    else:
+        print(text)
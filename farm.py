@@ -0,0 +1,40 @@
+import argparse
+from src.balance.policies import POLICIES
+from src.balance.run_farm import DEFAULT_WEAPON, build_jobs, run_farm, write_results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CyberSurvivor Pro 批量平衡模拟")
+    parser.add_argument("--chars", nargs="+", default=["all"], help="角色 ID 列表，all 表示全部")
+    parser.add_argument("--weapons", nargs="+", default=[DEFAULT_WEAPON],
+                        help=f"起手武器 ID 列表，{DEFAULT_WEAPON} 表示使用角色自带武器")
+    parser.add_argument("--policies", nargs="+", default=["first"], choices=sorted(POLICIES))
+    parser.add_argument("--seeds", type=int, default=10, help="每个组合跑多少个种子 (0..N-1)")
+    parser.add_argument("--seed-base", type=int, default=0, help="种子起点")
+    parser.add_argument("--duration", type=float, default=600.0, help="单局模拟时长上限 (秒)")
+    parser.add_argument("--workers", type=int, default=None, help="进程数 (默认全部核心)")
+    parser.add_argument("--out", default="data/farm/results.json", help="结果文件 (.json 列式 / .csv)")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    from src.core.registry import registry
+    registry.load_all(load_assets=False)
+
+    characters = list(registry.characters) if args.chars == ["all"] else args.chars
+    for char_id in characters:
+        if char_id not in registry.characters:
+            raise SystemExit(f"❌ 未知角色: {char_id}")
+    for weapon_id in args.weapons:
+        if weapon_id != DEFAULT_WEAPON and weapon_id not in registry.weapons:
+            raise SystemExit(f"❌ 未知武器: {weapon_id}")
+
+    seeds = range(args.seed_base, args.seed_base + args.seeds)
+    jobs = build_jobs(characters, args.weapons, args.policies, seeds, args.duration)
+    print(f"🚜 [Farm] 共 {len(jobs)} 局，开始分发...")
+
+    rows = run_farm(jobs, workers=args.workers)
+    write_results(rows, args.out)
+    print(f"📊 [Farm] 结果已写入 {args.out}")
@@ -1,5 +1,25 @@
+import argparse
+import json
 from src.core.engine import GameEngine
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CyberSurvivor Pro")
+    parser.add_argument("--headless", action="store_true", help="无窗口模式：不渲染，全速推进战斗逻辑")
+    parser.add_argument("--duration", type=float, default=1200.0, help="无头模式的模拟时长 (秒)")
+    parser.add_argument("--char", default=None, help="无头模式使用的角色 ID (默认第一个)")
+    parser.add_argument("--seed", type=int, default=None, help="战斗种子：相同种子的对局结果逐位一致")
+    parser.add_argument("--speed", type=float, default=1.0, help="窗口模式的快进倍率 (如 10 即 10 倍速)")
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
-    game = GameEngine()
-    game.run()
+    args = parse_args()
+    if args.headless:
+        from src.core.registry import registry
+        game = GameEngine(headless=True, seed=args.seed)
+        report = game.run_headless(args.duration, registry.characters.get(args.char))
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        game = GameEngine(seed=args.seed, time_scale=args.speed)
+        game.run()
@@ -0,0 +1,45 @@
+"""
+升级选卡策略：无头模拟时代替玩家做选择。
+规则：策略签名统一为 (options, rng) -> option，options 来自 UpgradePanel.options。
+"""
+
+
+def _prefer(options, order):
+    """按 type 优先级挑选，同优先级取抽到的第一张"""
+    for opt_type in order:
+        for opt in options:
+            if opt['type'] == opt_type:
+                return opt
+    return options[0]
+
+
+def pick_first(options, rng):
+    return options[0]
+
+
+def pick_random(options, rng):
+    return rng.choice(options)
+
+
+def pick_weapons_first(options, rng):
+    """优先升级已有武器，其次拿新武器，最后才选属性"""
+    return _prefer(options, ("weapon_evolution", "weapon_upgrade", "weapon_new", "stat"))
+
+
+def pick_new_weapons_first(options, rng):
+    """优先扩充武器槽"""
+    return _prefer(options, ("weapon_new", "weapon_evolution", "weapon_upgrade", "stat"))
+
+
+def pick_stats_first(options, rng):
+    return _prefer(options, ("stat", "weapon_evolution", "weapon_upgrade", "weapon_new"))
+
+
+# 一劳永逸：新增策略只需在这里登记
+POLICIES = {
+    "first": pick_first,
+    "random": pick_random,
+    "weapons_first": pick_weapons_first,
+    "new_weapons_first": pick_new_weapons_first,
+    "stats_first": pick_stats_first,
+}
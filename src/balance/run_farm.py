@@ -0,0 +1,126 @@
+"""
+批量平衡模拟 (Run Farm)：
+把 角色 × 起手武器 × 选卡策略 × 种子 的组合铺满所有 CPU 核心，
+每局都在无头 CombatScene 中以固定步长跑完，汇总成列式结果文件。
+"""
+import csv
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from src.balance.policies import POLICIES
+
+DEFAULT_WEAPON = "default"  # 使用角色 JSON 自带的起手武器
+
+# 每局结果的固定列 (顺序即输出顺序)，其后是按名称排序的动态列 dps.* / peak.*
+FIXED_COLUMNS = [
+    "character", "weapon", "policy", "seed",
+    "survival_time", "survived", "kills", "score", "level", "wall_time",
+]
+
+# 每个工作进程各持有一台无头引擎，只在进程启动时初始化一次
+_engine = None
+
+
+def _init_worker(quiet=True):
+    global _engine
+    if quiet:
+        # 数千局的升级/装备日志没有意义，工作进程里直接静音
+        sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    from src.core.engine import GameEngine
+    _engine = GameEngine(headless=True)
+
+
+def build_jobs(characters, weapons, policies, seeds, duration):
+    """笛卡尔积展开任务清单 (顺序固定，结果文件可按行对齐比较)"""
+    return [
+        {"character": c, "weapon": w, "policy": p, "seed": s, "duration": duration}
+        for c, w, p, s in itertools.product(characters, weapons, policies, seeds)
+    ]
+
+
+def _make_char_config(character_id, weapon_id):
+    from src.core.registry import registry
+    char_config = dict(registry.characters[character_id])
+    if weapon_id != DEFAULT_WEAPON:
+        # 覆盖起手武器：专属武器配置优先级更高，需要一并移除
+        char_config.pop("starting_weapon_config", None)
+        char_config["starting_weapon"] = weapon_id
+    return char_config
+
+
+def _sample_peaks(engine):
+    scene = engine.scene
+    scene.run_stats.sample_counts({
+        "enemies": scene.enemy_group,
+        "projectiles": len(scene.projectile_group) + scene.weapon_manager.batched_projectile_count(),
+        "gems": scene.gem_count(),
+        "sprites": scene.all_sprites,
+    })
+
+
+def run_job(job):
+    """在当前进程的无头引擎里跑一局，返回扁平化的一行结果"""
+    char_config = _make_char_config(job["character"], job["weapon"])
+    report = _engine.run_headless(job["duration"], char_config, POLICIES[job["policy"]],
+                                  on_tick=_sample_peaks, seed=job["seed"])
+    stats = _engine.scene.run_stats
+
+    row = {
+        "character": job["character"],
+        "weapon": job["weapon"],
+        "policy": job["policy"],
+        "seed": job["seed"],
+        "survival_time": report["sim_time"],
+        "survived": report["survived"],
+        "kills": stats.kills,
+        "score": report["score"],
+        "level": report["level"],
+        "wall_time": report["wall_time"],
+    }
+    for source_id, dps in stats.dps_by_source(report["sim_time"]).items():
+        row[f"dps.{source_id}"] = round(dps, 3)
+    for name, peak in stats.peak_counts.items():
+        row[f"peak.{name}"] = peak
+    return row
+
+
+def run_farm(jobs, workers=None, progress=True):
+    """
+    规则：ProcessPoolExecutor 扇出，executor.map 保证结果顺序与任务顺序一致。
+    workers: 进程数，None 表示使用全部核心
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    rows = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for i, row in enumerate(pool.map(run_job, jobs, chunksize=chunksize), 1):
+            rows.append(row)
+            if progress and (i == len(jobs) or i % max(1, len(jobs) // 10) == 0):
+                print(f"🧪 [Farm] {i}/{len(jobs)} 局完成")
+    return rows
+
+
+def to_columns(rows):
+    """行 -> 列：动态列 (dps.*, peak.*) 取并集，缺失值补 0"""
+    dynamic = sorted({k for row in rows for k in row} - set(FIXED_COLUMNS))
+    columns = FIXED_COLUMNS + dynamic if rows else []
+    return {col: [row.get(col, 0) for row in rows] for col in columns}
+
+
+def write_results(rows, path):
+    """按扩展名输出：.csv 为表格，其余为列式 JSON ({列名: [值, ...]})"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    columns = to_columns(rows)
+
+    if path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns.keys())
+            writer.writerows(zip(*columns.values()))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"rows": len(rows), "columns": columns}, f, ensure_ascii=False)
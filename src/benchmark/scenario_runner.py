@@ -0,0 +1,175 @@
+"""
+场景化性能基准：按 data/configs/scenarios 中的 JSON 布置战场，
+在无头 CombatScene 中以固定步长跑完，输出帧率、帧耗时分布与内存峰值。
+"""
+import math
+import platform
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+try:
+    import resource  # 仅类 Unix 平台可用
+except ImportError:
+    resource = None
+
+
+def _build_char_config(registry, scenario):
+    """以场景的第一把武器作为起手武器，避免角色自带武器混入测量"""
+    char_id = scenario.get("character")
+    char_config = dict(registry.characters.get(char_id) or next(iter(registry.characters.values())))
+    weapons = scenario.get("weapons", [])
+    if weapons:
+        char_config.pop("starting_weapon_config", None)
+        char_config["starting_weapon"] = weapons[0]["id"]
+    return char_config
+
+
+def _formation_points(formation, count, rng):
+    """阵型 -> 相对玩家的偏移坐标列表"""
+    kind = formation.get("formation", "ring")
+    radius = formation.get("radius", 600)
+    points = []
+
+    if kind == "ring":
+        for i in range(count):
+            angle = 360 * i / count
+            points.append(pygame.math.Vector2(1, 0).rotate(angle) * radius)
+    elif kind == "scatter":
+        # 环带内面积均匀分布
+        outer = formation.get("outer_radius", radius * 2)
+        for _ in range(count):
+            r = math.sqrt(rng.uniform(radius ** 2, outer ** 2))
+            points.append(pygame.math.Vector2(1, 0).rotate(rng.uniform(0, 360)) * r)
+    else:
+        print(f"⚠️ 未知阵型: {kind}")
+    return points
+
+
+def setup_scenario(engine, scenario):
+    """规则：把场景 JSON 落地到一个全新的 CombatScene 上"""
+    from src.core.registry import registry
+
+    engine.switch_scene("COMBAT", _build_char_config(registry, scenario), scenario.get("seed", 0))
+    scene = engine.scene
+    scene.spawn_enabled = scenario.get("spawning", True)
+
+    if "player_hp" in scenario:
+        # 上限同步抬高，否则 HUD 血条按 当前/上限 比例会画出超长的圆角矩形
+        scene.player.stats.max_health.base_value = scenario["player_hp"]
+        scene.player.current_hp = scenario["player_hp"]
+
+    # 1. 武器：按声明顺序装配，并直接设定到目标等级
+    for w in scenario.get("weapons", []):
+        scene.weapon_manager.add_or_upgrade_weapon(w["id"])
+        weapon = scene.weapon_manager.weapons.get(w["id"])
+        if weapon and "level" in w:
+            weapon.level = min(w["level"], weapon.max_level)
+            weapon.init_stats()
+
+    # 2. 预置敌群
+    rng = scene.rng.get("scenario")
+    for formation in scenario.get("enemies", []):
+        for offset in _formation_points(formation, formation.get("count", 0), rng):
+            scene.spawn_enemy_at(formation["id"], scene.player.pos + offset)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return round(peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024, 1)
+
+
+def run_scenario(scenario, render=False, trace_memory=False, duration=None):
+    """
+    在当前进程里跑一个场景并返回报告。
+    render: 同时走一遍渲染管线 (SDL dummy 驱动)，衡量 CameraGroup 等绘制开销
+    trace_memory: 用 tracemalloc 统计 Python 堆峰值 (会拖慢帧率，仅在需要时开启)
+    """
+    from src.core.engine import GameEngine
+    from src.core.profiler import FrameProfiler
+    from src.core.constants import SIM_DT
+    from src.core.sprite_cache import sprite_cache
+    from src.core.event_bus import bus
+    from src.core.registry import registry
+
+    if render:
+        import os
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    engine = GameEngine(headless=not render)
+    setup_scenario(engine, scenario)
+
+    duration = duration or scenario.get("duration", 60)
+    max_ticks = int(duration / SIM_DT)
+    engine.profiler = FrameProfiler(size=max_ticks)
+    engine.profiler.enabled = True
+    scene = engine.scene
+
+    bus.reset_stats()
+    if trace_memory:
+        tracemalloc.start()
+
+    ticks = 0
+    start = time.perf_counter()
+    while ticks < max_ticks:
+        engine.step(SIM_DT, render=render)
+
+        projectiles = len(scene.projectile_group) + scene.weapon_manager.batched_projectile_count()
+        scene.run_stats.sample_counts({"enemies": scene.enemy_group, "projectiles": projectiles,
+                                       "gems": scene.gem_count(), "sprites": scene.all_sprites})
+        ticks += 1
+    wall_time = time.perf_counter() - start
+
+    py_heap_peak = None
+    if trace_memory:
+        py_heap_peak = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+
+    summary = engine.profiler.summary()
+    return {
+        "id": scenario.get("id"),
+        "name": scenario.get("name", ""),
+        "render": render,
+        "ticks": ticks,
+        "sim_time": round(ticks * SIM_DT, 3),
+        "wall_time": round(wall_time, 3),
+        "fps": round(ticks / wall_time, 1) if wall_time > 0 else 0.0,
+        "frame_ms": {k: round(v, 3) for k, v in summary["frame_ms"].items()},
+        "sections_ms": {name: {k: round(v, 4) for k, v in stat.items()}
+                        for name, stat in summary["sections_ms"].items()},
+        "peak_counts": dict(scene.run_stats.peak_counts),
+        "pools": {name: pool.stats() for name, pool in scene.pools.items()},
+        "gem_field": scene.gem_field.stats() if scene.gem_field is not None else None,
+        "sprite_cache": sprite_cache.stats(),
+        "event_bus": bus.stats(),
+        "textures": registry.texture_stats(),
+        "peak_rss_mb": _peak_rss_mb(),
+        "py_heap_peak_mb": py_heap_peak,
+    }
+
+
+def run_suite(scenarios, render=False, trace_memory=False, duration=None):
+    """
+    规则：每个场景跑在独立的子进程里。
+    这样内存峰值互不累加，全局缓存 (registry、贴图) 也不会跨场景预热。
+    """
+    reports = []
+    for scenario in scenarios:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            report = pool.submit(run_scenario, scenario, render, trace_memory, duration).result()
+        print(f"⏱️ [Bench] {report['id']}: {report['fps']} fps, "
+              f"p95 {report['frame_ms']['p95']} ms, 峰值敌人 {report['peak_counts'].get('enemies', 0)}")
+        reports.append(report)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "scenarios": reports,
+    }
@@ -0,0 +1,113 @@
+class CollisionSystem:
+    """
+    统一宽相碰撞 (Broad-phase)：
+    - 所有参与碰撞的层在一次遍历中装入同一张均匀网格
+    - 按碰撞矩阵 (哪些层互相作用) 只在同一格子内做 rect 精确检测
+    - 一对实体跨多个格子时，只在“相交区域左上角所在的格子”里上报，天然去重
+    成本随“同格实体数”增长，而不是 敌人数 × 子弹数。
+    - detect(pairs) 可只检测矩阵的一部分，用于分阶段结算 (前一阶段的处理会改变后一阶段的实体)
+    - 非精灵层 (add_source) 自带检测，不进共享网格，但接触对同样按矩阵产出
+    """
+
+    def __init__(self, matrix, cell_size=64):
+        self.cell_size = cell_size
+        self.matrix = [tuple(pair) for pair in matrix]
+        self.layers = {}  # { '层名': 可迭代的精灵集合 (Group / GroupSingle) }
+        self.sources = {}  # { '层名': detect(对方精灵集合) -> [(对方精灵, 条目)] }
+
+    def add_layer(self, name, group):
+        self.layers[name] = group
+
+    def add_source(self, name, detect):
+        """
+        注册非精灵层 (如 ProjectileBatch 的数组弹丸)：detect(对方精灵集合) 返回 [(对方精灵, 条目)]。
+        规则：矩阵里非精灵层写在层对的第二位
+        """
+        self.sources[name] = detect
+
+    def detect(self, pairs=None):
+        """
+        返回 { (层A, 层B): [(精灵A, 精灵B), ...] }，检测的每一对都有键 (可能为空列表)。
+        pairs: 只检测这些层对 (默认整个矩阵)
+        结果顺序只取决于各组的迭代顺序，保持可复现。
+        """
+        cs = self.cell_size
+        matrix = self.matrix if pairs is None else [tuple(pair) for pair in pairs]
+        contacts = {pair: [] for pair in matrix}
+
+        # 0. 非精灵层自行检测，其余层对走共享网格
+        for pair in matrix:
+            if pair[1] in self.sources:
+                contacts[pair] = self.sources[pair[1]](self.layers[pair[0]])
+        matrix = [pair for pair in matrix if pair[1] not in self.sources]
+        active = [name for name in self.layers if any(name in pair for pair in matrix)]
+        if not active: return contacts
+
+        # 1. 最大的一层 (通常是敌人) 不入桶，只在最后“探测”已占用的格子
+        #    规则：同层互撞的层必须入桶，不能作为探测层
+        self_paired = {a for a, b in matrix if a == b}
+        candidates = [n for n in active if n not in self_paired]
+        probe = max(candidates, key=lambda n: len(self.layers[n])) if candidates else None
+
+        # 2. 其余层单次遍历装桶：cells[(cx, cy)][层名] = [sprite, ...]
+        cells = {}
+        for name in active:
+            if name == probe: continue
+            for sprite in self.layers[name]:
+                r = sprite.rect
+                for cx in range(r.left // cs, (r.right - 1) // cs + 1):
+                    for cy in range(r.top // cs, (r.bottom - 1) // cs + 1):
+                        cell = cells.get((cx, cy))
+                        if cell is None:
+                            cells[(cx, cy)] = {name: [sprite]}
+                        elif name in cell:
+                            cell[name].append(sprite)
+                        else:
+                            cell[name] = [sprite]
+
+        # 3. 入桶层之间按矩阵逐格配对
+        for key, cell in cells.items():
+            for pair in matrix:
+                if pair[0] == probe or pair[1] == probe: continue
+                group_a = cell.get(pair[0])
+                group_b = cell.get(pair[1])
+                if not group_a or not group_b: continue
+                out = contacts[pair]
+                for a in group_a:
+                    for b in group_b:
+                        if a is not b and self._owns(a.rect, b.rect, key):
+                            out.append((a, b))
+
+        # 4. 探测层：每个精灵只看自己覆盖且已有其他层的格子
+        if probe is None or not cells: return contacts
+        partners = [(pair, pair[1] if pair[0] == probe else pair[0], pair[0] == probe)
+                    for pair in matrix if probe in pair]
+        xs = [k[0] for k in cells]
+        ys = [k[1] for k in cells]
+        min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+        for sprite in self.layers[probe]:
+            r = sprite.rect
+            x0, x1 = r.left // cs, (r.right - 1) // cs
+            y0, y1 = r.top // cs, (r.bottom - 1) // cs
+            # 先用已占用格子的包围盒粗筛，绝大多数远处敌人在这里直接跳过
+            if x1 < min_x or x0 > max_x or y1 < min_y or y0 > max_y: continue
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is None: continue
+                    for pair, other, probe_first in partners:
+                        group = cell.get(other)
+                        if not group: continue
+                        out = contacts[pair]
+                        for o in group:
+                            if self._owns(r, o.rect, (cx, cy)):
+                                out.append((sprite, o) if probe_first else (o, sprite))
+        return contacts
+
+    def _owns(self, ra, rb, key):
+        """两个 rect 相交，且相交区域左上角落在 key 这个格子里 (保证每对只报一次)"""
+        if not ra.colliderect(rb): return False
+        cs = self.cell_size
+        ix = ra.left if ra.left > rb.left else rb.left
+        iy = ra.top if ra.top > rb.top else rb.top
+        return ix // cs == key[0] and iy // cs == key[1]
@@ -5,6 +5,11 @@ class CombatUtils:
     @staticmethod
     def get_nearest_enemy(origin_pos, enemy_group):
         """在指定的敌人组中寻找距离原点最近的敌人"""
+        # 带空间索引的组 (EnemyGroup) 走网格查询，普通组退回线性扫描
+        index = getattr(enemy_group, 'index', None)
+        if index is not None:
+            return index.nearest(origin_pos)
+
         nearest_enemy = None
         min_dist = float('inf')
 
@@ -15,4 +20,20 @@ class CombatUtils:
                 min_dist = dist
                 nearest_enemy = enemy
 
-        return nearest_enemy
\ No newline at end of file
+        return nearest_enemy
+
+    @staticmethod
+    def get_k_nearest_enemies(origin_pos, enemy_group, k):
+        """最近的 k 个敌人 (按距离升序)"""
+        index = getattr(enemy_group, 'index', None)
+        if index is not None:
+            return index.k_nearest(origin_pos, k)
+        return sorted(enemy_group, key=lambda e: origin_pos.distance_to(e.pos))[:k]
+
+    @staticmethod
+    def get_enemies_in_radius(origin_pos, radius, enemy_group):
+        """范围扫描：距离原点不超过 radius 的所有敌人"""
+        index = getattr(enemy_group, 'index', None)
+        if index is not None:
+            return index.query_radius(origin_pos, radius)
+        return [e for e in enemy_group if origin_pos.distance_to(e.pos) <= radius]
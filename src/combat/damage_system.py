@@ -1,15 +1,15 @@
 import pygame
-import random
 from src.core.event_bus import bus
 
 
 class DamageSystem:
     @staticmethod
-    def apply_damage(engine, victim, base_amount, attacker_config=None, player=None):
+    def apply_damage(engine, victim, base_amount, attacker_config=None, player=None, source=None):
         """
         [维度 4, 5, 6, 10, 11, 12] 综合伤害解释器
         base_amount: 基础伤害数值
         attacker_config: 发起攻击的武器/子弹 JSON 配置
+        source: 伤害来源 ID (用于统计)，缺省时取 attacker_config 的 id
         """
         if not victim or not victim.alive(): return False
 
@@ -34,8 +34,16 @@ class DamageSystem:
         # --- 2. 物理扣血执行 ---
         is_dead = victim.take_damage(final_damage)
 
+        # 战斗统计：按来源累计伤害与击杀 (批量模拟用来算每把武器的 DPS)
+        if source is None and attacker_config:
+            source = attacker_config.get('id', attacker_config.get('weapon_id'))
+        run_stats = getattr(engine.scene, 'run_stats', None)
+        if run_stats is not None:
+            run_stats.record_damage(source or "unknown", final_damage, is_dead)
+
         # --- 3. 视觉打击感注入 (维度 12) ---
-        if attacker_config:
+        # 无头模式下没有画面，震屏和 Hit Stop 都跳过 (后者会阻塞整个模拟)
+        if attacker_config and not engine.headless:
             visuals = attacker_config.get("visuals", {})
             # 屏幕震动
             if "shake_intensity" in visuals:
@@ -45,14 +53,15 @@ class DamageSystem:
                 # 这种微小的停顿能极大地提升打击感
                 pygame.time.delay(int(visuals["hit_stop_duration"]))
 
-        # 弹出伤害数字
-        engine.ui_manager.spawn_damage_text(victim.rect.center, final_damage)
+        # 弹出伤害数字 (同目标同来源的连续伤害会合并；被协同/条件增幅的一击按暴击单独显示)
+        engine.ui_manager.spawn_damage_text(victim.rect.center, final_damage, victim=victim,
+                                            source=source, crit=final_damage > base_amount)
 
         # --- 4. 事件钩子点火 (维度 6) ---
         if attacker_config and "events" in attacker_config:
             for hook in attacker_config["events"]:
                 if hook["trigger"] == "on_hit":
-                    if random.random() < hook.get("chance", 1.0):
+                    if engine.scene.rng.get("damage").random() < hook.get("chance", 1.0):
                         DamageSystem._execute_proc(engine, hook, victim, player)
 
         # --- 5. 死亡判定与特权处理 (维度 5) ---
@@ -113,7 +122,13 @@ class DamageSystem:
             sub_id = hook.get("id")
             sub_config = registry.weapons.get(sub_id)
             if sub_config:
-                AreaEffectEntity(victim.rect.center, [engine.scene.all_sprites], player, sub_config)
+                sub_spec = registry.weapon_spec(sub_id)  # 缓存的规格，热路径里不再重新编译
+                pools = getattr(engine.scene, 'pools', None)
+                if pools:
+                    pools["area_effects"].acquire(victim.rect.center, [engine.scene.all_sprites], player, sub_config,
+                                                  sub_spec)
+                else:
+                    AreaEffectEntity(victim.rect.center, [engine.scene.all_sprites], player, sub_config, sub_spec)
 
         # 动作 B: 施加减速/眩晕等 Debuff
         elif action == "apply_debuff":
@@ -0,0 +1,44 @@
+try:
+    import numpy as np
+except ImportError:  # 没装 numpy 时不编译，武器退回 UniversalProjectile
+    np = None
+
+# 阶段类型编码 (与 UniversalProjectile._move 的分支一一对应)
+PHASE_NONE = -1  # 未知类型：只计时，不移动
+PHASE_LINEAR = 0
+PHASE_ROTATE = 1
+PHASE_HOMING_PLAYER = 2
+
+PHASE_KINDS = {
+    "linear": PHASE_LINEAR,
+    "rotate": PHASE_ROTATE,
+    "homing_player": PHASE_HOMING_PLAYER,
+}
+
+DEFAULT_PHASES = [{"type": "linear", "speed": 800, "duration": 2.0}]
+
+
+class MotionProgram:
+    """
+    编译后的弹道程序：logic.phases 在装配时解析一次，每个阶段一行、每个参数一列。
+    规则：
+    - 缺省值与 UniversalProjectile 逐帧 .get() 的缺省值完全一致
+    - 末尾追加一行“结束哨兵” (时长无穷、不移动)，阶段下标越界时也能安全查表
+    """
+
+    def __init__(self, phases):
+        self.length = len(phases)
+        rows = list(phases) + [{"type": None, "duration": float("inf")}]
+
+        self.kind = np.array([PHASE_KINDS.get(p.get("type", "linear"), PHASE_NONE) for p in rows], dtype=np.int8)
+        self.duration = np.array([p.get("duration", 1.0) for p in rows], dtype=float)
+        self.speed = np.array([p.get("speed", 600) for p in rows], dtype=float)
+        self.rotation_speed = np.array([p.get("rotation_speed", 10) for p in rows], dtype=float)
+        self.radius = np.array([p.get("radius", 30) for p in rows], dtype=float)
+        self.speed_start = np.array([p.get("speed_start", 200) for p in rows], dtype=float)
+        self.accel = np.array([p.get("accel", 500) for p in rows], dtype=float)
+
+    @classmethod
+    def from_config(cls, weapon_config):
+        logic_node = weapon_config.get("logic", {})
+        return cls(logic_node.get("phases", DEFAULT_PHASES))
@@ -0,0 +1,241 @@
+import pygame
+from src.combat.projectiles.motion_program import (
+    np, MotionProgram, PHASE_LINEAR, PHASE_ROTATE, PHASE_HOMING_PLAYER
+)
+from src.combat.damage_system import DamageSystem
+from src.core.sprite_cache import sprite_cache
+
+HOMING_CATCH_DIST = 20  # 回旋镖飞回玩家身边多近时回收
+ENEMY_REACH = 48  # 候选敌人的中心距离余量 (覆盖常规敌人 rect 的半对角线)
+
+
+class ProjectileBatch:
+    """
+    向量化弹丸引擎：一把武器的所有在飞弹丸放在 NumPy 数组里批量推进。
+    - 数据：pos / dir / 阶段下标 / 阶段计时 / 伤害，按行紧凑存放
+    - 运动：按 MotionProgram 查表，同类阶段一次性计算
+    - 碰撞：先用敌人网格的占用情况向量化粗筛，只有附近有敌人的弹丸才逐个精确检测 (在场景的碰撞阶段按矩阵调用)
+    - 绘制：同一张贴图，一次 blits
+    规则：时序与 UniversalProjectile 一致 (切换阶段的那一步不移动，走完全部阶段后下一步移除)
+    """
+
+    def __init__(self, player, weapon_config, capacity=64):
+        self.player = player
+        self.config = weapon_config
+        self.program = MotionProgram.from_config(weapon_config)
+        self.count = 0
+        self._alloc(capacity)
+        self._init_visuals()
+
+    def __len__(self):
+        return self.count
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.dir = np.zeros((capacity, 2))
+        self.phase = np.zeros(capacity, dtype=np.int32)
+        self.timer = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+
+    def _columns(self):
+        return (self.pos, self.dir, self.phase, self.timer, self.damage)
+
+    def _init_visuals(self):
+        viz = self.config.get("visuals", {})
+        size = viz.get("bullet_size", [15, 15])
+        color = viz.get("color", [255, 255, 255])
+        self.image = sprite_cache.shape("circle", size, color)
+        self.size = (size[0], size[1])
+        # rect.center = 取整坐标 时的左上角偏移
+        self.half = np.array((size[0] // 2, size[1] // 2))
+
+        # visuals.oriented: 按发射方向取预旋转帧；装配时一次性生成全部角度
+        self.frames = None
+        if viz.get("oriented"):
+            rotations = sprite_cache.rotations(self.image, viz.get("rotation_buckets"))
+            self.frames = rotations.prerender()
+            self.frame_step = rotations.step
+            self.frame_half = np.array([(f.get_width() // 2, f.get_height() // 2) for f in self.frames])
+
+    def reload(self):
+        """热重载：按 (已原地更新的) 配置重新编译弹道与贴图；在飞弹丸的阶段下标收拢到新程序范围内"""
+        self.program = MotionProgram.from_config(self.config)
+        self._init_visuals()
+        n = self.count
+        np.minimum(self.phase[:n], self.program.length, out=self.phase[:n])
+
+    # --- 生成与回收 ---
+
+    def spawn(self, pos, direction, damage):
+        if self.count == self.capacity:
+            old = self._columns()
+            n = self.count
+            self._alloc(self.capacity * 2)
+            for new, arr in zip(self._columns(), old):
+                new[:n] = arr[:n]
+        i = self.count
+        self.pos[i] = (pos[0], pos[1])
+        self.dir[i] = (direction[0], direction[1])
+        self.phase[i] = 0
+        self.timer[i] = 0.0
+        self.damage[i] = damage
+        self.count += 1
+
+    def _compact(self, keep):
+        """只保留 keep 为 True 的行 (保持原有顺序，结果可复现)"""
+        n = self.count
+        k = int(keep.sum())
+        if k == n: return
+        for arr in self._columns():
+            arr[:k] = arr[:n][keep]
+        self.count = k
+
+    def clear(self):
+        self.count = 0
+
+    # --- 批量推进 ---
+
+    def update(self, dt):
+        n = self.count
+        if n == 0: return
+        prog = self.program
+
+        # 1. 上一步已走完全部阶段的弹丸在这一步移除
+        finished = self.phase[:n] >= prog.length
+        if finished.any():
+            self._compact(~finished)
+            n = self.count
+            if n == 0: return
+
+        # 2. 计时与阶段切换 (切换的这一步不移动)
+        phase = self.phase[:n]
+        timer = self.timer[:n]
+        timer += dt
+        switch = timer >= prog.duration[phase]
+        phase[switch] += 1
+        timer[switch] = 0.0
+
+        moving = ~switch
+        kind = prog.kind[phase]
+        pos = self.pos[:n]
+
+        # 3. 直线
+        mask = moving & (kind == PHASE_LINEAR)
+        if mask.any():
+            step = prog.speed[phase[mask]] * dt
+            pos[mask] += self.dir[:n][mask] * step[:, None]
+
+        # 4. 旋转 (角度由模拟时钟驱动，同阶段参数的弹丸步调一致)
+        mask = moving & (kind == PHASE_ROTATE)
+        if mask.any():
+            angle = self.player.clock.get_ticks() * 0.01 * prog.rotation_speed[phase[mask]]
+            step = prog.radius[phase[mask]] * dt
+            pos[mask] += np.stack((np.cos(angle), np.sin(angle)), axis=1) * step[:, None]
+
+        # 5. 追踪玩家 (回旋镖返程)，足够近时回收
+        mask = moving & (kind == PHASE_HOMING_PLAYER)
+        if mask.any():
+            idx = np.nonzero(mask)[0]
+            p = self.player.pos
+            to_player = np.array((p.x, p.y)) - pos[idx]
+            dist = np.sqrt(to_player[:, 0] * to_player[:, 0] + to_player[:, 1] * to_player[:, 1])
+            ok = dist > 0
+            idx, to_player, dist = idx[ok], to_player[ok], dist[ok]
+            speed = prog.speed_start[phase[idx]] + prog.accel[phase[idx]] * timer[idx]
+            pos[idx] += to_player / dist[:, None] * (speed * dt)[:, None]
+            caught = dist < HOMING_CATCH_DIST
+            if caught.any():
+                keep = np.ones(n, dtype=bool)
+                keep[idx[caught]] = False
+                self._compact(keep)
+
+    # --- 碰撞 ---
+
+    def contacts(self, enemies):
+        """
+        只检测不结算：返回 [(敌人, 行号)]，按行号、再按查询顺序排列。
+        由 CollisionSystem 的非精灵层在碰撞阶段调用，结算交给 resolve()
+        """
+        n = self.count
+        if n == 0: return []
+        index = getattr(enemies, 'index', None)
+        if index is not None and index.bounds is None: return []
+
+        candidates = range(n) if index is None else self._near_enemy_rows(index)
+        w, h = self.size
+        reach = (w * w + h * h) ** 0.5 / 2 + ENEMY_REACH
+        centers = np.rint(self.pos[:n]).astype(np.int64)
+        rect = pygame.Rect(0, 0, w, h)
+        pairs = []
+
+        for i in candidates:
+            cx, cy = int(centers[i, 0]), int(centers[i, 1])
+            rect.center = (cx, cy)
+            if index is not None:
+                near = index.query_radius((float(self.pos[i, 0]), float(self.pos[i, 1])), reach)
+            else:
+                near = enemies
+            pairs.extend((e, i) for e in near if e.alive() and rect.colliderect(e.rect))
+        return pairs
+
+    def resolve(self, pairs, engine):
+        """
+        结算 contacts() 的结果：命中即消耗 (与 UniversalProjectile.on_hit 一致)，一发可同时命中重叠的多个敌人。
+        规则：结算时已死的敌人跳过；一个活着的目标都没打到的弹丸继续飞行
+        """
+        spent = set()
+        for enemy, i in pairs:
+            if not enemy.alive(): continue
+            DamageSystem.apply_damage(engine, enemy, float(self.damage[i]), attacker_config=self.config,
+                                      player=self.player)
+            spent.add(i)
+
+        if spent:
+            keep = np.ones(self.count, dtype=bool)
+            keep[list(spent)] = False
+            self._compact(keep)
+
+    def _near_enemy_rows(self, index):
+        """向量化粗筛：只返回落在“有敌人的格子或其邻格”里的弹丸行号"""
+        cs = index.cell_size
+        occupied = set()
+        for cx, cy in index.cells:
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    occupied.add(((cx + dx) << 32) + (cy + dy))
+        keys = (self.pos[:self.count] // cs).astype(np.int64)
+        codes = (keys[:, 0] << 32) + keys[:, 1]
+        hit = np.isin(codes, np.fromiter(occupied, dtype=np.int64, count=len(occupied)))
+        return np.nonzero(hit)[0].tolist()
+
+    # --- 绘制 ---
+
+    def draw(self, screen, camera_offset):
+        n = self.count
+        if n == 0: return
+        ox, oy = camera_offset.x, camera_offset.y
+        centers = np.rint(self.pos[:n]).astype(np.int64)
+
+        atlas = sprite_cache.atlas
+        if self.frames is None:
+            image, area = atlas.source(self.image)
+            top_left = (centers - self.half).tolist()
+            screen.blits([(image, (x - ox, y - oy), area) for x, y in top_left], doreturn=False)
+            return
+
+        # 与 Vector2.angle_to((1, 0)) 同口径的角度，再落到最近的角度桶
+        d = self.dir[:n]
+        angle = -np.degrees(np.arctan2(d[:, 1], d[:, 0]))
+        buckets = np.rint(angle / self.frame_step).astype(np.int64) % len(self.frames)
+        top_left = (centers - self.frame_half[buckets]).tolist()
+        frames = [atlas.source(f) for f in self.frames]
+        screen.blits([(frames[b][0], (x - ox, y - oy), frames[b][1]) for b, (x, y) in zip(buckets.tolist(), top_left)],
+                     doreturn=False)
+
+
+def create_batch(player, weapon_config):
+    """有 numpy 时返回批量弹丸引擎，否则返回 None (武器退回逐个 UniversalProjectile)"""
+    if np is None:
+        return None
+    return ProjectileBatch(player, weapon_config)
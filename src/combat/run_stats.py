@@ -0,0 +1,30 @@
+class RunStats:
+    """
+    单局战斗统计：由 CombatScene 持有，DamageSystem 负责写入。
+    供无头批量模拟 (balance farm) 汇总 DPS、击杀和实体峰值。
+    """
+
+    def __init__(self):
+        self.kills = 0
+        self.damage_by_source = {}  # { 'weapon_id': 累计伤害 }
+        self.kills_by_source = {}
+        self.peak_counts = {}  # { 'enemies': 峰值数量, ... }
+
+    def record_damage(self, source_id, amount, killed):
+        self.damage_by_source[source_id] = self.damage_by_source.get(source_id, 0.0) + amount
+        if killed:
+            self.kills += 1
+            self.kills_by_source[source_id] = self.kills_by_source.get(source_id, 0) + 1
+
+    def sample_counts(self, groups):
+        """groups: { '名称': 精灵组 或 已算好的数量 }，记录每个组出现过的最大实体数"""
+        peaks = self.peak_counts
+        for name, group in groups.items():
+            n = group if isinstance(group, int) else len(group)
+            if n > peaks.get(name, 0):
+                peaks[name] = n
+
+    def dps_by_source(self, sim_time):
+        if sim_time <= 0:
+            return {k: 0.0 for k in self.damage_by_source}
+        return {k: v / sim_time for k, v in self.damage_by_source.items()}
@@ -0,0 +1,164 @@
+import heapq
+import math
+import pygame
+
+
+class SpatialHash:
+    """
+    均匀网格空间哈希：把实体按坐标落入 cell_size 见方的格子。
+    规则：
+    - 每个逻辑步整体重建一次 (rebuild)，查询只扫描覆盖到的格子
+    - 格子只用来筛候选，最终距离判定读实体当前的 pos，结果与线性扫描一致
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # { (cx, cy): [item, ...] }
+        # 已占用格子的包围范围，最近邻搜索据此判断何时停止外扩
+        self.bounds = None
+
+    def clear(self):
+        self.cells = {}
+        self.bounds = None
+
+    def rebuild(self, items):
+        """按 item.pos 重新装桶 (热路径：内联 insert，减少属性查找)"""
+        self.clear()
+        cs = self.cell_size
+        cells = self.cells
+        for item in items:
+            p = item.pos
+            key = (int(p.x // cs), int(p.y // cs))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [item]
+                self._grow_bounds(key)
+            else:
+                bucket.append(item)
+
+    def rebuild_cells(self, items, keys):
+        """按预先算好的格子坐标装桶 (EnemySwarm 一次向量化算出全部 key)"""
+        self.clear()
+        cells = self.cells
+        for item, key in zip(items, keys):
+            key = tuple(key)
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [item]
+                self._grow_bounds(key)
+            else:
+                bucket.append(item)
+
+    def insert(self, item, x, y):
+        cs = self.cell_size
+        key = (int(x // cs), int(y // cs))
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+            self._grow_bounds(key)
+        else:
+            bucket.append(item)
+
+    def _grow_bounds(self, key):
+        cx, cy = key
+        if self.bounds is None:
+            self.bounds = [cx, cy, cx, cy]
+            return
+        b = self.bounds
+        if cx < b[0]: b[0] = cx
+        if cy < b[1]: b[1] = cy
+        if cx > b[2]: b[2] = cx
+        if cy > b[3]: b[3] = cy
+
+    # --- 查询接口 ---
+
+    def query_radius(self, pos, radius):
+        """返回距离 pos 不超过 radius 的全部存活实体"""
+        cs = self.cell_size
+        px, py = pos[0], pos[1]
+        r2 = radius * radius
+        cells = self.cells
+        result = []
+
+        for cx in range(int((px - radius) // cs), int((px + radius) // cs) + 1):
+            for cy in range(int((py - radius) // cs), int((py + radius) // cs) + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket: continue
+                for item in bucket:
+                    p = item.pos
+                    dx, dy = p.x - px, p.y - py
+                    if dx * dx + dy * dy <= r2 and item.alive():
+                        result.append(item)
+        return result
+
+    def _ring(self, ocx, ocy, k):
+        """以 (ocx, ocy) 为中心、切比雪夫距离恰为 k 的一圈格子"""
+        if k == 0:
+            yield ocx, ocy
+            return
+        for cx in range(ocx - k, ocx + k + 1):
+            yield cx, ocy - k
+            yield cx, ocy + k
+        for cy in range(ocy - k + 1, ocy + k):
+            yield ocx - k, cy
+            yield ocx + k, cy
+
+    def _max_ring(self, ocx, ocy):
+        b = self.bounds
+        return max(abs(ocx - b[0]), abs(ocx - b[2]), abs(ocy - b[1]), abs(ocy - b[3]))
+
+    def k_nearest(self, pos, k, max_radius=None):
+        """
+        由近及远逐圈外扩，收集最近的 k 个实体 (按距离升序)。
+        第 r 圈之外的实体距离至少为 r * cell_size，据此提前结束搜索。
+        """
+        if self.bounds is None or k <= 0:
+            return []
+        cs = self.cell_size
+        px, py = pos[0], pos[1]
+        ocx, ocy = int(px // cs), int(py // cs)
+        limit = max_radius * max_radius if max_radius is not None else math.inf
+        max_ring = self._max_ring(ocx, ocy)
+        if max_radius is not None:
+            max_ring = min(max_ring, int(max_radius // cs) + 1)
+
+        found = []  # (dist2, 序号, item)，序号保证同距离时顺序稳定
+        seq = 0
+        for ring in range(max_ring + 1):
+            for key in self._ring(ocx, ocy, ring):
+                bucket = self.cells.get(key)
+                if not bucket: continue
+                for item in bucket:
+                    p = item.pos
+                    dx, dy = p.x - px, p.y - py
+                    d2 = dx * dx + dy * dy
+                    if d2 <= limit and item.alive():
+                        found.append((d2, seq, item))
+                        seq += 1
+            if len(found) >= k:
+                best = heapq.nsmallest(k, found)
+                reach = ring * cs
+                if best[-1][0] <= reach * reach:
+                    return [item for _, _, item in best]
+        return [item for _, _, item in heapq.nsmallest(k, found)]
+
+    def nearest(self, pos, max_radius=None):
+        result = self.k_nearest(pos, 1, max_radius)
+        return result[0] if result else None
+
+
+class EnemyGroup(pygame.sprite.Group):
+    """带空间索引的敌人组：由 CombatScene 每个逻辑步调用 rebuild_index()"""
+
+    def __init__(self, *sprites, cell_size=128, swarm=None):
+        super().__init__(*sprites)
+        self.index = SpatialHash(cell_size)
+        self.swarm = swarm  # 有集群时直接从数组装桶
+
+    def rebuild_index(self):
+        swarm = self.swarm
+        # 规则：只有全部成员都在集群里时才走数组路径 (混入的独立敌人按对象装桶)
+        if swarm is not None and swarm.count == len(self):
+            self.index.rebuild_cells(swarm.members, swarm.cells(self.index.cell_size))
+        else:
+            self.index.rebuild(self.sprites())
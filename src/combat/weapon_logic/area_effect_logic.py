@@ -7,26 +7,44 @@ from src.entities.area_effect import AreaEffectEntity
 @registry.register_logic("AreaEffectEntity")
 class AreaEffectWeapon(BaseWeapon):
     def __init__(self, player, groups, config):
-        super().__init__(player, groups, config)
         self.aura_inst = None
+        super().__init__(player, groups, config)
 
         # 核心修复：从所有组中筛选出渲染组(CameraGroup)，排除碰撞组(projectile_group)
         # 这样 AreaEffectEntity 就只会画出来，而不会被当作子弹去撞人
         from src.core.camera import CameraGroup
         self.render_groups = [g for g in self.groups if isinstance(g, CameraGroup)]
 
+    def init_stats(self):
+        super().init_stats()
+        # 升级后常驻光环立即换用新等级的规格
+        if self.aura_inst is not None:
+            self.aura_inst.spec = self.spec
+
+    def reload_config(self):
+        super().reload_config()
+        # 常驻光环的参数在生成时读取，回收后下一步按新配置重建
+        if self.aura_inst and self.aura_inst.alive():
+            self.aura_inst.kill()
+        self.aura_inst = None
+
     def update(self, dt, enemies):
-        now = pygame.time.get_ticks()
-        is_attached = self.config.get("behavior", {}).get("is_attached", False)
+        now = self.player.clock.get_ticks()
 
-        if is_attached:
+        if self.spec.is_attached:
             if not self.aura_inst or not self.aura_inst.alive():
                 # 使用过滤后的渲染组
                 self.aura_inst = AreaEffectEntity(
-                    self.player.pos, self.render_groups, self.player, self.config
+                    self.player.pos, self.render_groups, self.player, self.config, self.spec
                 )
         else:
             if now - self.last_shot >= self.cooldown:
-                # 使用过滤后的渲染组
-                AreaEffectEntity(self.player.pos, self.render_groups, self.player, self.config)
+                # 使用过滤后的渲染组；非常驻的地面效果生成频繁，走对象池复用
+                # 规则：常驻光环只有一个实例，不进池
+                pools = getattr(self.player.engine.scene, 'pools', None)
+                if pools:
+                    pools["area_effects"].acquire(self.player.pos, self.render_groups, self.player, self.config,
+                                                  self.spec)
+                else:
+                    AreaEffectEntity(self.player.pos, self.render_groups, self.player, self.config, self.spec)
                 self.last_shot = now
\ No newline at end of file
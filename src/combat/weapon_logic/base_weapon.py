@@ -1,5 +1,7 @@
 import pygame
 from src.core.event_bus import bus
+from src.core.registry import registry
+from src.combat.weapon_spec import spec_at
 
 
 class BaseWeapon:
@@ -11,7 +13,6 @@ class BaseWeapon:
     - 维度 7: 成长进化 (Progression)
     - 维度 9: 资源频率 (Resource/Cooldown)
     """
-
     def __init__(self, player, groups, config):
         self.player = player
         self.groups = groups  # 通常是 [all_sprites, projectile_group]
@@ -22,6 +23,7 @@ class BaseWeapon:
         self.level = 1
         self.max_level = config.get('max_level', 5)
         self.is_active = True
+        self.specs = registry.weapon_specs_for(config)  # 每级一份只读规格 (注册表里的配置直接用快照编译好的)
 
         # --- 维度 9: 运行时资源状态 ---
         self.last_shot = 0
@@ -58,23 +60,26 @@ class BaseWeapon:
     def init_stats(self):
         """
         维度 7: 属性实时映射
-        根据当前 self.level 从 JSON 的 levels 字典中抓取数值
+        根据当前 self.level 取预编译的 WeaponSpec (levels / logic / params 的回退已在编译时解析)
         """
-        lvl_key = str(self.level)
-        levels_config = self.config.get('levels', {})
-
-        # 寻找当前等级的数据，如果没有，则尝试读取根目录的默认值
-        lvl_data = levels_config.get(lvl_key, {})
+        spec = self.spec = spec_at(self.specs, self.level)
 
         # 统一属性映射 (伤害、冷却、数量)
-        self.damage = lvl_data.get('damage', self.config.get('damage', 10))
-        self.cooldown = lvl_data.get('cooldown',
-                                     self.config.get('logic', {}).get('cooldown', 800))
-        self.bullet_count = lvl_data.get('count',
-                                         self.config.get('params', {}).get('count', 1))
+        self.damage = spec.damage
+        self.cooldown = spec.cooldown
+        self.bullet_count = spec.count
 
         # 扩展：读取当前阶段的运动数据 (维度 1)
-        self.phases = lvl_data.get('phases', self.config.get('logic', {}).get('phases', []))
+        self.phases = spec.phases
+
+    def reload_config(self):
+        """
+        热重载：self.config 已被原地更新，按当前等级重新映射数值。
+        规则：装备加成与特权标签只在装配时注入一次，热重载不重复叠加
+        """
+        self.max_level = self.config.get('max_level', 5)
+        self.specs = registry.weapon_specs_for(self.config)
+        self.init_stats()
 
     def level_up(self):
         """
@@ -92,7 +97,7 @@ class BaseWeapon:
         """维度 9: 资源与频率控制中心"""
         if not self.is_active: return
 
-        now = pygame.time.get_ticks()
+        now = self.player.clock.get_ticks()
 
         # 耦合 StatsComponent 的冷却缩减 (CDR)
         cdr_stat = getattr(self.player.stats, 'cooldown_reduction', None)
@@ -115,9 +120,8 @@ class BaseWeapon:
         if mode == "closest":
             return CombatUtils.get_nearest_enemy(self.player.pos, enemies)
         elif mode == "random":
-            import random
             enemy_list = enemies.sprites()
-            return random.choice(enemy_list) if enemy_list else None
+            return self.player.rng.get("weapons").choice(enemy_list) if enemy_list else None
         return None
 
     def fire(self, target):
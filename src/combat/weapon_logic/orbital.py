@@ -3,6 +3,7 @@ import math
 from src.core.registry import registry
 from src.combat.weapon_logic.base_weapon import BaseWeapon
 from src.combat.damage_system import DamageSystem
+from src.combat.combat_utils import CombatUtils
 
 
 @registry.register_logic("orbital")
@@ -11,29 +12,22 @@ class OrbitalWeapon(BaseWeapon):
         super().__init__(player, groups, config)
         self.angle = 0.0
 
+    def _orb_position(self):
+        radius = self.spec.radius * self.player.stats.attack_area.value  # 维度 4: 范围加成
+        return self.player.pos + pygame.math.Vector2(math.cos(self.angle), math.sin(self.angle)) * radius
+
     def update(self, dt, enemies):
         # 旋转逻辑
-        speed = self.config.get("logic", {}).get("speed", 5.0)
-        self.angle += speed * dt * self.player.stats.damage_mult.value
-
-        # 维度 4: 范围加成
-        radius = self.config.get("radius", 120) * self.player.stats.attack_area.value
-
-        # 轨道位置
-        offset = pygame.math.Vector2(math.cos(self.angle), math.sin(self.angle)) * radius
-        current_pos = self.player.pos + offset
+        self.angle += self.spec.speed * dt * self.player.stats.damage_mult.value
 
         # 维度 6: 碰撞伤害
+        current_pos = self._orb_position()
         final_dmg = self.damage * self.player.stats.damage_mult.value
-        for enemy in enemies:
-            if current_pos.distance_to(enemy.pos) < 30:  # 30 为碰撞大小
-                DamageSystem.apply_damage(self.player.engine, enemy, final_dmg * dt * 5,
-                                          attacker_config=self.config, player=self.player)
+        for enemy in CombatUtils.get_enemies_in_radius(current_pos, 30, enemies):  # 30 为碰撞大小
+            DamageSystem.apply_damage(self.player.engine, enemy, final_dmg * dt * 5,
+                                      attacker_config=self.config, player=self.player)
 
     def draw_custom(self, screen, offset):
-        radius = self.config.get("radius", 120) * self.player.stats.attack_area.value
-        pos = self.player.pos + pygame.math.Vector2(math.cos(self.angle), math.sin(self.angle)) * radius
-        draw_pos = pos - offset
-        color = self.config.get("visuals", {}).get("color", (0, 255, 200))
-        pygame.draw.circle(screen, color, draw_pos, 15)
+        draw_pos = self._orb_position() - offset
+        pygame.draw.circle(screen, self.spec.color, draw_pos, 15)
         pygame.draw.circle(screen, (255, 255, 255), draw_pos, 15, 2)
\ No newline at end of file
@@ -1,13 +1,31 @@
 import pygame
 from src.core.registry import registry
 from src.combat.weapon_logic.base_weapon import BaseWeapon
+from src.combat.projectiles.projectile_batch import create_batch
 from src.entities.universal_projectile import UniversalProjectile
+from src.core.pool import ObjectPool
 
 @registry.register_logic("projectile")
 class ProjectileWeapon(BaseWeapon):
+    def __init__(self, player, groups, config):
+        super().__init__(player, groups, config)
+        # 弹道程序在装配时编译一次，所有在飞弹丸由批量引擎统一推进 (无 numpy 时为 None)
+        self.batch = create_batch(player, config)
+        # 无 numpy 时逐个生成的子弹走对象池
+        self.projectile_pool = ObjectPool(UniversalProjectile, name=f"{self.id}_projectiles") if self.batch is None else None
+
+    def reload_config(self):
+        super().reload_config()
+        if self.batch is not None:
+            self.batch.reload()
+
     def update(self, dt, enemies):
+        # 已在飞的弹丸先整体推进一步
+        if self.batch is not None:
+            self.batch.update(dt)
+
         # 维度 9: 频率控制
-        now = pygame.time.get_ticks()
+        now = self.player.clock.get_ticks()
         cdr = getattr(self.player.stats, 'cooldown_reduction', None)
         reduction = cdr.value if cdr else 0
         final_cooldown = self.cooldown * (1 - reduction)
@@ -19,20 +37,39 @@ class ProjectileWeapon(BaseWeapon):
             if target:
                 self.fire(target)
                 self.last_shot = now
+        # 批量弹丸的命中不在这里结算：由场景的碰撞阶段按矩阵统一检测 (新发射的弹丸同样参与本步检测)
 
     def fire(self, target):
         # 维度 2: 弹道分布 (Pattern)
         count = self.bullet_count
-        spread = self.config.get("params", {}).get("angle_spread", 15)
-        direction = (target.pos - self.player.pos).normalize()
+        spread = self.spec.angle_spread
+        aim = target.pos - self.player.pos
+        # 敌人与玩家重合时没有方向，默认朝右
+        direction = aim.normalize() if aim.length_squared() > 0 else pygame.math.Vector2(1, 0)
+        # 伤害口径：配置根节点的基础伤害 × 角色倍率 (与逐个生成的 UniversalProjectile 一致)
+        damage = self.spec.base_damage * self.player.stats.damage_mult.value
+
+        if self.batch is not None:
+            for i in range(count):
+                angle_offset = (i - (count - 1) / 2) * spread
+                self.batch.spawn(self.player.pos, direction.rotate(angle_offset), damage)
+            return
 
         for i in range(count):
             angle_offset = (i - (count - 1) / 2) * spread
-            # 实例化 UniversalProjectile (维度 1: 阶段状态机子弹)
-            UniversalProjectile(
+            # 复用 UniversalProjectile (维度 1: 阶段状态机子弹)
+            self.projectile_pool.acquire(
                 pos=self.player.pos,
                 direction=direction.rotate(angle_offset),
                 groups=self.groups,
                 player=self.player,
-                weapon_config=self.config # 👈 传入整份配置以驱动 Phases
-            )
\ No newline at end of file
+                weapon_config=self.config,  # 👈 传入整份配置以驱动 Phases
+                damage=damage
+            )
+
+    def draw_custom(self, screen, camera_offset):
+        if self.batch is not None:
+            self.batch.draw(screen, camera_offset)
+
+    def projectile_count(self):
+        return len(self.batch) if self.batch is not None else 0
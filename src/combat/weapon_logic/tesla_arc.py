@@ -1,5 +1,4 @@
 import pygame
-import random
 from src.core.registry import registry
 from src.combat.weapon_logic.base_weapon import BaseWeapon
 from src.combat.combat_utils import CombatUtils
@@ -13,7 +12,7 @@ class TeslaArcWeapon(BaseWeapon):
         self.active_arcs = []
 
     def update(self, dt, enemies):
-        now = pygame.time.get_ticks()
+        now = self.player.clock.get_ticks()
 
         # 直接使用 super().init_stats() 算好的 self.cooldown (已包含等级和 CDR 加成)
         # BaseWeapon 已经帮我们处理了复杂的属性抓取，这里直接用即可
@@ -43,15 +42,16 @@ class TeslaArcWeapon(BaseWeapon):
 
     def _gen_pts(self, start, end):
         pts, dist = [start], end - start
+        rng = self.player.rng.get("vfx")  # 纯视觉抖动，独立成流以免扰动战斗随机序列
         for i in range(1, 4):
-            jitter = pygame.Vector2(random.randint(-15, 15), random.randint(-15, 15))
+            jitter = pygame.Vector2(rng.randint(-15, 15), rng.randint(-15, 15))
             pts.append(start + dist * (i / 4) + jitter)
         pts.append(end)
         return pts
 
     def draw_custom(self, screen, offset):
         # 维度 12: 视觉表现
-        color = self.config.get("visuals", {}).get("color", (255, 255, 100))
+        color = self.spec.color
         for a in self.active_arcs:
             draw_pts = [p - offset for p in a['pts']]
             pygame.draw.lines(screen, color, False, draw_pts, 3)
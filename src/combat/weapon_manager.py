@@ -88,6 +88,27 @@ class WeaponManager:
         for weapon in list(self.weapons.values()):
             weapon.update(dt, self.enemy_group)
 
+    def batch_contacts(self, enemies):
+        """碰撞矩阵的非精灵层：所有批量引擎的接触对 [(敌人, (批次, 行号))]，按武器装配顺序"""
+        pairs = []
+        for weapon in self.weapons.values():
+            batch = getattr(weapon, 'batch', None)
+            if batch is not None:
+                pairs.extend((enemy, (batch, row)) for enemy, row in batch.contacts(enemies))
+        return pairs
+
+    def resolve_batch_hits(self, pairs, engine):
+        """按批次分组结算 (保持武器顺序与批次内的行顺序)"""
+        by_batch = {}
+        for enemy, (batch, row) in pairs:
+            by_batch.setdefault(batch, []).append((enemy, row))
+        for batch, hits in by_batch.items():
+            batch.resolve(hits, engine)
+
+    def batched_projectile_count(self):
+        """批量引擎托管的弹丸不在精灵组里，统计时单独累加"""
+        return sum(w.projectile_count() for w in self.weapons.values() if hasattr(w, 'projectile_count'))
+
     def draw_weapons(self, screen, camera_offset):
         """维度 12：驱动自定义渲染（如电弧、光环）"""
         for weapon in self.weapons.values():
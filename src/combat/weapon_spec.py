@@ -0,0 +1,148 @@
+class WeaponSpec:
+    """
+    编译后的武器数值 (每个等级一份)：装配时把 levels / logic / params / behavior / visuals 的回退链一次性解析完，
+    热路径只读普通属性，不再逐帧 .get() 嵌套字典。
+    规则：只读对象 (__slots__ + 禁止赋值)，配置变化时重新编译一套新的
+    """
+    __slots__ = (
+        "level", "source_id",
+        "damage", "base_damage", "cooldown", "count", "angle_spread", "phases",
+        "radius", "speed", "color",
+        "tick_interval", "max_duration", "is_attached", "vfx_color",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"WeaponSpec 只读，不能修改 {name}")
+
+    def __repr__(self):
+        return f"WeaponSpec({self.source_id} LV.{self.level})"
+
+    def __reduce__(self):
+        # 规则：禁止赋值后默认的 pickle 无法还原 __slots__，走构造函数 (配置快照要存编译好的规格)
+        return _restore_spec, ({name: getattr(self, name) for name in self.__slots__},)
+
+
+def _restore_spec(fields):
+    return WeaponSpec(**fields)
+
+
+SPEC_VERSION = 1  # 编译规则变化时加一，快照里旧的规格自动作废
+
+# 各字段的全局缺省值 (按 logic_type 在 LOGIC_SPEC_DEFAULTS 里覆盖，如环绕器默认半径 120)
+SPEC_DEFAULTS = {
+    "damage": 10,
+    "base_damage": 10,
+    "cooldown": 800,
+    "count": 1,
+    "angle_spread": 15,
+    "phases": (),
+    "radius": 100,
+    "speed": 5.0,
+    "color": (255, 255, 255),
+    "tick_interval": 0.5,
+    "max_duration": 9999,
+    "is_attached": False,
+    "vfx_color": (0, 255, 240, 40),
+}
+
+
+# 规则：武器逻辑的字段缺省值集中登记在这里，不挂在逻辑类上 (配置加载时逻辑类还没注册，也要能编译出同样的规格)
+LOGIC_SPEC_DEFAULTS = {
+    "orbital": {"radius": 120, "speed": 5.0, "color": (0, 255, 200)},
+    "tesla_arc": {"color": (255, 255, 100)},
+}
+
+
+def spec_fingerprint():
+    """编译规则的指纹：规则版本 + 所有缺省值，任何一项变化都让快照里的规格失效"""
+    return f"weapon_specs:{SPEC_VERSION}:{SPEC_DEFAULTS!r}:{sorted(LOGIC_SPEC_DEFAULTS.items())!r}"
+
+
+_MISSING = object()
+
+
+def _first(key, *nodes):
+    """按顺序在各节点里找 key，找到第一个就返回 (找不到返回 _MISSING)"""
+    for node in nodes:
+        if key in node:
+            return node[key]
+    return _MISSING
+
+
+def _level_entry(levels, level):
+    entry = levels.get(str(level))
+    if entry is not None:
+        return entry
+    lower = [int(k) for k in levels if str(k).isdigit() and int(k) < level]
+    return levels[str(max(lower))] if lower else {}
+
+
+def compile_spec(config, level, defaults=None):
+    """
+    规则：每个字段只在它原本被读取的节点里找，回退顺序与编译前各武器逐帧 .get() 的口径一致，最后是缺省值
+    (等级表里没有这一级时，沿用表中低于它的最高一级，满级不会退回 LV.1 的数值)
+    - 伤害 (武器数值)：levels → 根节点
+    - 基础伤害 (弹丸 / 区域效果)：根节点
+    - 冷却：levels → logic
+    - 数量 / 弹道阶段：levels → params / logic
+    - 散射角：params；转速：logic
+    - 半径 / 光环颜色：根节点
+    - 触发间隔 / 持续时间 / 常驻：behavior
+    - 颜色：visuals
+    """
+    merged = dict(SPEC_DEFAULTS)
+    merged.update(LOGIC_SPEC_DEFAULTS.get(config.get("logic_type"), {}))
+    if defaults:
+        merged.update(defaults)
+
+    lvl = _level_entry(config.get("levels", {}), level)
+    logic = config.get("logic", {})
+    params = config.get("params", {})
+    behavior = config.get("behavior", {})
+    visuals = config.get("visuals", {})
+
+    chains = {
+        "damage": (lvl, config),
+        "base_damage": (config,),
+        "cooldown": (lvl, logic),
+        "count": (lvl, params),
+        "angle_spread": (params,),
+        "phases": (lvl, logic),
+        "radius": (config,),
+        "speed": (logic,),
+        "color": (visuals,),
+        "tick_interval": (behavior,),
+        "max_duration": (behavior,),
+        "is_attached": (behavior,),
+        "vfx_color": (config,),
+    }
+    keys = {"base_damage": "damage"}  # 字段名与配置键不同的
+    fields = {}
+    for name, nodes in chains.items():
+        value = _first(keys.get(name, name), *nodes)
+        fields[name] = merged[name] if value is _MISSING else value
+
+    # 列表统一成元组，避免共享的规格被顺手改掉
+    for name in ("phases", "color", "vfx_color"):
+        if isinstance(fields[name], list):
+            fields[name] = tuple(fields[name])
+
+    fields["level"] = level
+    fields["source_id"] = config.get("id", config.get("weapon_id"))
+    return WeaponSpec(**fields)
+
+
+def compile_specs(config, defaults=None):
+    """每个等级编译一份，返回元组 (下标 0 对应 LV.1)；等级数取 max_level 与 levels 中最大等级的较大者"""
+    levels = [int(k) for k in config.get("levels", {}) if str(k).isdigit()]
+    top = max([config.get("max_level", 5)] + levels)
+    return tuple(compile_spec(config, level, defaults) for level in range(1, top + 1))
+
+
+def spec_at(specs, level):
+    """取某个等级的规格 (超出范围时取最近的一级)"""
+    return specs[min(max(level, 1), len(specs)) - 1]
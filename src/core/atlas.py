@@ -0,0 +1,134 @@
+import pygame
+from src.core.constants import ATLAS_PAGE_SIZE, ATLAS_MAX_ITEM, ATLAS_PADDING
+
+
+class ShelfPacker:
+    """
+    货架式装箱：按行 (shelf) 从左往右摆放，放不下就在下方开新的一行。
+    规则：优先放进高度最贴合的已有行，减少行内浪费
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.shelves = []  # [y, 行高, 已用宽度]
+        self.bottom = 0
+        self.used_area = 0
+
+    def insert(self, w, h):
+        """返回左上角 (x, y)；整页都放不下时返回 None"""
+        best = None
+        for shelf in self.shelves:
+            y, shelf_h, used = shelf
+            if h <= shelf_h and used + w <= self.width:
+                if best is None or shelf_h < best[1]:
+                    best = shelf
+        if best is None:
+            if self.bottom + h > self.height or w > self.width:
+                return None
+            best = [self.bottom, h, 0]
+            self.shelves.append(best)
+            self.bottom += h
+
+        x = best[2]
+        best[2] += w
+        self.used_area += w * h
+        return x, best[0]
+
+    def occupancy(self):
+        return self.used_area / (self.width * self.height)
+
+
+class TextureAtlas:
+    """
+    贴图图集：把许多小 Surface 拷进少数几张大页面，按 key 查子矩形。
+    - add() 返回页面上的 subsurface：与普通 Surface 用法一致，但像素连续存放在同一张大图里
+    - 页面写满就开新页；太大的贴图 (超过 ATLAS_MAX_ITEM) 不进图集，原样返回
+    - 批量绘制时用 source() 换成 (页面, 子矩形) 三元组提交 blits：直接 blit subsurface 要多一层父表面锁定，反而更慢
+    规则：进图集的贴图只读 (改像素会改到页面上)，需要修改的调用方自行 copy()
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, max_item=ATLAS_MAX_ITEM, padding=ATLAS_PADDING):
+        self.page_size = page_size
+        self.max_item = max_item
+        self.padding = padding
+        self.pages = []  # [(Surface, ShelfPacker)]
+        self.regions = {}  # { key: (页号, Rect) }
+        self.subsurfaces = {}
+        self.sources = {}  # { subsurface: (页面, Rect) }，绘制热路径直接查这张表
+
+    def __contains__(self, key):
+        return key in self.regions
+
+    def get(self, key):
+        return self.subsurfaces.get(key)
+
+    def lookup(self, key):
+        """返回 (页面 Surface, 子矩形)，不在图集里时返回 None"""
+        region = self.regions.get(key)
+        if region is None:
+            return None
+        page, rect = region
+        return self.pages[page][0], rect
+
+    def source(self, surface):
+        """blits 用的 (源 Surface, area)：图集贴图换成所在页面 + 子矩形，其余原样"""
+        src = self.sources.get(surface)
+        if src is None:
+            return surface, surface.get_rect()
+        return src
+
+    def add(self, key, surface):
+        """把 surface 拷进图集，返回对应的 subsurface (放不进图集时原样返回)"""
+        if key in self.subsurfaces:
+            return self.subsurfaces[key]
+        w, h = surface.get_size()
+        if w == 0 or h == 0 or w > self.max_item or h > self.max_item:
+            return surface
+
+        pad = self.padding
+        spot = None
+        for index, (page, packer) in enumerate(self.pages):
+            spot = packer.insert(w + pad, h + pad)
+            if spot is not None:
+                break
+        if spot is None:
+            index = len(self.pages)
+            page, packer = self._new_page()
+            spot = packer.insert(w + pad, h + pad)
+
+        rect = pygame.Rect(spot[0], spot[1], w, h)
+        # 页面初始全透明，ADD 混合等于逐像素原样拷贝 (普通 blit 会按 alpha 混合，改变半透明像素)
+        page.blit(surface, rect, special_flags=pygame.BLEND_RGBA_ADD)
+        sub = page.subsurface(rect)
+        self.regions[key] = (index, rect)
+        self.subsurfaces[key] = sub
+        self.sources[sub] = (page, rect)
+        return sub
+
+    def add_many(self, items):
+        """批量装箱：先按高度从高到低排序，货架利用率更高。items: [(key, surface)]，返回 {key: subsurface}"""
+        ordered = sorted(items, key=lambda item: item[1].get_height(), reverse=True)
+        return {key: self.add(key, surface) for key, surface in ordered}
+
+    def _new_page(self):
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        packer = ShelfPacker(self.page_size, self.page_size)
+        self.pages.append((page, packer))
+        return page, packer
+
+    def clear(self):
+        self.pages = []
+        self.regions = {}
+        self.subsurfaces = {}
+        self.sources = {}
+
+    def stats(self):
+        return {
+            "pages": len(self.pages),
+            "items": len(self.regions),
+            "occupancy": [round(packer.occupancy(), 3) for _, packer in self.pages],
+        }
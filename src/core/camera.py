@@ -1,5 +1,8 @@
 import pygame
 from src.core.constants import *
+from src.core.sprite_cache import sprite_cache
+
+CULL_MARGIN = 64  # 视口外扩的像素 (插值位置与 rect 的偏差、超出 rect 的贴图都在这个余量内)
 
 
 class CameraGroup(pygame.sprite.Group):
@@ -7,28 +10,116 @@ class CameraGroup(pygame.sprite.Group):
         super().__init__()
         self.display_surface = pygame.display.get_surface()
         self.offset = pygame.math.Vector2()
+        self.background = None  # 预渲染的 底色 + 网格 (屏幕 + 一格大小)，首次绘制时生成
+
+        # 按 z_index 分桶：{ z_index: {sprite: None} }，入组/离组时增量维护，绘制时不再全量排序
+        self.layers = {}
+        self.layer_order = []  # 已排序的 z_index 列表
+        self.renderers = {}  # { z_index: [渲染器] }：数组化的实体 (如宝石场) 按图层插入同一条 blits 序列
+
+    def add_renderer(self, renderer, z=None):
+        """规则：渲染器实现 collect_draws(seq, view, offset, alpha)，在自己的图层轮到时追加 (image, pos)"""
+        z = getattr(renderer, 'z_index', 0) if z is None else z
+        self.renderers.setdefault(z, []).append(renderer)
+        if z not in self.layers:
+            self.layers[z] = {}
+            self.layer_order = sorted(self.layers)
+
+    def remove_renderer(self, renderer):
+        for bucket in self.renderers.values():
+            if renderer in bucket:
+                bucket.remove(renderer)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        # 规则：自带 draw_custom 的隐形占位实体 (hidden) 不参与精灵绘制
+        if getattr(sprite, 'hidden', False): return
+        z = getattr(sprite, 'z_index', 0)
+        bucket = self.layers.get(z)
+        if bucket is None:
+            bucket = self.layers[z] = {}
+            self.layer_order = sorted(self.layers)
+        bucket[sprite] = None
 
-    def custom_draw(self, player):
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        bucket = self.layers.get(getattr(sprite, 'z_index', 0))
+        if bucket is not None:
+            bucket.pop(sprite, None)
+
+    def store_previous_positions(self):
+        """规则：每个逻辑步开始前快照位置，渲染时在两步之间插值"""
+        for sprite in self.sprites():
+            if getattr(sprite, 'swarm', None) is not None: continue  # 集群成员由 EnemySwarm.snapshot() 批量快照
+            prev = getattr(sprite, 'prev_pos', None)
+            if prev is not None:
+                prev.update(sprite.pos)
+
+    @staticmethod
+    def _lerp_center(sprite, alpha):
+        """插值后的世界坐标中心；没有历史位置的精灵直接用 rect"""
+        prev = getattr(sprite, 'prev_pos', None)
+        if prev is None or alpha >= 1.0:
+            return pygame.math.Vector2(sprite.rect.center)
+        return prev.lerp(sprite.pos, alpha)
+
+    def _build_background(self):
+        """
+        规则：网格是周期为 TILE_SIZE 的图案，预渲染一张 屏幕 + 一格 的大图，
+        绘制时按 偏移 % TILE_SIZE 平移一次 blit，代替每帧几十次 draw.line
+        """
+        w, h = WIDTH + TILE_SIZE, HEIGHT + TILE_SIZE
+        surf = pygame.Surface((w, h))
+        surf.fill(COLOR_BG)
+        for x in range(0, w, TILE_SIZE):
+            pygame.draw.line(surf, COLOR_GRID, (x, 0), (x, h))
+        for y in range(0, h, TILE_SIZE):
+            pygame.draw.line(surf, COLOR_GRID, (0, y), (w, y))
+        return surf.convert()
+
+    def custom_draw(self, player, alpha=1.0):
         # 1. 摄像机丝滑跟随逻辑
         # 0.1 是平滑系数，数值越小越丝滑，玩家离中心就越远
-        self.offset.x += (player.rect.centerx - WIDTH // 2 - self.offset.x) * 0.1
-        self.offset.y += (player.rect.centery - HEIGHT // 2 - self.offset.y) * 0.1
-
-        # 2. 填充底色
-        self.display_surface.fill(COLOR_BG)
+        player_center = self._lerp_center(player, alpha)
+        self.offset.x += (player_center.x - WIDTH // 2 - self.offset.x) * 0.1
+        self.offset.y += (player_center.y - HEIGHT // 2 - self.offset.y) * 0.1
 
-        # 3. 绘制无限网格 (核心参考物)
-        # 根据摄像机偏移计算网格的起始位置
-        grid_range = 2  # 绘制范围倍数
+        # 2 & 3. 底色 + 无限网格 (核心参考物)：预渲染背景按摄像机偏移取模后整张贴上
+        if self.background is None:
+            self.background = self._build_background()
         start_x = -int(self.offset.x % TILE_SIZE)
         start_y = -int(self.offset.y % TILE_SIZE)
+        self.display_surface.blit(self.background, (start_x, start_y))
 
-        for x in range(start_x - TILE_SIZE, WIDTH + TILE_SIZE, TILE_SIZE):
-            pygame.draw.line(self.display_surface, COLOR_GRID, (x, 0), (x, HEIGHT))
-        for y in range(start_y - TILE_SIZE, HEIGHT + TILE_SIZE, TILE_SIZE):
-            pygame.draw.line(self.display_surface, COLOR_GRID, (0, y), (WIDTH, y))
+        # 4. 逐层绘制 (层内 Y-sort 伪3D)
+        # 规则：先按视口裁剪，只对看得见的精灵排序，最后一次 blits 提交
+        # alpha < 1 时按插值位置绘制，逻辑频率低于渲染帧率也不会卡顿
+        ox, oy = self.offset.x, self.offset.y
+        view = pygame.Rect(int(ox) - CULL_MARGIN, int(oy) - CULL_MARGIN,
+                           WIDTH + CULL_MARGIN * 2, HEIGHT + CULL_MARGIN * 2)
+        seq = []
+        sources = sprite_cache.atlas.sources  # 图集贴图按 (页面, 子矩形) 提交
+        for z in self.layer_order:
+            for renderer in self.renderers.get(z, ()):
+                renderer.collect_draws(seq, view, self.offset, alpha)
+            bucket = self.layers[z]
+            if not bucket: continue
+            sprites = list(bucket)
+            visible = [sprites[i] for i in view.collidelistall([s.rect for s in sprites])]
+            visible.sort(key=lambda s: s.rect.centery)
 
-        # 4. 排序绘制所有精灵 (Y-sort 伪3D)
-        for sprite in sorted(self.sprites(), key=lambda s: (getattr(s, 'z_index', 0), s.rect.centery)):
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
\ No newline at end of file
+            if alpha < 1.0:
+                for sprite in visible:
+                    center = self._lerp_center(sprite, alpha)
+                    w, h = sprite.rect.size
+                    dest = (center.x - w / 2 - ox, center.y - h / 2 - oy)
+                    src = sources.get(sprite.image)
+                    seq.append((sprite.image, dest) if src is None else (src[0], dest, src[1]))
+            else:
+                for sprite in visible:
+                    x, y = sprite.rect.topleft
+                    dest = (x - ox, y - oy)
+                    src = sources.get(sprite.image)
+                    seq.append((sprite.image, dest) if src is None else (src[0], dest, src[1]))
+        if seq:
+            self.display_surface.blits(seq, doreturn=False)
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import json
+import pickle
+import hashlib
+
+CACHE_VERSION = 2  # 缓存格式变化时加一，旧缓存自动作废
+
+
+class ConfigCache:
+    """
+    配置快照缓存：把解析好的 JSON 配置整体 pickle 到一个二进制文件里。
+    - 每个源文件按 (mtime, size) 判断是否变化；变了再比对内容哈希，哈希相同 (如 git checkout 只改了时间) 仍复用
+    - 只有真正改过的 JSON 才重新解析，其余直接从快照取
+    - 每个文件还可以挂派生数据 (如编译好的 WeaponSpec)，源文件内容不变就跟着解析结果一起复用
+    规则：缓存只是加速手段，读写失败都静默退回逐个解析，不影响启动
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}  # { 源文件路径: (mtime_ns, size, sha1, 解析结果, {派生数据名: 值}) }
+        self.used = set()
+        self.dirty = False
+        self.parsed = 0  # 本次启动实际解析的文件数
+        self.reused = 0
+        self._read()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot.get("version") == CACHE_VERSION:
+                self.entries = snapshot["files"]
+        except Exception as e:
+            print(f"⚠️ 配置快照损坏，将重新生成: {e}")
+            self.entries = {}
+
+    def load_json(self, file_path):
+        """取一个 JSON 文件的解析结果 (命中快照时不读文件内容)"""
+        self.used.add(file_path)
+        st = os.stat(file_path)
+        cached = self.entries.get(file_path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            self.reused += 1
+            return cached[3]
+
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if cached is not None and cached[2] == digest:
+            data, derived = cached[3], cached[4]
+            self.reused += 1
+        else:
+            data, derived = json.loads(raw.decode('utf-8')), {}
+            self.parsed += 1
+        self.entries[file_path] = (st.st_mtime_ns, st.st_size, digest, data, derived)
+        self.dirty = True
+        return data
+
+    def derived(self, file_path, name):
+        """取某个源文件上挂的派生数据 (没有或源文件已变化时返回 None)"""
+        cached = self.entries.get(file_path)
+        return cached[4].get(name) if cached is not None else None
+
+    def put_derived(self, file_path, name, value):
+        """规则：派生数据必须可 pickle，且只依赖源文件内容和 name (name 里带上生成规则的版本)"""
+        cached = self.entries.get(file_path)
+        if cached is None:
+            return
+        cached[4][name] = value
+        self.dirty = True
+
+    def save(self):
+        """规则：有变化才写；已删除的源文件从快照里剔除；先写临时文件再替换，避免并发进程读到半截"""
+        stale = set(self.entries) - self.used
+        for file_path in stale:
+            del self.entries[file_path]
+        if not (self.dirty or stale):
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({"version": CACHE_VERSION, "files": self.entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ 配置快照写入失败: {e}")
+
+    def stats(self):
+        return {"files": len(self.entries), "parsed": self.parsed, "reused": self.reused}
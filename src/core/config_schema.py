@@ -0,0 +1,101 @@
+# core/config_schema.py
+
+
+class ConfigError(ValueError):
+    """配置不合法 (缺字段 / 类型不对 / ID 重复)。规则：启动时直接报错，不带着坏配置进游戏"""
+
+
+# 武器配置里必须是字典的节点 (编译 WeaponSpec 时按字典读取)
+WEAPON_NODES = ("logic", "params", "behavior", "visuals", "levels", "stats")
+ENEMY_NUMBERS = ("health", "move_speed", "score_value")
+UPGRADE_KEYS = ("id", "name", "desc", "stat", "value")
+
+
+def _require_id(data, problems):
+    if not isinstance(data.get("id"), str) or not data["id"]:
+        problems.append("缺少字符串字段 'id'")
+
+
+def _normalize_weapon(data, problems):
+    _require_id(data, problems)
+    if not isinstance(data.get("logic_type"), str):
+        problems.append("缺少字符串字段 'logic_type'")
+    for node in WEAPON_NODES:
+        if node in data and not isinstance(data[node], dict):
+            problems.append(f"'{node}' 必须是对象")
+
+    levels = data.get("levels")
+    if isinstance(levels, dict):
+        # 等级键统一成 "1" "2" ... (JSON 里写成 "01" / " 2" 也能被等级表查到)
+        canonical = {}
+        for key, entry in levels.items():
+            try:
+                level = int(str(key).strip())
+            except ValueError:
+                problems.append(f"levels 的键 '{key}' 不是整数")
+                continue
+            if not isinstance(entry, dict):
+                problems.append(f"levels['{key}'] 必须是对象")
+                continue
+            if str(level) in canonical:
+                problems.append(f"levels 的等级 {level} 重复")
+            canonical[str(level)] = entry
+        levels.clear()
+        levels.update(canonical)
+
+
+def _normalize_character(data, problems):
+    _require_id(data, problems)
+    if "base_stats" in data and not isinstance(data["base_stats"], dict):
+        problems.append("'base_stats' 必须是对象")
+    embedded = data.get("starting_weapon_config")
+    if embedded is not None:
+        if not isinstance(embedded, dict):
+            problems.append("'starting_weapon_config' 必须是对象")
+        else:
+            sub = []
+            _normalize_weapon(embedded, sub)
+            problems.extend(f"starting_weapon_config: {p}" for p in sub)
+
+
+def _normalize_enemy(data, problems):
+    _require_id(data, problems)
+    for key in ENEMY_NUMBERS:
+        if key in data and not isinstance(data[key], (int, float)):
+            problems.append(f"'{key}' 必须是数字")
+
+
+def _normalize_upgrades(data, problems):
+    if not isinstance(data, list):
+        problems.append("升级表必须是数组")
+        return
+    for i, item in enumerate(data):
+        if not isinstance(item, dict):
+            problems.append(f"第 {i} 项必须是对象")
+            continue
+        missing = [key for key in UPGRADE_KEYS if key not in item]
+        if missing:
+            problems.append(f"第 {i} 项缺少字段 {missing}")
+        elif not isinstance(item["value"], (int, float)):
+            problems.append(f"第 {i} 项的 'value' 必须是数字")
+
+
+# 规则：配置驱动。新类别只需在这里登记校验函数 (未登记的类别只要求有 id)
+NORMALIZERS = {
+    'weapons': _normalize_weapon,
+    'characters': _normalize_character,
+    'enemies': _normalize_enemy,
+    'upgrades': _normalize_upgrades,
+}
+
+
+def normalize_config(kind, data):
+    """
+    校验并规范化一份刚解析出的配置 (原地修改)，返回问题列表 (空列表表示合法)。
+    规则：只做不改变含义的规范化 (如等级键格式)，其余问题原样报告，由调用方决定报错还是跳过
+    """
+    problems = []
+    if kind != 'upgrades' and not isinstance(data, dict):
+        return ["配置必须是 JSON 对象"]
+    NORMALIZERS.get(kind, _require_id)(data, problems)
+    return problems
@@ -0,0 +1,45 @@
+import os
+import time
+from src.core.constants import HOT_RELOAD_INTERVAL
+
+
+class ConfigWatcher:
+    """
+    配置热重载：按修改时间轮询 registry 管理的 JSON，改过的文件单独重新加载。
+    规则：只负责发现变化并更新 registry；推送到在场的武器/敌人由场景的 on_config_reloaded() 完成
+    """
+
+    def __init__(self, registry, interval=HOT_RELOAD_INTERVAL):
+        self.registry = registry
+        self.interval = interval
+        self.next_poll = 0.0
+        self.mtimes = {path: self._mtime(path) for path in registry.config_files()}
+        self.reloads = 0
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self, now=None):
+        """到了轮询时间就检查一遍，返回本次重新加载的 [(类别, 配置)]"""
+        now = time.perf_counter() if now is None else now
+        if now < self.next_poll:
+            return []
+        self.next_poll = now + self.interval
+
+        changes = []
+        for path in self.registry.config_files():
+            mtime = self._mtime(path)
+            if mtime is None or self.mtimes.get(path) == mtime: continue
+            self.mtimes[path] = mtime
+
+            start = time.perf_counter()
+            result = self.registry.reload_config(path)
+            if result is None: continue
+            changes.append(result)
+            self.reloads += 1
+            print(f"♻️ 热重载 {path} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        return changes
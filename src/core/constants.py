@@ -6,4 +6,61 @@ LAYER_BG, LAYER_PICKUP, LAYER_ENEMY, LAYER_PLAYER, LAYER_PROJECTILE, LAYER_UI =
 COLOR_BG = (12, 12, 20)
 COLOR_GRID = (35, 35, 55)
 COLOR_PLAYER = (0, 255, 240)
-COLOR_ENEMY = (255, 50, 80)
\ No newline at end of file
+COLOR_ENEMY = (255, 50, 80)
+
+# 固定步长模拟：逻辑以 SIM_HZ 恒定频率推进，渲染帧数与之解耦
+SIM_HZ = 60
+SIM_DT = 1.0 / SIM_HZ
+MAX_FRAME_TIME = 0.25  # 单帧最大计入时长 (防止卡顿后“死亡螺旋”)
+MAX_SIM_STEPS = 8  # 单个渲染帧内最多推进的逻辑步数
+
+# 碰撞矩阵：声明哪些层之间需要产生接触对 (层名对应 CombatScene 注册的精灵组)
+# projectile_batches 是非精灵层：ProjectileBatch 的数组弹丸自带向量化检测，接触对照样按矩阵分发结算
+COLLISION_MATRIX = (
+    ("enemies", "projectile_batches"),  # 批量弹丸命中敌人
+    ("enemies", "projectiles"),  # 子弹命中敌人
+    ("player", "enemies"),  # 玩家受击
+    ("player", "gems"),  # 拾取经验
+    ("player", "enemy_projectiles"),  # 预留：敌方弹幕
+)
+
+# 矩阵分两轮检测：先结算伤害，玩家侧在伤害之后重新检测
+# (本步被打死的敌人不再撞玩家，本步掉落的宝石当步即可拾取，与原先逐个 spritecollide 的先后一致)
+COLLISION_PHASES = (
+    (("enemies", "projectile_batches"), ("enemies", "projectiles")),
+    (("player", "enemies"), ("player", "gems"), ("player", "enemy_projectiles")),
+)
+
+# 有朝向的弹丸预旋转的角度桶数 (360 / 64 ≈ 5.6° 一帧)，武器可用 visuals.rotation_buckets 覆盖
+ROTATION_BUCKETS = 64
+
+# 伤害飘字合并：同一目标、同一来源在窗口期内的伤害合成一个数字
+DAMAGE_TEXT_WINDOW = 0.25  # 合并窗口 (秒)
+DAMAGE_TEXT_BIG_HIT = 50  # 单次伤害达到该值时不合并，立即单独弹出
+
+# 敌人模拟 LOD：离玩家越远更新越稀疏，太远的直接回收到刷怪圈
+ENEMY_SPAWN_DIST = 850  # 刷怪圈半径
+LOD_NEAR_MARGIN = 32  # 屏幕外的缓冲带：远景敌人最多攒 LOD_FAR_INTERVAL 步才走一次，进屏前要先升回近景
+# 近景半径 = 屏幕半对角线 (约 734) + 缓冲带：圈内每个逻辑步都更新。
+# 规则：必须小于刷怪圈半径，刚刷出来的敌人在屏幕外，应当落在降频的远景里
+LOD_NEAR_DIST = int((WIDTH * WIDTH + HEIGHT * HEIGHT) ** 0.5 / 2) + LOD_NEAR_MARGIN
+LOD_FAR_INTERVAL = 4  # 远景每隔几个逻辑步更新一次 (累计 dt 一次走完，错峰分摊)
+LOD_LEASH_DIST = 1600  # 拴绳距离：超出后重新放回刷怪圈
+# 经验宝石场：数量超过阈值时，把同一格子里未被吸附的宝石合成一颗高价值宝石
+GEM_XP_VALUE = 20  # 单颗掉落的经验
+GEM_MERGE_THRESHOLD = 300  # 场上宝石数超过它才开始合并
+GEM_MERGE_CELL = 96  # 合并网格大小 (像素)
+GEM_MERGE_INTERVAL = 30  # 合并检查间隔 (逻辑步)
+
+# 贴图懒加载：首次使用才解码，解码后的像素总量超出预算时淘汰最久未用的贴图
+TEXTURE_BUDGET_BYTES = 64 * 1024 * 1024
+TEXTURE_PINNED_PREFIXES = ("ui/",)  # 常驻不淘汰的目录 (HUD 等)；玩家贴图由 Player 单独 pin
+TEXTURE_ATLAS_PREFIXES = ("ui/", "characters/")  # 启动时打进图集的目录
+
+# 贴图图集：小贴图拷进少数几张大页面，blit 时像素集中、Surface 数量少
+ATLAS_PAGE_SIZE = 1024  # 页面边长
+ATLAS_MAX_ITEM = 256  # 边长超过它的贴图不进图集
+ATLAS_PADDING = 1  # 相邻贴图之间的间隔 (像素)
+
+# 配置热重载：按修改时间轮询 data/configs，只重新加载改过的文件 (仅窗口模式)
+HOT_RELOAD_INTERVAL = 0.5  # 轮询间隔 (秒)
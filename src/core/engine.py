@@ -1,11 +1,16 @@
+import os
+import math
 import pygame
 import sys
+import time
 from src.core.constants import *
 from src.core.registry import registry
 from src.ui.manager import UIManager
 from src.ui.screens.hud import HUD
 from src.ui.screens.upgrade_panel import UpgradePanel
-from src.core.event_bus import bus
+from src.core.event_bus import bus, EnemyDied
+from src.core.profiler import FrameProfiler
+from src.core.config_watcher import ConfigWatcher
 
 # 场景导入
 from src.scenes.menu_scene import MenuScene
@@ -13,15 +18,40 @@ from src.scenes.combat_scene import CombatScene
 
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, sim_hz=SIM_HZ, headless=False, seed=None, time_scale=1.0):
+        # 无头模式：不开窗口、不渲染，用于脚本/CLI 全速跑战斗逻辑
+        self.headless = headless
+        if headless:
+            # 没有显示器的构建机上也能初始化键盘等子系统
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("CyberSurvivor Pro")
+        if headless:
+            self.screen = None
+        else:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption("CyberSurvivor Pro")
         self.clock = pygame.time.Clock()
         self.running = True
 
+        # 固定步长：sim_hz 为 None 时退回旧的可变 dt 模式
+        self.sim_hz = sim_hz
+        self.sim_dt = 1.0 / sim_hz if sim_hz else None
+        self.accumulator = 0.0
+
+        # 快进倍率 (仅固定步长模式)：每帧推进 time_scale 倍的模拟时间
+        self.time_scale = time_scale
+        # 战斗种子：None 时每局随机生成 (记录在 scene.rng.seed 中)
+        self.seed = seed
+
         # 1. 核心系统一键同步
-        registry.load_all()
+        registry.load_all(load_assets=not headless)
+        if not headless:
+            registry.build_atlas()  # 常用小贴图打进图集 (需要显示设备才能 convert_alpha)
+
+        # 配置热重载：改完 JSON 不用重启 (无头批量运行不开启，保证结果只取决于启动时的配置)
+        self.config_watcher = None if headless else ConfigWatcher(registry)
 
         # 武器工厂自动扫描
         from src.combat.weapon_factory import WeaponFactory
@@ -31,6 +61,13 @@ class GameEngine:
         self.ui_manager = UIManager(self)
         self._init_dummy_player()  # 封装初始化占位符逻辑
 
+        # 性能剖析：默认关闭，F3 打开浮层
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = None
+        if not headless:
+            from src.ui.screens.profiler_overlay import ProfilerOverlay
+            self.profiler_overlay = ProfilerOverlay(self)
+
         # 3. 场景与状态
         self.scene = None
         self.state = "MAIN_MENU"
@@ -38,7 +75,7 @@ class GameEngine:
         self.switch_scene("MENU")
 
         # 4. 全球事件监听
-        bus.subscribe("RESUME_GAME", self.resume)
+        bus.subscribe("RESUME_GAME", self.resume, scope=self)
 
     def _init_dummy_player(self):
         """规则：创建一个标准接口的假人，防止菜单界面报错"""
@@ -55,8 +92,14 @@ class GameEngine:
         self.ui_manager.add_menu('hud', HUD(self.player_dummy))
         self.ui_manager.add_menu('upgrade', UpgradePanel(self.player_dummy))
 
-    def switch_scene(self, scene_type, char_config=None):
+    def switch_scene(self, scene_type, char_config=None, seed=None):
         """一劳永逸的场景切换逻辑"""
+        # 旧场景的订阅、未分发的事件与飘字随场景一起作废
+        if self.scene is not None:
+            self.scene.close()
+        bus.clear()
+        self.ui_manager.clear_scene_state()
+
         if scene_type == "MENU":
             self.scene = MenuScene(self)
             self.state = "MAIN_MENU"
@@ -66,8 +109,9 @@ class GameEngine:
                 char_config = list(registry.characters.values())[0] if registry.characters else {}
 
             # 实例化战斗场景
-            self.scene = CombatScene(self, char_config)
+            self.scene = CombatScene(self, char_config, seed if seed is not None else self.seed)
             self.state = "PLAYING"
+            self.score = 0
 
             # 自动重定向 UI 的监听目标
             self.ui_manager.menus['hud'].player = self.scene.player
@@ -80,25 +124,30 @@ class GameEngine:
         self.score += enemy.config.get("score_value", 10)
 
         # 2. 掉落经验
-        if hasattr(self.scene, 'all_sprites'):
-            from src.entities.pickups.exp_gem import ExperienceGem
-            ExperienceGem(enemy.rect.center, [self.scene.all_sprites, self.scene.gem_group], self.scene.player)
+        gem_field = getattr(self.scene, 'gem_field', None)
+        if gem_field is not None:
+            gem_field.add(enemy.rect.center)
+        elif hasattr(self.scene, 'all_sprites'):
+            groups = [self.scene.all_sprites, self.scene.gem_group]
+            pools = getattr(self.scene, 'pools', None)
+            if pools:
+                pools["gems"].acquire(enemy.rect.center, groups, self.scene.player)
+            else:
+                from src.entities.pickups.exp_gem import ExperienceGem
+                ExperienceGem(enemy.rect.center, groups, self.scene.player)
 
         # 3. 【点火】通过 EventBus 发布全球信号
-        # 这样被动系统、UI系统、音效系统都可以独立响应
-        from src.core.event_bus import bus
-        bus.emit("ENEMY_DIED", enemy=enemy, killer=self.scene.player)
-
-        # 兼容现有调用（保持 player 内部被动触发）
-        if hasattr(self.scene, 'player'):
-            self.scene.player.trigger_passives("on_kill")
+        # 这样被动系统、UI系统、音效系统都可以独立响应 (击杀被动由 CombatScene 订阅处理)
+        # 规则：走延迟队列，不在伤害结算中途同步调用订阅者，由场景在本步末尾统一 flush
+        bus.post(EnemyDied(enemy, self.scene.player))
 
     def resume(self):
         self.state = "PLAYING"
 
     def run(self):
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0
+            frame_time = self.clock.tick(FPS) / 1000.0
+            self.profiler.begin_frame()
 
             # --- 事件分发 ---
             for event in pygame.event.get():
@@ -106,14 +155,122 @@ class GameEngine:
                     self.running = False
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     self._handle_pause()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler.toggle()
+
+            # --- 配置热重载 ---
+            if self.config_watcher:
+                for kind, config in self.config_watcher.poll():
+                    self.scene.on_config_reloaded(kind, config)
 
             # --- 逻辑更新 ---
-            self._update_dispatch(dt)
+            if self.sim_dt:
+                alpha = self._step_fixed(frame_time)
+            else:
+                self._update_dispatch(frame_time)
+                alpha = 1.0
 
             # --- 画面渲染 ---
-            self._draw_dispatch()
+            self._draw_dispatch(alpha)
 
             pygame.display.flip()
+            self.profiler.lap("flip")
+            self.profiler.end_frame()
+
+    def _step_fixed(self, frame_time):
+        """
+        规则：累加器驱动的固定步长。
+        每个渲染帧推进 N 个 sim_dt，剩余的不足一步的时间留给下一帧，
+        返回插值系数 alpha (0~1) 供渲染在上一步与当前步之间插值。
+        """
+        # 死亡螺旋保护：卡顿时只计入有限时长，并限制单帧步数 (快进时按倍率放宽)
+        self.accumulator += min(frame_time, MAX_FRAME_TIME) * self.time_scale
+        max_steps = MAX_SIM_STEPS * max(1, math.ceil(self.time_scale))
+
+        steps = 0
+        while self.accumulator >= self.sim_dt and steps < max_steps:
+            self._update_dispatch(self.sim_dt)
+            self.accumulator -= self.sim_dt
+            steps += 1
+
+        if steps >= max_steps:
+            # 追不上就丢弃积压，宁可变慢也不卡死
+            self.accumulator = min(self.accumulator, self.sim_dt)
+
+        # 画面凝固的状态下不做插值，避免静止画面来回抖动
+        if self.state != "PLAYING":
+            return 1.0
+        return self.accumulator / self.sim_dt
+
+    def run_headless(self, duration, char_config=None, upgrade_policy=None, on_tick=None, seed=None):
+        """
+        规则：无头驱动。不渲染、不限帧，以固定 dt 尽可能快地推进 CombatScene。
+        duration: 模拟时长 (秒)；玩家死亡时提前结束
+        upgrade_policy: 升级时的选卡策略 (options, rng) -> option，默认选第一张
+        on_tick: 每个逻辑步后的回调 (engine)，用于外部统计
+        seed: 本局种子，相同种子 + 相同策略 = 逐位一致的结果
+        返回本局的运行报告 (模拟时长、实际耗时、每秒步数等)
+        """
+        dt = self.sim_dt or SIM_DT
+        self.switch_scene("COMBAT", char_config, seed)
+        max_ticks = int(duration / dt)
+        ticks = 0
+
+        start = time.perf_counter()
+        while self.running and ticks < max_ticks:
+            self.step(dt, upgrade_policy)
+            ticks += 1
+            if on_tick:
+                on_tick(self)
+
+            if self.scene.player.current_hp <= 0:
+                break
+        wall_time = time.perf_counter() - start
+
+        sim_time = ticks * dt
+        return {
+            "character": self.scene.player.char_id,
+            "seed": self.scene.rng.seed,
+            "ticks": ticks,
+            "sim_time": round(sim_time, 3),
+            "wall_time": round(wall_time, 3),
+            "ticks_per_sec": round(ticks / wall_time, 1) if wall_time > 0 else 0.0,
+            "speedup": round(sim_time / wall_time, 1) if wall_time > 0 else 0.0,
+            "survived": self.scene.player.current_hp > 0,
+            "score": self.score,
+            "level": self.scene.player.level,
+        }
+
+    def step(self, dt, upgrade_policy=None, render=False):
+        """
+        规则：外部驱动的单个逻辑步 (无头运行 / 基准场景共用)。
+        升级面板打开时先自动选卡，再推进一步；render=True 时顺带画一帧并 flip
+        """
+        if self.state == "UPGRADING":
+            self.auto_upgrade(upgrade_policy)
+
+        self.profiler.begin_frame()
+        self._update_dispatch(dt)
+        if render:
+            self._draw_dispatch()
+            self.profiler.mark()
+            pygame.display.flip()
+            self.profiler.lap("flip")
+        self.profiler.end_frame()
+
+    def auto_upgrade(self, upgrade_policy=None):
+        """无头模式下代替玩家点击升级卡片"""
+        panel = self.ui_manager.menus['upgrade']
+        if not panel.options:
+            panel.visible = False
+            self.resume()
+            return
+        if upgrade_policy:
+            # 策略的随机性也走种子化的流，保证同种子同结果
+            choice = upgrade_policy(panel.options, self.scene.rng.get("policy"))
+        else:
+            choice = panel.options[0]
+        panel.apply_upgrade(choice)
 
     def _handle_pause(self):
         """暂停切换规则"""
@@ -131,14 +288,19 @@ class GameEngine:
             self.ui_manager.update(dt)
         # 升级中和暂停中，不更新 scene 逻辑，从而实现“画面凝固”
 
-    def _draw_dispatch(self):
-        """一劳永逸的渲染分发"""
+    def _draw_dispatch(self, alpha=1.0):
+        """一劳永逸的渲染分发 (alpha: 固定步长下的插值系数)"""
         if self.state == "MAIN_MENU":
-            self.scene.draw()
+            self.scene.draw(alpha)
         else:
             # 战斗相关的全状态（玩、停、升）都要画背景和 UI
-            self.scene.draw()
+            self.scene.draw(alpha)
+            self.profiler.mark()
             self.ui_manager.draw(self.score)
+            self.profiler.lap("ui_draw")
+
+        if self.profiler.enabled and self.profiler_overlay:
+            self.profiler_overlay.draw()
 
 
 if __name__ == '__main__':
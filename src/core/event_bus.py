@@ -1,20 +1,165 @@
+import time
+
+
+class Event:
+    """
+    类型化事件基类：用 __slots__ 存字段，代替每次 emit 都新建的 kwargs 字典。
+    规则：子类声明 type (事件名) 和 __slots__ (字段)，处理函数收到的是事件对象本身
+    """
+    __slots__ = ()
+    type = None
+
+
+class EnemyDied(Event):
+    __slots__ = ("enemy", "killer")
+    type = "ENEMY_DIED"
+
+    def __init__(self, enemy, killer):
+        self.enemy = enemy
+        self.killer = killer
+
+
+class Subscription:
+    """一条订阅记录 (unsubscribe / 作用域回收时按它查找)"""
+    __slots__ = ("event_type", "callback", "scope", "batch")
+
+    def __init__(self, event_type, callback, scope, batch):
+        self.event_type = event_type
+        self.callback = callback
+        self.scope = scope
+        self.batch = batch
+
+
 class EventBus:
     """
     事件总线：解耦神器。
     让不同的系统（如：升级系统和引擎）通过发送消息通信，而不是直接调用。
+    - emit(名称, **kwargs)：立即同步分发 (UI 按钮等需要马上生效的信号)
+    - post(事件对象)：进入延迟队列，由 flush() 在固定时机按类型成批分发 (战斗中的高频信号)
+    - scope：订阅可以挂在某个作用域 (如场景) 上，drop_scope() 时一并注销，切场景不再堆积
+    - stats()：每种事件的次数、处理函数调用次数与耗时
     """
+    MAX_FLUSH_ROUNDS = 8  # flush 中处理函数又 post 的事件，最多再连锁分发几轮
+
     def __init__(self):
-        self.listeners = {}
+        self.listeners = {}  # { 事件名: [Subscription] }
+        self.scopes = {}  # { 作用域: [Subscription] }
+        self.queue = []
+        self.counts = {}  # { 事件名: 发出次数 }
+        self.timings = {}  # { 事件名: [处理函数调用次数, 总耗时, 最大单次耗时] }
+        self.peak_queue = 0
+
+    def subscribe(self, event_type, callback, scope=None, batch=False):
+        """
+        batch=True 时 (仅对 post 的事件)：每次 flush 只调用一次，参数为本批同类事件的列表
+        返回订阅记录，可交给 unsubscribe()
+        """
+        sub = Subscription(event_type, callback, scope, batch)
+        self.listeners.setdefault(event_type, []).append(sub)
+        if scope is not None:
+            self.scopes.setdefault(scope, []).append(sub)
+        return sub
 
-    def subscribe(self, event_type, callback):
-        if event_type not in self.listeners:
-            self.listeners[event_type] = []
-        self.listeners[event_type].append(callback)
+    def unsubscribe(self, event_type, callback=None):
+        """注销订阅：传订阅记录，或 (事件名, 回调)"""
+        if isinstance(event_type, Subscription):
+            removed = [event_type]
+        else:
+            removed = [s for s in self.listeners.get(event_type, ()) if s.callback == callback]
+
+        for sub in removed:
+            subs = self.listeners.get(sub.event_type, [])
+            if sub in subs:
+                subs.remove(sub)
+            # 规则：作用域里也一并摘掉，作用域本身不再持有已注销的订阅 (和它引用的对象)
+            scoped = self.scopes.get(sub.scope)
+            if scoped is not None and sub in scoped:
+                scoped.remove(sub)
+                if not scoped:
+                    del self.scopes[sub.scope]
+
+    def drop_scope(self, scope):
+        """规则：作用域结束 (如场景切走) 时，注销挂在它上面的全部订阅"""
+        for sub in tuple(self.scopes.get(scope, ())):
+            self.unsubscribe(sub)
+        self.scopes.pop(scope, None)
 
     def emit(self, event_type, **kwargs):
-        if event_type in self.listeners:
-            for callback in self.listeners[event_type]:
-                callback(**kwargs)
+        self.counts[event_type] = self.counts.get(event_type, 0) + 1
+        subs = self.listeners.get(event_type)
+        if subs:
+            for sub in tuple(subs):  # 处理中注销订阅也安全
+                self._call(event_type, sub.callback, kwargs=kwargs)
+
+    def post(self, event):
+        """延迟分发：事件先入队，等 flush()"""
+        self.counts[event.type] = self.counts.get(event.type, 0) + 1
+        self.queue.append(event)
+
+    def flush(self):
+        """
+        规则：把队列里的事件按类型分批交给处理函数 (同类事件保持发出顺序)。
+        普通订阅逐个收到事件对象，batch 订阅一次收到整批列表
+        """
+        rounds = 0
+        while self.queue and rounds < self.MAX_FLUSH_ROUNDS:
+            queue, self.queue = self.queue, []
+            if len(queue) > self.peak_queue:
+                self.peak_queue = len(queue)
+
+            batches = {}
+            for event in queue:
+                batches.setdefault(event.type, []).append(event)
+
+            for event_type, events in batches.items():
+                subs = self.listeners.get(event_type)
+                if not subs: continue
+                for sub in tuple(subs):
+                    if sub.batch:
+                        self._call(event_type, sub.callback, args=(events,))
+                    else:
+                        for event in events:
+                            self._call(event_type, sub.callback, args=(event,))
+            rounds += 1
+
+        if self.queue:
+            print(f"⚠️ EventBus: 连锁事件超过 {self.MAX_FLUSH_ROUNDS} 轮，{len(self.queue)} 个留到下次 flush")
+
+    def clear(self):
+        """丢弃尚未分发的事件"""
+        self.queue.clear()
+
+    def _call(self, event_type, callback, args=(), kwargs=None):
+        start = time.perf_counter()
+        if kwargs is None:
+            callback(*args)
+        else:
+            callback(**kwargs)
+        elapsed = time.perf_counter() - start
+
+        timing = self.timings.get(event_type)
+        if timing is None:
+            timing = self.timings[event_type] = [0, 0.0, 0.0]
+        timing[0] += 1
+        timing[1] += elapsed
+        if elapsed > timing[2]:
+            timing[2] = elapsed
+
+    def stats(self):
+        """{ 事件名: {count, calls, total_ms, max_ms} } + 队列峰值"""
+        events = {}
+        for event_type, count in self.counts.items():
+            calls, total, peak = self.timings.get(event_type, (0, 0.0, 0.0))
+            events[event_type] = {"count": count, "calls": calls,
+                                  "total_ms": round(total * 1000, 3), "max_ms": round(peak * 1000, 3)}
+        return {"events": events, "peak_queue": self.peak_queue,
+                "subscriptions": sum(len(s) for s in self.listeners.values())}
+
+    def reset_stats(self):
+        self.counts.clear()
+        self.timings.clear()
+        self.peak_queue = 0
+
 
 # 创建全局唯一的实例
-bus = EventBus()
\ No newline at end of file
+bus = EventBus()
@@ -0,0 +1,67 @@
+class ObjectPool:
+    """
+    通用对象池：短命实体 (宝石、地面特效、子弹) 反复回收复用，避免频繁构造与 GC 抖动。
+    规则：
+    - acquire(*args) 池里有闲置对象就调用 obj.reset(*args) 复用，否则 factory(*args) 新建
+    - 被池创建的对象会记住自己的池 (obj.pool)，kill() 时由实体自己 release 回来
+    - 闲置对象超过 max_size 时直接丢弃，交给 GC，防止峰值过后长期占用内存
+    """
+
+    def __init__(self, factory, max_size=512, name=None):
+        self.factory = factory
+        self.max_size = max_size
+        self.name = name or getattr(factory, '__name__', 'pool')
+        self.free = []
+
+        # 统计
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.dropped = 0
+        self.in_use = 0
+        self.high_water = 0  # 同时在用的最大数量
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            obj.pool = self
+            self.created += 1
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        self.in_use -= 1
+        self.released += 1
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+        else:
+            obj.pool = None
+            self.dropped += 1
+
+    def prewarm(self, count, *args, **kwargs):
+        """预先创建 count 个闲置对象 (创建后立即归还，不计入在用)"""
+        for _ in range(count):
+            obj = self.acquire(*args, **kwargs)
+            obj.kill()
+
+    def clear(self):
+        for obj in self.free:
+            obj.pool = None
+        self.free = []
+
+    def stats(self):
+        return {
+            "size": len(self.free),
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+            "dropped": self.dropped,
+        }
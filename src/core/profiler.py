@@ -0,0 +1,101 @@
+import time
+
+
+class FrameProfiler:
+    """
+    帧内分段计时器：记录 CombatScene 每个阶段的耗时，存入固定长度的环形缓冲。
+    规则：
+    - 关闭时 lap()/mark() 只做一次布尔判断后返回，几乎零开销
+    - 同名阶段在一帧内可多次出现 (固定步长一帧多步)，耗时自动累加
+    """
+
+    def __init__(self, size=240):
+        self.enabled = False
+        self.size = size
+
+        # 环形缓冲：index 指向下一次写入的位置，count 为有效样本数
+        self.index = 0
+        self.count = 0
+        self.frame_times = [0.0] * size
+        self.sections = {}  # { '阶段名': [耗时 x size] }
+
+        self._current = {}
+        self._frame_start = None  # None 表示本帧没有经过 begin_frame (如帧中途才打开)
+        self._last = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._frame_start = None
+
+    def begin_frame(self):
+        if not self.enabled: return
+        self._frame_start = self._last = time.perf_counter()
+        self._current = {}
+
+    def mark(self):
+        """从此刻开始计时，之前的时间不归入任何阶段"""
+        if not self.enabled: return
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        """把上一次 mark/lap 到现在的耗时记到 name 阶段"""
+        if not self.enabled: return
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._last)
+        self._last = now
+
+    def end_frame(self):
+        # 规则：只记录完整的帧；begin_frame 时还关着 (帧中途按 F3 打开) 的那一帧直接丢弃
+        if not self.enabled or self._frame_start is None: return
+        i = self.index
+        self.frame_times[i] = time.perf_counter() - self._frame_start
+        self._frame_start = None
+
+        for name, ring in self.sections.items():
+            ring[i] = self._current.pop(name, 0.0)
+        for name, value in self._current.items():
+            # 新出现的阶段：补建一条环形缓冲
+            ring = [0.0] * self.size
+            ring[i] = value
+            self.sections[name] = ring
+
+        self.index = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def _samples(self, ring):
+        if self.count < self.size:
+            return ring[:self.count]
+        return ring
+
+    @staticmethod
+    def percentile(sorted_values, p):
+        if not sorted_values: return 0.0
+        k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+        return sorted_values[k]
+
+    def summary(self):
+        """导出统计 (毫秒)：整帧 p50/p95/p99/max，以及各阶段均值与 p95"""
+        frames = sorted(self._samples(self.frame_times))
+        result = {
+            "frames": len(frames),
+            "frame_ms": {
+                "p50": self.percentile(frames, 50) * 1000,
+                "p95": self.percentile(frames, 95) * 1000,
+                "p99": self.percentile(frames, 99) * 1000,
+                "max": (frames[-1] if frames else 0.0) * 1000,
+            },
+            "sections_ms": {},
+        }
+        for name, ring in self.sections.items():
+            values = sorted(self._samples(ring))
+            if not values: continue
+            result["sections_ms"][name] = {
+                "mean": sum(values) / len(values) * 1000,
+                "p95": self.percentile(values, 95) * 1000,
+            }
+        return result
+
+    def reset(self):
+        self.index = self.count = 0
+        self.frame_times = [0.0] * self.size
+        self.sections = {}
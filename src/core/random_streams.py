@@ -0,0 +1,23 @@
+import random
+
+
+class RandomStreams:
+    """
+    分系统的随机数流：每个子系统 (刷怪、武器、伤害、升级...) 拿到一条独立的 Random。
+    规则：
+    - 所有流都由同一个种子派生，种子相同则整局结果逐位一致
+    - 各流互不干扰：视觉抖动多抽一次随机数，不会改变刷怪顺序
+    """
+
+    def __init__(self, seed=None):
+        # 没给种子也随机生成一个并记录下来，方便事后复现这一局
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self._streams = {}
+
+    def get(self, name):
+        rng = self._streams.get(name)
+        if rng is None:
+            # 字符串种子走 sha512 派生，不受 PYTHONHASHSEED 影响
+            rng = random.Random(f"{self.seed}:{name}")
+            self._streams[name] = rng
+        return rng
@@ -1,7 +1,38 @@
 # core/registry.py
 import os
 import json
+import time
 import pygame
+from collections import OrderedDict
+from src.core.constants import TEXTURE_BUDGET_BYTES, TEXTURE_PINNED_PREFIXES, TEXTURE_ATLAS_PREFIXES
+from src.core.atlas import TextureAtlas
+from src.core.config_cache import ConfigCache
+from src.core.config_schema import ConfigError, normalize_config
+from src.combat.weapon_spec import compile_specs, spec_at, spec_fingerprint
+
+CONFIG_CACHE_PATH = "data/cache/config_snapshot.pkl"
+UPGRADES_FILE = "data/configs/upgrades.json"
+
+# 规则：配置驱动。只需增加字典项即可支持新类型 JSON ({ 属性名: 目录 })
+CONFIG_DIRS = {
+    'weapons': 'data/configs/weapons',
+    'enemies': 'data/configs/enemies',
+    'characters': 'data/configs/characters',
+    'waves': 'data/configs/waves',
+    'scenarios': 'data/configs/scenarios'
+}
+
+
+def _update_in_place(target, source):
+    """把 source 的内容写进 target：两边都是字典的键逐层递归，保留内嵌字典的对象身份，其余值直接替换"""
+    for key in [k for k in target if k not in source]:
+        del target[key]
+    for key, value in source.items():
+        current = target.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            _update_in_place(current, value)
+        else:
+            target[key] = value
 
 
 class Registry:
@@ -11,13 +42,30 @@ class Registry:
         self.enemies = {}
         self.characters = {}
         self.waves = {}  # 预留给未来的波次系统
+        self.scenarios = {}  # 性能基准场景 (bench.py)
         self.upgrades = []
+        self.config_cache = None  # 最近一次加载用的配置快照 (统计用)
+        self.config_sources = {}  # { (类别, ID): 源文件路径 }，用于发现重复 ID
+        self.config_version = 0  # 每次热重载加一 (原地更新的配置对象身份不变，缓存靠它判断过期)
+        self.weapon_specs = {}  # { 武器ID: 各等级 WeaponSpec }，加载时从快照取，热重载时作废
 
         # 2. 逻辑映射：存放 Python 类逻辑 (由装饰器注入)
         self.weapon_logic = {}
 
-        # 3. 资产库：存放加载好的 Surface 对象
-        self.textures = {}
+        # 3. 资产库：启动时只建 ID -> 路径 索引，首次使用才解码
+        # textures 按最近使用排序 (LRU)，解码后的字节数超出预算时从最旧的开始淘汰
+        self.texture_paths = {}
+        self.textures = OrderedDict()
+        self.texture_bytes = 0
+        self.texture_budget = TEXTURE_BUDGET_BYTES
+        self.pinned = set()  # 常驻贴图 (不参与淘汰)
+        self.placeholders = {}  # { 颜色: 占位 Surface }，缺失的 ID 共用，不进 LRU
+        self.missing = set()  # 已报告过缺失的 ID (只提示一次)
+        self.atlas = TextureAtlas()  # build_atlas() 打包的常驻贴图，不参与 LRU
+        self.drop_hooks = []  # 贴图离开 LRU 时回调 (asset_id)，派生缓存 (如缩放副本) 据此一起释放
+        # placeholders：对未收录 ID 的查询，单独计数，不算未命中 (菜单每帧都会查缺失的立绘)
+        self.texture_counters = {"hits": 0, "misses": 0, "placeholders": 0, "loads": 0, "load_time": 0.0,
+                                 "evictions": 0}
 
     def register_logic(self, logic_id):
         """规则：使用装饰器将 Python 类关联到 JSON 配置的 logic_type"""
@@ -28,44 +76,154 @@ class Registry:
 
         return wrapper
 
-    def load_all(self):
-        """规则：一键启动所有规则化加载"""
+    def load_all(self, load_assets=True):
+        """规则：一键启动所有规则化加载 (无头模式没有显示设备，跳过贴图解码)"""
         self._load_configs()
-        self._load_assets()
+        if load_assets:
+            self._index_assets()
         print(f"🚀 Registry 全量同步完成")
 
     def _load_configs(self):
-        """规则：配置驱动。只需增加字典项即可支持新类型 JSON"""
-        config_map = {
-            'weapons': 'data/configs/weapons',
-            'enemies': 'data/configs/enemies',
-            'characters': 'data/configs/characters',
-            'waves': 'data/configs/waves'
-        }
+        """
+        规则：配置驱动。只需在 CONFIG_DIRS 增加字典项即可支持新类型 JSON
+        解析结果走快照缓存 (data/cache/)，没改过的文件不再重复 json 解析；武器的各级 WeaponSpec 也一起存进快照
+        规则：校验不通过或 ID 重复时汇总后抛 ConfigError，不带着坏配置 (或被覆盖掉的同名配置) 进游戏
+        """
+        cache = ConfigCache(CONFIG_CACHE_PATH)
+        self.config_cache = cache
+        self.config_sources = {}
+        spec_key = spec_fingerprint()
+        problems = []
 
-        for attr, path in config_map.items():
+        for attr, path in CONFIG_DIRS.items():
             if not os.path.exists(path):
                 continue
 
+            for f in sorted(os.listdir(path)):
+                if not f.endswith(".json"):
+                    continue
+                file_path = os.path.join(path, f)
+                try:
+                    data = cache.load_json(file_path)
+                except Exception as e:
+                    print(f"❌ 配置文件解析失败 [{f}]: {e}")
+                    continue
+
+                # 规则：所有配置文件必须包含 'id' 字段作为 Key (没有 id 的草稿文件不登记)
+                if isinstance(data, dict) and 'id' not in data:
+                    print(f"⚠️ 配置文件缺少 'id'，未登记 [{file_path}]")
+                    continue
+                errors = normalize_config(attr, data)
+                if errors:
+                    problems.extend(f"[{file_path}] {e}" for e in errors)
+                    continue
+
+                owner = self.config_sources.setdefault((attr, data['id']), file_path)
+                if owner != file_path:
+                    problems.append(f"[{file_path}] {attr} ID '{data['id']}' 与 [{owner}] 重复")
+                    continue
+                getattr(self, attr)[data['id']] = data
+
+                if attr == 'weapons':
+                    specs = cache.derived(file_path, spec_key)
+                    if specs is None:
+                        specs = compile_specs(data)
+                        cache.put_derived(file_path, spec_key, specs)
+                    self.weapon_specs[data['id']] = specs
+
+        # 独立处理特殊的数组型配置
+        if os.path.exists(UPGRADES_FILE):
+            self.upgrades = cache.load_json(UPGRADES_FILE)
+            problems.extend(f"[{UPGRADES_FILE}] {e}" for e in normalize_config('upgrades', self.upgrades))
+
+        # 跨文件引用：角色的初始武器必须存在
+        for char_id, char in self.characters.items():
+            weapon_id = char.get('starting_weapon')
+            if weapon_id is not None and weapon_id not in self.weapons:
+                problems.append(f"[{self.config_sources[('characters', char_id)]}] 初始武器 '{weapon_id}' 不存在")
+
+        if problems:
+            raise ConfigError("配置校验失败:\n" + "\n".join(problems))
+        cache.save()
+
+    def config_files(self):
+        """所有受管的配置文件路径 (热重载监视用)"""
+        for path in CONFIG_DIRS.values():
+            if not os.path.exists(path):
+                continue
             for f in os.listdir(path):
                 if f.endswith(".json"):
-                    try:
-                        with open(os.path.join(path, f), 'r', encoding='utf-8') as file:
-                            data = json.load(file)
-                            # 规则：所有配置文件必须包含 'id' 字段作为 Key
-                            if 'id' in data:
-                                getattr(self, attr)[data['id']] = data
-                    except Exception as e:
-                        print(f"❌ 配置文件解析失败 [{f}]: {e}")
+                    yield os.path.join(path, f)
+        if os.path.exists(UPGRADES_FILE):
+            yield UPGRADES_FILE
 
-        # 独立处理特殊的数组型配置
-        upgrade_file = "data/configs/upgrades.json"
-        if os.path.exists(upgrade_file):
-            with open(upgrade_file, 'r', encoding='utf-8') as f:
-                self.upgrades = json.load(f)
+    def reload_config(self, file_path):
+        """
+        热重载单个配置文件，返回 (类别, 配置)；解析失败、校验不通过或 ID 与其他文件重复时返回 None (保留旧配置)。
+        规则：已存在的配置字典逐层原地更新，武器、敌人等持有的引用 (包括内嵌的 starting_weapon_config) 直接看到新值
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = json.loads(f.read().decode('utf-8'))
+        except Exception as e:
+            print(f"❌ 配置文件解析失败 [{file_path}]: {e}")
+            return None
+
+        if os.path.normpath(file_path) == os.path.normpath(UPGRADES_FILE):
+            if not self._check_reload(file_path, normalize_config('upgrades', data)):
+                return None
+            self.upgrades[:] = data
+            self.config_version += 1
+            return "upgrades", self.upgrades
+
+        folder = os.path.normpath(os.path.dirname(file_path))
+        for attr, path in CONFIG_DIRS.items():
+            if folder != os.path.normpath(path) or not isinstance(data, dict) or 'id' not in data: continue
+            if not self._check_reload(file_path, normalize_config(attr, data)):
+                return None
+            owner = self.config_sources.get((attr, data['id']))
+            if owner is not None and os.path.normpath(owner) != os.path.normpath(file_path):
+                print(f"❌ 热重载被拒绝 [{file_path}]: {attr} ID '{data['id']}' 与 [{owner}] 重复")
+                return None
+            self.config_sources[(attr, data['id'])] = file_path
+
+            table = getattr(self, attr)
+            if attr == 'weapons':
+                self.weapon_specs.pop(data['id'], None)
+            config = table.get(data['id'])
+            if config is None:
+                table[data['id']] = config = data
+            else:
+                _update_in_place(config, data)
+            self.config_version += 1
+            return attr, config
+        return None
+
+    @staticmethod
+    def _check_reload(file_path, problems):
+        for problem in problems:
+            print(f"❌ 热重载被拒绝 [{file_path}]: {problem}")
+        return not problems
 
-    def _load_assets(self):
-        """规则：资产自动发现。扫描 assets/textures 下所有图片，自动生成层级 ID"""
+    def weapon_specs_for(self, config):
+        """各等级的 WeaponSpec：注册表里的配置复用缓存 (快照里编译好的)，内嵌配置 (如角色自带武器) 现场编译"""
+        weapon_id = config.get('id')
+        if weapon_id is not None and self.weapons.get(weapon_id) is config:
+            specs = self.weapon_specs.get(weapon_id)
+            if specs is None:
+                specs = self.weapon_specs[weapon_id] = compile_specs(config)
+            return specs
+        return compile_specs(config)
+
+    def weapon_spec(self, weapon_id, level=1):
+        """规则：命中触发的子武器等不挂在 WeaponManager 上的武器，从这里取编译好的规格 (同一 ID 只编译一次)"""
+        config = self.weapons.get(weapon_id)
+        if config is None:
+            return None
+        return spec_at(self.weapon_specs_for(config), level)
+
+    def _index_assets(self):
+        """规则：资产自动发现。扫描 assets/textures 下所有图片，自动生成层级 ID (只记路径，不解码)"""
         base_path = "assets/textures"
         if not os.path.exists(base_path):
             os.makedirs(base_path, exist_ok=True)
@@ -81,25 +239,145 @@ class Registry:
                     rel_path = os.path.relpath(full_path, base_path)
                     asset_id = os.path.splitext(rel_path)[0].replace("\\", "/")
 
-                    try:
-                        # 自动处理透明度并优化渲染效率
-                        surf = pygame.image.load(full_path).convert_alpha()
-                        self.textures[asset_id] = surf
-                    except Exception as e:
-                        print(f"❌ 资产加载失败 [{asset_id}]: {e}")
+                    self.texture_paths[asset_id] = full_path
 
     def get_texture(self, asset_id, fallback_color=(255, 0, 255)):
-        """规则：安全的资产获取。如果贴图缺失，自动生成一个紫色方块补丁"""
-        if asset_id in self.textures:
-            return self.textures[asset_id]
-
-        # 工业级补救：动态生成错误提示图
-        print(f"⚠️ 资产缺失: {asset_id}，已生成占位符")
-        error_surf = pygame.Surface((32, 32))
-        error_surf.fill(fallback_color)
-        self.textures[asset_id] = error_surf
+        """规则：安全的资产获取。首次使用时解码；如果贴图缺失，返回一个紫色方块补丁"""
+        surf = self.atlas.get(asset_id)
+        if surf is not None:
+            self.texture_counters["hits"] += 1
+            return surf
+
+        surf = self.textures.get(asset_id)
+        if surf is not None:
+            self.textures.move_to_end(asset_id)
+            self.texture_counters["hits"] += 1
+            return surf
+
+        if asset_id in self.texture_paths:
+            self.texture_counters["misses"] += 1
+            surf = self._load_texture(asset_id)
+            if surf is not None:
+                return surf
+        else:
+            self.texture_counters["placeholders"] += 1
+
+        # 工业级补救：缺失的 ID 共用同色占位图 (不缓存到 ID 上，资产补上后下次就能加载到)
+        if asset_id not in self.missing:
+            self.missing.add(asset_id)
+            print(f"⚠️ 资产缺失: {asset_id}，已生成占位符")
+        error_surf = self.placeholders.get(fallback_color)
+        if error_surf is None:
+            error_surf = pygame.Surface((32, 32))
+            error_surf.fill(fallback_color)
+            self.placeholders[fallback_color] = error_surf
         return error_surf
 
+    def _load_texture(self, asset_id):
+        surf = self._decode_texture(asset_id)
+        if surf is None:
+            return None
+        self.textures[asset_id] = surf
+        self.texture_bytes += self._surface_bytes(surf)
+        self._evict()
+        return surf
+
+    def _decode_texture(self, asset_id):
+        path = self.texture_paths.get(asset_id)
+        if path is None:
+            return None
+        start = time.perf_counter()
+        try:
+            surf = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert_alpha()  # 自动处理透明度并优化渲染效率
+        except Exception as e:
+            print(f"❌ 资产加载失败 [{asset_id}]: {e}")
+            self.texture_paths.pop(asset_id, None)
+            return None
+        counters = self.texture_counters
+        counters["loads"] += 1
+        counters["load_time"] += time.perf_counter() - start
+        return surf
+
+    def build_atlas(self, prefixes=TEXTURE_ATLAS_PREFIXES):
+        """
+        规则：把指定目录下的小贴图一次性打进图集 (按高度排序装箱)，之后 get_texture 直接给图集的 subsurface。
+        进了图集的贴图常驻，从 LRU 中移出；太大放不进的照旧走 LRU
+        """
+        items = []
+        for asset_id in self.texture_paths:
+            if not asset_id.startswith(prefixes) or asset_id in self.atlas: continue
+            surf = self.textures.get(asset_id) or self._decode_texture(asset_id)
+            if surf is not None:
+                items.append((asset_id, surf))
+
+        packed = 0
+        for asset_id, surf in self.atlas.add_many(items).items():
+            if asset_id not in self.atlas: continue
+            packed += 1
+            old = self.textures.pop(asset_id, None)
+            if old is not None:
+                self.texture_bytes -= self._surface_bytes(old)
+                self._texture_dropped(asset_id)
+        return packed
+
+    @staticmethod
+    def _surface_bytes(surf):
+        return surf.get_pitch() * surf.get_height()
+
+    def is_pinned(self, asset_id):
+        return asset_id in self.pinned or asset_id.startswith(TEXTURE_PINNED_PREFIXES)
+
+    def is_resident(self, asset_id):
+        """常驻 (在图集里或被 pin) 的贴图不会被淘汰，基于它的派生缓存可以长期保留"""
+        return asset_id in self.atlas or self.is_pinned(asset_id)
+
+    def on_texture_dropped(self, callback):
+        self.drop_hooks.append(callback)
+
+    def _texture_dropped(self, asset_id):
+        for hook in self.drop_hooks:
+            hook(asset_id)
+
+    def pin(self, asset_id):
+        """常驻：HUD、玩家等随时要画的贴图不参与淘汰"""
+        self.pinned.add(asset_id)
+
+    def unpin(self, asset_id):
+        self.pinned.discard(asset_id)
+        self._evict()
+
+    def _evict(self):
+        """规则：超出预算时从最久未用的开始淘汰，跳过常驻贴图 (全是常驻时允许超预算)"""
+        if self.texture_bytes <= self.texture_budget:
+            return
+        for asset_id in list(self.textures):
+            if self.texture_bytes <= self.texture_budget:
+                break
+            if self.is_pinned(asset_id): continue
+            surf = self.textures.pop(asset_id)
+            self.texture_bytes -= self._surface_bytes(surf)
+            self.texture_counters["evictions"] += 1
+            self._texture_dropped(asset_id)
+
+    def texture_stats(self):
+        c = self.texture_counters
+        lookups = c["hits"] + c["misses"]
+        return {
+            "indexed": len(self.texture_paths),
+            "resident": len(self.textures),
+            "resident_mb": round(self.texture_bytes / (1024 * 1024), 2),
+            "budget_mb": round(self.texture_budget / (1024 * 1024), 2),
+            "hit_rate": round(c["hits"] / lookups, 3) if lookups else 0.0,
+            "placeholders": c["placeholders"],
+            "loads": c["loads"],
+            "load_ms": round(c["load_time"] * 1000, 2),
+            "evictions": c["evictions"],
+            "missing": len(self.missing),
+            "atlas": self.atlas.stats(),
+        }
+
 
 # 创建全局单例
 registry = Registry()
\ No newline at end of file
@@ -0,0 +1,19 @@
+class SimClock:
+    """
+    模拟时钟：由战斗场景持有，只随逻辑步推进。
+    用来替代 pygame.time.get_ticks()：
+    - 逻辑时间与墙钟脱钩，模拟可以 10~100 倍快进
+    - 相同的 dt 序列必然得到相同的时间轴，结果可复现
+    """
+
+    def __init__(self):
+        self.time = 0.0  # 已模拟的秒数
+        self.frame = 0  # 已推进的逻辑步数
+
+    def advance(self, dt):
+        self.time += dt
+        self.frame += 1
+
+    def get_ticks(self):
+        """与 pygame.time.get_ticks() 同语义：返回毫秒整数"""
+        return int(self.time * 1000)
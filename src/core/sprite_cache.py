@@ -0,0 +1,166 @@
+import pygame
+from src.core.registry import registry
+from src.core.constants import ROTATION_BUCKETS
+from src.core.atlas import TextureAtlas
+
+
+class RotationSet:
+    """
+    一张贴图按 buckets 个角度桶预先旋转好，frame(angle) 直接取最近的一帧。
+    规则：默认懒生成 (用到哪个角度才旋转哪一帧)，prerender() 可一次性全部生成
+    """
+
+    def __init__(self, surface, buckets=ROTATION_BUCKETS, atlas=None):
+        self.base = surface
+        self.buckets = buckets
+        self.atlas = atlas  # 给定时旋转帧也拷进图集
+        self.step = 360 / buckets
+        self.frames = [None] * buckets
+
+    def index(self, angle):
+        return int(round(angle / self.step)) % self.buckets
+
+    def frame(self, angle):
+        i = self.index(angle)
+        surf = self.frames[i]
+        if surf is None:
+            surf = self._render(i)
+        return surf
+
+    def prerender(self):
+        for i in range(self.buckets):
+            if self.frames[i] is None:
+                self._render(i)
+        return self.frames
+
+    def _render(self, i):
+        surf = SpriteCache._finalize(pygame.transform.rotate(self.base, i * self.step))
+        if self.atlas is not None:
+            surf = self.atlas.add(("rotation", id(self.base), self.buckets, i), surf)
+        self.frames[i] = surf
+        return surf
+
+
+class SpriteCache:
+    """
+    程序化贴图缓存：同形状/尺寸/颜色 (或同贴图 + 缩放尺寸) 只绘制一次，所有实例共享一张 Surface。
+    规则：
+    - 共享的 Surface 只读，需要改像素的调用方自行 copy()
+    - 有显示设备时 convert_alpha()，blit 走快速路径；无头模式没有显示，保持原样
+    - 小贴图统一拷进图集 (atlas)，交出去的是图集页面的 subsurface
+    - 非常驻贴图的缩放副本不进图集 (图集只增不减)，注册表淘汰原图时连同其旋转帧一起丢弃
+    """
+
+    def __init__(self):
+        self.surfaces = {}  # { key: Surface }
+        self.atlas = TextureAtlas()
+        self.derived = {}  # { asset_id: [Surface] }，会随原图淘汰的缩放副本
+        self.hits = 0
+        self.misses = 0
+        registry.on_texture_dropped(self._drop_texture)
+
+    def shape(self, shape, size, color, border_radius=0, outline=None):
+        """
+        shape: 'circle' | 'rect' (可圆角) | 'diamond'
+        outline: (颜色, 线宽)，在填充之上再描一圈边
+        """
+        size = (int(size[0]), int(size[1]))
+        color = tuple(color)
+        if outline:
+            outline = (tuple(outline[0]), outline[1])
+        key = ("shape", shape, size, color, border_radius, outline)
+
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self._finalize(self._draw_shape(shape, size, color, border_radius, outline))
+        surf = self.atlas.add(key, surf)
+        self.surfaces[key] = surf
+        return surf
+
+    def texture(self, asset_id, size=None):
+        """注册表贴图按目标尺寸缩放后缓存 (size 为 None 时原图)"""
+        size = (int(size[0]), int(size[1])) if size else None
+        key = ("texture", asset_id, size)
+
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = registry.get_texture(asset_id)
+        if size and surf.get_size() != size:
+            surf = pygame.transform.scale(surf, size)
+        surf = self._finalize(surf)
+        if registry.is_resident(asset_id):
+            surf = self.atlas.add(key, surf)
+        else:
+            self.derived.setdefault(asset_id, []).append(surf)
+        self.surfaces[key] = surf
+        return surf
+
+    def _drop_texture(self, asset_id):
+        """注册表淘汰了 asset_id：丢弃它的缩放副本，以及这些副本的旋转帧"""
+        copies = self.derived.pop(asset_id, None)
+        if not copies: return
+        dropped = {id(surf) for surf in copies}
+        for key in [k for k in self.surfaces if k[0] == "texture" and k[1] == asset_id]:
+            del self.surfaces[key]
+        for key in [k for k in self.surfaces if k[0] == "rotations" and k[1] in dropped]:
+            del self.surfaces[key]
+
+    def rotations(self, surface, buckets=None):
+        """取 surface 的旋转帧集合 (同一张共享贴图只旋转一次)"""
+        buckets = buckets or ROTATION_BUCKETS
+        key = ("rotations", id(surface), buckets)  # RotationSet 持有 surface 引用，id 不会被复用
+
+        rot = self.surfaces.get(key)
+        if rot is not None:
+            self.hits += 1
+            return rot
+
+        self.misses += 1
+        # 会被淘汰的缩放副本，其旋转帧也不进图集
+        derived = any(surface in copies for copies in self.derived.values())
+        rot = RotationSet(surface, buckets, None if derived else self.atlas)
+        self.surfaces[key] = rot
+        return rot
+
+    @staticmethod
+    def _draw_shape(shape, size, color, border_radius, outline):
+        w, h = size
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        if shape == "circle":
+            pygame.draw.circle(surf, color, (w // 2, h // 2), w // 2)
+            if outline:
+                pygame.draw.circle(surf, outline[0], (w // 2, h // 2), w // 2, outline[1])
+        elif shape == "diamond":
+            pygame.draw.polygon(surf, color, [(w // 2, 0), (w, h // 2), (w // 2, h), (0, h // 2)])
+        else:
+            pygame.draw.rect(surf, color, (0, 0, w, h), border_radius=border_radius)
+            if outline:
+                pygame.draw.rect(surf, outline[0], (0, 0, w, h), outline[1], border_radius=border_radius)
+        return surf
+
+    @staticmethod
+    def _finalize(surf):
+        if pygame.display.get_surface() is not None:
+            return surf.convert_alpha()
+        return surf
+
+    def clear(self):
+        self.surfaces = {}
+        self.derived = {}
+        self.atlas.clear()
+
+    def stats(self):
+        return {"entries": len(self.surfaces), "hits": self.hits, "misses": self.misses,
+                "atlas": self.atlas.stats()}
+
+
+# 创建全局单例
+sprite_cache = SpriteCache()
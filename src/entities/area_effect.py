@@ -2,28 +2,41 @@ import pygame
 from src.entities.base_entity import BaseEntity
 from src.core.constants import *
 from src.combat.damage_system import DamageSystem
+from src.combat.combat_utils import CombatUtils
+from src.core.registry import registry
+from src.combat.weapon_spec import compile_spec
 
 
 class AreaEffectEntity(BaseEntity):
-    def __init__(self, pos, groups, player, config):
+    hidden = True  # 逻辑实体：透明占位图不需要逐帧 blit
+    def __init__(self, pos, groups, player, config, spec=None):
         # 初始图层设为背景层
         super().__init__(pos, groups, LAYER_BG)
+        self.rect = pygame.Rect(0, 0, 1, 1)  # 逻辑坐标由 self.pos 驱动
+        self.reset(pos, groups, player, config, spec)
+
+    def reset(self, pos, groups, player, config, spec=None):
+        """
+        对象池复用：按 (可能不同的) 配置重新初始化
+        spec: 武器当前等级的 WeaponSpec；未传时取注册表缓存的 LV.1 规格 (不在注册表里的配置才现场编译)
+        """
+        self.respawn(pos, groups)
         self.player = player
         self.config = config
 
-        # 1. 行为参数解析
-        behavior = config.get("behavior", {})
-        self.is_attached = behavior.get("is_attached", True)
-        self.max_duration = behavior.get("max_duration", 9999)
-        self.tick_interval = behavior.get("tick_interval", 0.5)
+        # 1. 行为参数：半径 / 伤害 / 触发间隔等逐帧只读 self.spec
+        if spec is None:
+            spec = registry.weapon_spec(config.get("id")) if config.get("id") in registry.weapons else None
+        self.spec = spec if spec is not None else compile_spec(config, 1)
+        self.is_attached = self.spec.is_attached
+        self.max_duration = self.spec.max_duration
 
         # 2. 状态计时
         self.life_timer = 0.0
         self.tick_timer = 0.0
 
         # 3. 初始物理位置
-        self.pos = pygame.math.Vector2(pos)
-        self.rect = pygame.Rect(0, 0, 1, 1)  # 逻辑坐标由 self.pos 驱动
+        self.rect.center = (round(self.pos.x), round(self.pos.y))
 
     def update(self, dt):
         # 生命周期管理
@@ -40,33 +53,34 @@ class AreaEffectEntity(BaseEntity):
 
         # 频率触发逻辑
         self.tick_timer += dt
-        if self.tick_timer >= self.tick_interval:
+        if self.tick_timer >= self.spec.tick_interval:
             self._execute_area_damage()
             self.tick_timer = 0
 
     def _execute_area_damage(self):
         """核心：在这里调用统一的单体伤害逻辑"""
         stats = self.player.stats
+        spec = self.spec
 
-        # 计算最终半径和伤害 (配置 * 玩家加成)
-        final_radius = self.config.get("radius", 100) * stats.attack_area.value
-        final_damage = self.config.get("damage", 10) * stats.damage_mult.value
+        # 计算最终半径和伤害 (规格 * 玩家加成)
+        final_radius = spec.radius * stats.attack_area.value
+        final_damage = spec.base_damage * stats.damage_mult.value
 
         scene = self.player.engine.scene
         if hasattr(scene, 'enemy_group'):
-            for enemy in scene.enemy_group:
-                # 空间扫描：如果在圆圈内
-                if self.pos.distance_to(enemy.pos) <= final_radius:
-                    # --- 一劳永逸：无论什么武器，伤害都走这一个入口 ---
-                    DamageSystem.apply_damage(self.player.engine, enemy, final_damage)
+            # 空间扫描：走敌人组的网格索引，只检查圆圈覆盖到的格子
+            for enemy in CombatUtils.get_enemies_in_radius(self.pos, final_radius, scene.enemy_group):
+                # --- 一劳永逸：无论什么武器，伤害都走这一个入口 ---
+                DamageSystem.apply_damage(self.player.engine, enemy, final_damage,
+                                          source=spec.source_id)
 
     def draw_custom(self, screen, offset):
         """视觉表现：画一个带呼吸感的赛博圆环"""
         stats = self.player.stats
-        radius = self.config.get("radius", 100) * stats.attack_area.value
+        radius = self.spec.radius * stats.attack_area.value
         draw_pos = self.pos - offset
 
-        color = self.config.get("vfx_color", [0, 255, 240, 40])
+        color = self.spec.vfx_color
 
         # 性能优化：直接在主屏幕上画，不创建多余 Surface
         # 绘制半透明圆（利用圆环宽度模拟）
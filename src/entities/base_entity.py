@@ -1,13 +1,42 @@
 import pygame
 from src.core.constants import *
 
+_BLANK_SURFACE = None
+
+
+def blank_surface():
+    """共享的透明占位图：多数子类都会替换 image，不必每次生成都新建一张 Surface"""
+    global _BLANK_SURFACE
+    if _BLANK_SURFACE is None:
+        _BLANK_SURFACE = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    return _BLANK_SURFACE
+
+
 class BaseEntity(pygame.sprite.Sprite):
+    pool = None  # 由 ObjectPool 创建时写入，kill() 时自动归还
+    hidden = False  # 为 True 时 CameraGroup 不绘制 (自己画 draw_custom 的占位实体)
+
     def __init__(self, pos, groups, layer=LAYER_BG):
-        super().__init__(groups)
+        # 规则：z_index 必须在入组之前确定，CameraGroup 入组时按它分桶
         self.z_index = layer
+        super().__init__(groups)
         self.pos = pygame.math.Vector2(pos)
-        self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        self.prev_pos = pygame.math.Vector2(pos)  # 上一逻辑帧位置 (渲染插值用)
+        self.image = blank_surface()
         self.rect = self.image.get_rect(center=pos)
 
+    def respawn(self, pos, groups):
+        """对象池复用：重新入组、重置位置 (子类的 reset 钩子先调用它)"""
+        self.pos = pygame.math.Vector2(pos)
+        self.prev_pos = pygame.math.Vector2(pos)
+        self.add(*groups)
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        # 规则：只有真正离场的那一次才归还，重复 kill 不会把同一个对象放回两次
+        if self.pool is not None and was_alive:
+            self.pool.release(self)
+
     def update(self, dt):
-        pass
\ No newline at end of file
+        pass
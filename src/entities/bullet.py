@@ -2,6 +2,7 @@ import pygame
 from src.entities.base_entity import BaseEntity
 from src.core.constants import *
 from src.core.registry import registry
+from src.core.sprite_cache import sprite_cache
 
 
 class Bullet(BaseEntity):
@@ -13,6 +14,11 @@ class Bullet(BaseEntity):
     def __init__(self, pos, direction, groups, damage, weapon_config):
         # 初始图层
         super().__init__(pos, groups, LAYER_PROJECTILE)
+        self.reset(pos, direction, groups, damage, weapon_config)
+
+    def reset(self, pos, direction, groups, damage, weapon_config):
+        """对象池复用：朝向可能不同，贴图随方向重新生成"""
+        self.respawn(pos, groups)
 
         # 1. 核心属性注入 (从武器 JSON 里的 config 字典抓取)
         self.config = weapon_config
@@ -27,7 +33,7 @@ class Bullet(BaseEntity):
         # 3. 物理数据
         self.pos = pygame.math.Vector2(pos)
         self.direction = direction
-        self.spawn_time = pygame.time.get_ticks()
+        self.age = 0  # 已飞行毫秒数，随逻辑步累加 (不读墙钟)
 
     def _init_visuals(self, direction):
         """规则：有图贴图，没图按配置画形状"""
@@ -39,29 +45,27 @@ class Bullet(BaseEntity):
         if asset_id:
             raw_image = registry.get_texture(asset_id)
             if raw_image.get_width() > 32:  # 找到了贴图
-                self.image = pygame.transform.scale(raw_image, size)
+                self.image = sprite_cache.texture(asset_id, size)
             else:
                 self.image = self._draw_fallback_shape(size, color)
         else:
             # B. 没贴图，画基础形状 (雷电法王目前走这里)
             self.image = self._draw_fallback_shape(size, color)
 
-        # C. 自动根据飞行方向旋转
+        # C. 自动根据飞行方向旋转 (取预旋转帧，不再每发都调用 rotate)
         angle = direction.angle_to(pygame.math.Vector2(1, 0))
-        self.image = pygame.transform.rotate(self.image, angle)
+        rotations = sprite_cache.rotations(self.image, self.config.get("visuals", {}).get("rotation_buckets"))
+        self.image = rotations.frame(angle)
         self.rect = self.image.get_rect()
 
     def _draw_fallback_shape(self, size, color):
-        """规则：根据 JSON 里的 shape 字段画图"""
-        surf = pygame.Surface(size, pygame.SRCALPHA)
+        """规则：根据 JSON 里的 shape 字段画图 (同款子弹共用缓存贴图)"""
         shape_type = self.config.get("shape", "rect")
 
         if shape_type == "circle":
-            pygame.draw.circle(surf, color, (size[0] // 2, size[1] // 2), size[0] // 2)
-        else:
-            # 默认画圆角矩形，看起来更像“能量体”
-            pygame.draw.rect(surf, color, (0, 0, size[0], size[1]), border_radius=3)
-        return surf
+            return sprite_cache.shape("circle", size, color)
+        # 默认画圆角矩形，看起来更像“能量体”
+        return sprite_cache.shape("rect", size, color, border_radius=3)
 
     def on_hit(self):
         """穿透逻辑：被战斗系统调用"""
@@ -75,5 +79,6 @@ class Bullet(BaseEntity):
         self.rect.center = (round(self.pos.x), round(self.pos.y))
 
         # 寿命检测
-        if pygame.time.get_ticks() - self.spawn_time > self.life_time:
+        self.age += dt * 1000
+        if self.age > self.life_time:
             self.kill()
\ No newline at end of file
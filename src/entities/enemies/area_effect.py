@@ -2,9 +2,11 @@ import pygame
 from src.entities.base_entity import BaseEntity
 from src.core.constants import *
 from src.combat.damage_system import DamageSystem
+from src.combat.combat_utils import CombatUtils
 
 
 class AreaEffectEntity(BaseEntity):
+    hidden = True  # 逻辑实体：透明占位图不需要逐帧 blit
     def __init__(self, pos, groups, player, config):
         # 初始图层设为底层 (LAYER_BG 或新开 LAYER_EFFECT)
         super().__init__(pos, groups, LAYER_BG)
@@ -56,13 +58,13 @@ class AreaEffectEntity(BaseEntity):
         scene = self.player.engine.scene
         if not hasattr(scene, 'enemy_group'): return
 
-        for enemy in scene.enemy_group:
-            # 距离检测
-            if self.pos.distance_to(enemy.pos) <= final_radius:
-                # 调用统一伤害系统
-                DamageSystem.apply_damage(self.player.engine, enemy, final_damage)
-                # 预留：此处可扩展 debuff 逻辑
-                # if "debuff" in self.effect_data: apply_debuff(enemy, self.effect_data['debuff'])
+        # 距离检测 (网格索引筛选)
+        for enemy in CombatUtils.get_enemies_in_radius(self.pos, final_radius, scene.enemy_group):
+            # 调用统一伤害系统
+            DamageSystem.apply_damage(self.player.engine, enemy, final_damage,
+                                      source=self.config.get('id'))
+            # 预留：此处可扩展 debuff 逻辑
+            # if "debuff" in self.effect_data: apply_debuff(enemy, self.effect_data['debuff'])
 
     def draw_custom(self, screen, offset):
         """视觉表现：根据形状模版绘制"""
@@ -1,12 +1,15 @@
 import pygame
-import random
 from src.entities.base_entity import BaseEntity
-from src.entities.components.stats import StatsComponent
+from src.entities.components.stats import StatsComponent, Stat
 from src.core.constants import *
+from src.core.sprite_cache import sprite_cache
 
 
 class Enemy(BaseEntity):
-    def __init__(self, pos, groups, config, player):
+    def __init__(self, pos, groups, config, player, swarm=None):
+        # 先置空：BaseEntity 初始化时 pos / prev_pos 写入普通属性
+        self.swarm = None
+        self.slot = None
         super().__init__(pos, groups, LAYER_ENEMY)
         self.player = player
         self.config = config
@@ -15,18 +18,101 @@ class Enemy(BaseEntity):
         self.stats = StatsComponent(config)
         self.hp = self.stats.health.value
 
-        # 视觉
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.rect(self.image, COLOR_ENEMY, (0, 0, 30, 30), border_radius=4)
+        # 视觉：同类敌人共用一张缓存贴图
+        self.image = sprite_cache.shape("rect", (30, 30), COLOR_ENEMY, border_radius=4)
         self.rect = self.image.get_rect(center=pos)
 
+        # LOD：远景时累计 dt，按错峰相位一次结算 (相位取生成坐标，保证可复现)
+        self.lod_acc = 0.0
+        self.lod_phase = int(abs(self._pos.x)) % LOD_FAR_INTERVAL
+
+        # 加入集群：此后 pos / hp 由集群数组托管，移动由 EnemySwarm.step 统一推进
+        if swarm is not None:
+            self.slot = swarm.add(self, self._pos, self._hp, self.stats.move_speed.value)
+            self.swarm = swarm
+
+    def refresh_stats(self):
+        """热重载：按 (已原地更新的) 配置重建属性，保留已有加成；满血的保持满血，否则按新上限截断"""
+        old = self.stats
+        self.stats = StatsComponent(self.config)
+        for key, stat in old.__dict__.items():
+            new = getattr(self.stats, key, None)
+            if isinstance(stat, Stat) and isinstance(new, Stat):
+                new.flat_modifier = stat.flat_modifier
+                new.percent_modifier = stat.percent_modifier
+
+        max_hp = self.stats.health.value
+        self.hp = max_hp if self.hp >= old.health.value else min(self.hp, max_hp)
+        if self.swarm is not None:
+            self.swarm.speed[self.slot] = self.stats.move_speed.value
+
+    # --- 兼容层：集群成员的 pos / prev_pos / hp 读写落到数组对应行 ---
+
+    @property
+    def pos(self):
+        if self.swarm is None:
+            return self._pos
+        row = self.swarm.pos[self.slot]
+        return pygame.math.Vector2(float(row[0]), float(row[1]))
+
+    @pos.setter
+    def pos(self, value):
+        if self.swarm is None:
+            self._pos = pygame.math.Vector2(value)
+        else:
+            self.swarm.pos[self.slot] = (value[0], value[1])
+
+    @property
+    def prev_pos(self):
+        if self.swarm is None:
+            return self._prev_pos
+        row = self.swarm.prev[self.slot]
+        return pygame.math.Vector2(float(row[0]), float(row[1]))
+
+    @prev_pos.setter
+    def prev_pos(self, value):
+        if self.swarm is None:
+            self._prev_pos = pygame.math.Vector2(value)
+        else:
+            self.swarm.prev[self.slot] = (value[0], value[1])
+
+    @property
+    def hp(self):
+        if self.swarm is None:
+            return self._hp
+        return float(self.swarm.hp[self.slot])
+
+    @hp.setter
+    def hp(self, value):
+        if self.swarm is None:
+            self._hp = value
+        else:
+            self.swarm.hp[self.slot] = value
+
     def update(self, dt):
+        if self.swarm is not None: return  # 集群统一推进
+
         # 基础追击逻辑
         direction = self.player.pos - self.pos
-        if direction.length() > 0:
+        distance = direction.length()
+
+        # LOD：近景每步更新，远景隔几步用累计 dt 结算一次
+        self.lod_acc += dt
+        if distance > LOD_NEAR_DIST and (self.player.clock.frame + self.lod_phase) % LOD_FAR_INTERVAL:
+            return
+        step_dt, self.lod_acc = self.lod_acc, 0.0
+
+        if distance > 0:
             direction = direction.normalize()
 
-        self.pos += direction * self.stats.move_speed.value * dt
+        self.pos += direction * self.stats.move_speed.value * step_dt
+        self.rect.center = (round(self.pos.x), round(self.pos.y))
+
+    def recycle_to(self, pos):
+        """拴绳回收：瞬移到新位置 (不做插值)"""
+        self.pos = pos
+        self.prev_pos = pos
+        self.lod_acc = 0.0
         self.rect.center = (round(self.pos.x), round(self.pos.y))
 
     def take_damage(self, amount):
@@ -34,4 +120,15 @@ class Enemy(BaseEntity):
         if self.hp <= 0:
             self.kill()
             return True  # 返回死亡信号
-        return False
\ No newline at end of file
+        return False
+
+    def kill(self):
+        # 离开集群时把最终状态留在实体上，死亡后仍可读取 pos / hp (掉落、事件)
+        if self.swarm is not None:
+            final_pos, final_hp = self.swarm.remove(self)
+            self.swarm = None
+            self.slot = None
+            self._pos = pygame.math.Vector2(final_pos)
+            self._prev_pos = pygame.math.Vector2(final_pos)
+            self._hp = final_hp
+        super().kill()
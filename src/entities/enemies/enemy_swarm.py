@@ -0,0 +1,161 @@
+from src.core.constants import LOD_NEAR_DIST, LOD_FAR_INTERVAL
+
+try:
+    import numpy as np
+except ImportError:  # 没装 numpy 时退回逐对象更新 (Enemy.update)
+    np = None
+
+
+class EnemySwarm:
+    """
+    敌人集群 (Structure of Arrays)：
+    - 位置 / 速度 / 血量 / 移速 / 类型ID 存放在连续的 NumPy 数组里
+    - 所有追击型敌人在 step() 中一次向量化推进，不再逐个 normalize
+    - Enemy 仍然是 Sprite (绘制、碰撞、伤害照旧)，只是 pos / hp 读写落到数组的某一行 (slot)
+    - LOD：近景每步更新；远景按错峰相位每 LOD_FAR_INTERVAL 步更新一次，用累计的 dt 一次走完
+    规则：移除采用“末尾交换”，数组始终紧凑，slot 会随之变化
+    """
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.members = []  # members[slot] -> Enemy
+        self.type_ids = {}  # { 敌人配置 id: 整数类型ID }
+        self.frame = 0  # 已推进的步数 (远景错峰用)
+        self.recycled = 0  # 被拴绳回收的累计次数
+        self._alloc(capacity)
+
+    @staticmethod
+    def available():
+        return np is not None
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.hp = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.type_id = np.zeros(capacity, dtype=np.int32)
+        self.acc = np.zeros(capacity)  # 尚未结算的 dt (远景累计)
+        self.lod_phase = np.zeros(capacity, dtype=np.int32)  # 远景错峰相位
+        self.dist = np.zeros(capacity)  # 最近一次 step 时到目标的距离
+
+    def _columns(self):
+        return (self.pos, self.prev, self.vel, self.hp, self.speed, self.type_id,
+                self.acc, self.lod_phase, self.dist)
+
+    def _grow(self):
+        n = self.count
+        old = self._columns()
+        self._alloc(self.capacity * 2)
+        for new, arr in zip(self._columns(), old):
+            new[:n] = arr[:n]
+
+    # --- 成员管理 ---
+
+    def add(self, enemy, pos, hp, speed):
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        self.pos[slot] = (pos[0], pos[1])
+        self.prev[slot] = (pos[0], pos[1])
+        self.vel[slot] = (0.0, 0.0)
+        self.hp[slot] = hp
+        self.speed[slot] = speed
+        type_key = enemy.config.get("id", "unknown")
+        self.type_id[slot] = self.type_ids.setdefault(type_key, len(self.type_ids))
+        self.acc[slot] = 0.0
+        self.lod_phase[slot] = slot % LOD_FAR_INTERVAL
+        self.dist[slot] = 0.0
+        self.members.append(enemy)
+        self.count += 1
+        return slot
+
+    def remove(self, enemy):
+        """末尾交换删除，返回被移除行的 (pos, hp) 供实体留存最终状态"""
+        slot = enemy.slot
+        last = self.count - 1
+        final_pos = (float(self.pos[slot, 0]), float(self.pos[slot, 1]))
+        final_hp = float(self.hp[slot])
+        if slot != last:
+            for arr in self._columns():
+                arr[slot] = arr[last]
+            moved = self.members[last]
+            self.members[slot] = moved
+            moved.slot = slot
+        self.members.pop()
+        self.count = last
+        return final_pos, final_hp
+
+    # --- 批量更新 ---
+
+    def snapshot(self):
+        """逻辑步开始前整体记录上一帧位置 (渲染插值用)"""
+        n = self.count
+        self.prev[:n] = self.pos[:n]
+
+    def step(self, target, dt):
+        """全体朝 target 追击 (远景按 LOD 稀疏结算)，然后把移动过的个体同步回 rect"""
+        n = self.count
+        self.frame += 1
+        if n == 0: return
+        pos = self.pos[:n]
+        acc = self.acc[:n]
+        acc += dt
+        delta = np.array((target[0], target[1])) - pos
+        dist = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+        self.dist[:n] = dist
+
+        # LOD：近景每步结算；远景只在自己的错峰相位结算，一次走完累计的 dt
+        due = (dist <= LOD_NEAR_DIST) | ((self.lod_phase[:n] + self.frame) % LOD_FAR_INTERVAL == 0)
+
+        # 与目标重合的个体方向为零，避免除零
+        inv = np.divide(self.speed[:n], dist, out=np.zeros(n), where=dist > 0)
+        vel = self.vel[:n]
+        np.multiply(delta, inv[:, None], out=vel)
+        pos += vel * np.where(due, acc, 0.0)[:, None]
+        acc[due] = 0.0
+        self.sync_rects(np.nonzero(due)[0])
+
+    def leash(self, center, leash_dist, respawn_dist, rng):
+        """
+        拴绳回收：距离超过 leash_dist 的个体重新放到 center 周围半径 respawn_dist 的圈上。
+        规则：按行号顺序从 rng 取角度，结果可复现；返回回收数量
+        """
+        n = self.count
+        rows = np.nonzero(self.dist[:n] > leash_dist)[0]
+        if len(rows) == 0: return 0
+
+        angles = np.radians([rng.uniform(0, 360) for _ in range(len(rows))])
+        self.pos[rows, 0] = center[0] + np.cos(angles) * respawn_dist
+        self.pos[rows, 1] = center[1] + np.sin(angles) * respawn_dist
+        self.prev[rows] = self.pos[rows]  # 瞬移，不做插值
+        self.acc[rows] = 0.0
+        self.dist[rows] = respawn_dist
+        self.sync_rects(rows)
+        self.recycled += len(rows)
+        return len(rows)
+
+    def sync_rects(self, rows=None):
+        """把数组坐标取整写回 rect (rows 为 None 时全部同步)"""
+        members = self.members
+        if rows is None:
+            centers = np.rint(self.pos[:self.count]).astype(np.int64).tolist()
+            for enemy, center in zip(members, centers):
+                enemy.rect.center = center
+            return
+        centers = np.rint(self.pos[rows]).astype(np.int64).tolist()
+        for row, center in zip(rows.tolist(), centers):
+            members[row].rect.center = center
+
+    def cells(self, cell_size):
+        """每个成员所在的网格坐标 (供空间哈希直接装桶)"""
+        return (self.pos[:self.count] // cell_size).astype(np.int64).tolist()
+
+
+def create_swarm():
+    """有 numpy 时返回集群，否则返回 None (敌人各自更新)"""
+    if not EnemySwarm.available():
+        print("⚠️ 未安装 numpy，敌人集群退回逐对象更新")
+        return None
+    return EnemySwarm()
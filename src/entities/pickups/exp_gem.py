@@ -1,18 +1,21 @@
-import pygame
 from src.entities.base_entity import BaseEntity
 from src.core.constants import *
+from src.core.sprite_cache import sprite_cache
 
 
 class ExperienceGem(BaseEntity):
     def __init__(self, pos, groups, player):
         super().__init__(pos, groups, LAYER_PICKUP)
+        self.image = sprite_cache.shape("diamond", (16, 16), (50, 255, 50))
+        self.reset(pos, groups, player)
+
+    def reset(self, pos, groups, player):
+        """对象池复用：恢复到刚掉落时的状态"""
+        self.respawn(pos, groups)
         self.player = player
-        self.image = pygame.Surface((16, 16), pygame.SRCALPHA)
-        pygame.draw.polygon(self.image, (50, 255, 50), [(8, 0), (16, 8), (8, 16), (0, 8)])
         self.rect = self.image.get_rect(center=pos)
-        self.pos = pygame.math.Vector2(pos)
 
-        self.xp_value = 20
+        self.xp_value = GEM_XP_VALUE
         self.speed = 0
         self.is_magnetized = False
 
@@ -28,4 +31,4 @@ class ExperienceGem(BaseEntity):
             if distance > 0:
                 self.pos += dist_vec.normalize() * self.speed * dt
 
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
\ No newline at end of file
+        self.rect.center = (round(self.pos.x), round(self.pos.y))
@@ -0,0 +1,198 @@
+from src.core.constants import (
+    LAYER_PICKUP, GEM_XP_VALUE, GEM_MERGE_THRESHOLD, GEM_MERGE_CELL, GEM_MERGE_INTERVAL
+)
+from src.core.sprite_cache import sprite_cache
+
+try:
+    import numpy as np
+except ImportError:  # 没装 numpy 时退回逐个 ExperienceGem
+    np = None
+
+GEM_HITBOX = 16  # 拾取判定框边长 (与 ExperienceGem 的 rect 一致)
+MAGNET_ACCEL = 40  # 被吸附后每步增加的速度
+
+# 价值分档：(最低经验, 边长, 颜色)，合成后的宝石更大、颜色不同
+GEM_TIERS = (
+    (0, 16, (50, 255, 50)),
+    (60, 20, (60, 170, 255)),
+    (300, 24, (210, 90, 255)),
+)
+
+
+class GemField:
+    """
+    经验宝石场 (Structure of Arrays)：
+    - 位置 / 速度 / 吸附标记 / 经验值 存放在 NumPy 数组里，吸附与拾取一次向量化算完
+    - 数量超过 GEM_MERGE_THRESHOLD 时，同一格子里未被吸附的宝石合成一颗 (经验相加，位置取加权中心)
+    - 绘制：注册为 CameraGroup 的图层渲染器，和精灵一起按图层顺序提交
+    规则：移除保持原有顺序 (布尔掩码压缩)，拾取与合并结果可复现
+    """
+
+    z_index = LAYER_PICKUP
+
+    def __init__(self, player, capacity=256):
+        self.player = player
+        self.count = 0
+        self.frame = 0
+        self.merged = 0  # 被合并掉的宝石累计数
+        self._alloc(capacity)
+        self._init_visuals()
+
+    def __len__(self):
+        return self.count
+
+    @staticmethod
+    def available():
+        return np is not None
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.magnet = np.zeros(capacity, dtype=bool)
+        self.value = np.zeros(capacity)
+
+    def _columns(self):
+        return (self.pos, self.prev, self.speed, self.magnet, self.value)
+
+    def _grow(self):
+        old = self._columns()
+        self._alloc(self.capacity * 2)
+        for dst, src in zip(self._columns(), old):
+            dst[:len(src)] = src
+
+    def _init_visuals(self):
+        self.tier_floor = np.array([t[0] for t in GEM_TIERS], dtype=float)
+        self.tier_images = [sprite_cache.atlas.source(sprite_cache.shape("diamond", (size, size), color))
+                            for _, size, color in GEM_TIERS]  # (图集页面, 子矩形)
+        self.tier_half = np.array([(size // 2, size // 2) for _, size, _ in GEM_TIERS])
+
+    def add(self, pos, value=GEM_XP_VALUE):
+        """掉落一颗宝石"""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.pos[i] = (pos[0], pos[1])
+        self.prev[i] = self.pos[i]
+        self.speed[i] = 0.0
+        self.magnet[i] = False
+        self.value[i] = value
+        self.count += 1
+
+    def _compact(self, keep):
+        """按布尔掩码删除行 (保持剩余行的顺序)"""
+        n = self.count
+        m = int(keep.sum())
+        for col in self._columns():
+            col[:m] = col[:n][keep]
+        self.count = m
+
+    def snapshot(self):
+        n = self.count
+        self.prev[:n] = self.pos[:n]
+
+    def update(self, dt):
+        """吸附推进 + 合并检查 (与 ExperienceGem.update 同口径：先判距离，再按上一步距离移动)"""
+        self.frame += 1
+        n = self.count
+        if n == 0: return
+        player = self.player
+        pos = self.pos[:n]
+        delta = np.array((player.pos.x, player.pos.y)) - pos
+        dist = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+        magnet = self.magnet[:n]
+        magnet |= dist < player.stats.pickup_range.value
+        speed = self.speed[:n]
+        speed[magnet] += MAGNET_ACCEL
+
+        moving = magnet & (dist > 0)
+        if moving.any():
+            step = speed[moving] * dt / dist[moving]
+            pos[moving] += delta[moving] * step[:, None]
+
+        if n > GEM_MERGE_THRESHOLD and self.frame % GEM_MERGE_INTERVAL == 0:
+            self.merge()
+
+    def collect(self, rect):
+        """
+        规则：与 rect 相交的宝石全部拾取 (判定框同 ExperienceGem 的 rect：取整中心 + 固定边长)
+        返回被拾取宝石的经验值列表 (按行顺序)
+        """
+        n = self.count
+        if n == 0: return []
+        half = GEM_HITBOX // 2
+        left_top = np.rint(self.pos[:n]).astype(np.int64) - half
+        x, y = left_top[:, 0], left_top[:, 1]
+        hit = (x < rect.right) & (x + GEM_HITBOX > rect.left) & (y < rect.bottom) & (y + GEM_HITBOX > rect.top)
+        if not hit.any():
+            return []
+        values = self.value[:n][hit].tolist()
+        self._compact(~hit)
+        return values
+
+    def merge(self, cell_size=GEM_MERGE_CELL):
+        """同一格子里未被吸附的宝石合成一颗：经验相加，位置取经验加权中心，保留格内第一颗的行"""
+        n = self.count
+        rows = np.nonzero(~self.magnet[:n])[0]
+        if len(rows) < 2: return 0
+        cells = np.floor(self.pos[rows] / cell_size).astype(np.int64)
+        _, first, inverse, counts = np.unique(cells, axis=0, return_index=True,
+                                              return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        if (counts > 1).sum() == 0: return 0
+
+        values = self.value[rows]
+        total = np.bincount(inverse, weights=values)
+        cx = np.bincount(inverse, weights=self.pos[rows, 0] * values) / total
+        cy = np.bincount(inverse, weights=self.pos[rows, 1] * values) / total
+
+        keepers = rows[first]
+        self.value[keepers] = total
+        self.pos[keepers, 0] = cx
+        self.pos[keepers, 1] = cy
+        self.prev[keepers] = self.pos[keepers]  # 合成是瞬间的，不做插值
+
+        keep = np.ones(n, dtype=bool)
+        keep[rows] = False
+        keep[keepers] = True
+        removed = n - int(keep.sum())
+        self._compact(keep)
+        self.merged += removed
+        return removed
+
+    def clear(self):
+        self.count = 0
+
+    def stats(self):
+        return {"count": self.count, "merged": self.merged}
+
+    # --- CameraGroup 图层渲染器接口 ---
+
+    def collect_draws(self, seq, view, offset, alpha):
+        """把视口内的宝石追加到 blits 序列 (view 为世界坐标的裁剪矩形)"""
+        n = self.count
+        if n == 0: return
+        pos = self.pos[:n]
+        if alpha < 1.0:
+            pos = self.prev[:n] + (pos - self.prev[:n]) * alpha
+        inside = ((pos[:, 0] >= view.left) & (pos[:, 0] < view.right) &
+                  (pos[:, 1] >= view.top) & (pos[:, 1] < view.bottom))
+        rows = np.nonzero(inside)[0]
+        if len(rows) == 0: return
+
+        # 层内同精灵一样按 y 排序
+        rows = rows[np.argsort(pos[rows, 1], kind="stable")]
+        tiers = np.searchsorted(self.tier_floor, self.value[rows], side="right") - 1
+        top_left = (pos[rows] - self.tier_half[tiers] - (offset.x, offset.y)).tolist()
+        images = self.tier_images
+        seq.extend((images[t][0], xy, images[t][1]) for t, xy in zip(tiers.tolist(), top_left))
+
+
+def create_gem_field(player):
+    """有 numpy 时返回宝石场，否则返回 None (掉落退回对象池里的 ExperienceGem)"""
+    if not GemField.available():
+        print("⚠️ 未安装 numpy，经验宝石退回逐对象更新")
+        return None
+    return GemField(player)
@@ -1,16 +1,20 @@
 import pygame
-import random
 from src.entities.base_entity import BaseEntity
 from src.entities.components.stats import StatsComponent
 from src.core.constants import *
 from src.core.registry import registry
+from src.core.sprite_cache import sprite_cache
 
 
 class Player(BaseEntity):
-    def __init__(self, pos, groups, engine, char_config):
+    def __init__(self, pos, groups, engine, char_config, clock, rng):
         super().__init__(pos, groups, LAYER_PLAYER)
         self.engine = engine
 
+        # 0. 场景的模拟时钟与随机数流 (武器等子系统经由 player 取用)
+        self.clock = clock
+        self.rng = rng
+
         # 1. 核心：保存整份 JSON 配置（角色的“灵魂”）
         self.char_config = char_config
         self.char_id = char_config.get('id', 'default')
@@ -37,15 +41,14 @@ class Player(BaseEntity):
 
     def _init_visuals(self, char_config):
         """自动化视觉：根据ID匹配资产，没资产则画圆"""
+        registry.pin(f"characters/{self.char_id}")  # 玩家贴图整局常驻
         char_tex = registry.get_texture(f"characters/{self.char_id}")
 
         if char_tex.get_width() > 32:
-            self.image = pygame.transform.scale(char_tex, (48, 48))
+            self.image = sprite_cache.texture(f"characters/{self.char_id}", (48, 48))
         else:
-            self.image = pygame.Surface((40, 40), pygame.SRCALPHA)
             theme_color = char_config.get('theme_color', COLOR_PLAYER)
-            pygame.draw.circle(self.image, theme_color, (20, 20), 20)
-            pygame.draw.circle(self.image, (255, 255, 255), (20, 20), 20, 2)
+            self.image = sprite_cache.shape("circle", (40, 40), theme_color, outline=((255, 255, 255), 2))
 
         self.original_image = self.image.copy()  # 备份原图用于闪光特效
         self.rect = self.image.get_rect(center=self.pos)
@@ -73,7 +76,7 @@ class Player(BaseEntity):
         chance = p_data.get('chance', 1.0)  # 默认 100%
 
         if effect == "refresh_cooldown":
-            if random.random() < chance:
+            if self.rng.get("passives").random() < chance:
                 self.refresh_weapon_cooldowns()
                 # 视觉反馈：调用 UI Manager 弹出提示或震屏（后续可加）
 
@@ -95,7 +98,7 @@ class Player(BaseEntity):
         if self.vulnerable:
             self.current_hp -= max(1, amount)
             self.vulnerable = False
-            self.hurt_time = pygame.time.get_ticks()
+            self.hurt_time = self.clock.get_ticks()
             # 预留：这里以后可以加 trigger_passives("on_hurt")
 
     def gain_xp(self, amount):
@@ -121,7 +124,7 @@ class Player(BaseEntity):
 
         # 2. 无敌恢复
         if not self.vulnerable:
-            if pygame.time.get_ticks() - self.hurt_time >= 500:
+            if self.clock.get_ticks() - self.hurt_time >= 500:
                 self.vulnerable = True
 
         # 3. 特效处理 (被动触发时的闪光)
@@ -138,7 +141,7 @@ class Player(BaseEntity):
         # 遍历 JSON 里的被动列表
         for p in self.char_config.get('passives', []):
             if p.get('type') == "on_kill" and p.get('effect') == "refresh_cooldown":
-                if random.random() < p.get('chance', 0):
+                if self.rng.get("passives").random() < p.get('chance', 0):
                     self.refresh_all_cooldowns()
 
     def refresh_all_cooldowns(self):
@@ -2,35 +2,55 @@ import pygame
 import math
 from src.entities.base_entity import BaseEntity
 from src.core.constants import *
+from src.core.sprite_cache import sprite_cache
+from src.core.registry import registry
 
 
 class UniversalProjectile(BaseEntity):
-    def __init__(self, pos, direction, groups, player, weapon_config):
+    def __init__(self, pos, direction, groups, player, weapon_config, damage=None):
         super().__init__(pos, groups, LAYER_PROJECTILE)
+        self.config = None
+        self.config_version = None
+        self.reset(pos, direction, groups, player, weapon_config, damage)
+
+    def reset(self, pos, direction, groups, player, weapon_config, damage=None):
+        """对象池复用：同一把武器的子弹外观不变，只在换了配置或配置被热重载 (原地更新，对象不变) 时重建贴图"""
+        self.respawn(pos, groups)
         self.player = player
-        self.config = weapon_config
         self.direction = direction
-        self.pos = pygame.math.Vector2(pos)
 
         # 维度 1: 提取阶段状态机
-        logic_node = self.config.get("logic", {})
+        logic_node = weapon_config.get("logic", {})
         self.phases = logic_node.get("phases", [{"type": "linear", "speed": 800, "duration": 2.0}])
         self.current_phase_idx = 0
         self.phase_timer = 0.0
 
-        # 维度 3: 基础伤害与属性
-        self.damage = weapon_config.get("damage", 10) * player.stats.damage_mult.value
+        # 维度 3: 基础伤害与属性 (武器传入算好倍率的伤害；未传时按配置根节点)
+        if damage is None:
+            damage = weapon_config.get("damage", 10) * player.stats.damage_mult.value
+        self.damage = damage
 
         # 视觉初始化
-        self._init_visuals()
+        if weapon_config is not self.config or self.config_version != registry.config_version:
+            self.config = weapon_config
+            self.config_version = registry.config_version
+            self._init_visuals()
+        self._orient()
+        self.rect = self.image.get_rect(center=(round(self.pos.x), round(self.pos.y)))
 
     def _init_visuals(self):
         viz = self.config.get("visuals", {})
         size = viz.get("bullet_size", [15, 15])
         color = viz.get("color", [255, 255, 255])
-        self.image = pygame.Surface(size, pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (size[0] // 2, size[1] // 2), size[0] // 2)
-        self.rect = self.image.get_rect(center=self.pos)
+        self.image = sprite_cache.shape("circle", size, color)
+        # visuals.oriented: 贴图随发射方向旋转 (取预旋转帧)
+        self.rotations = None
+        if viz.get("oriented"):
+            self.rotations = sprite_cache.rotations(self.image, viz.get("rotation_buckets"))
+
+    def _orient(self):
+        if self.rotations is not None:
+            self.image = self.rotations.frame(self.direction.angle_to(pygame.math.Vector2(1, 0)))
 
     def update(self, dt):
         if self.current_phase_idx >= len(self.phases):
@@ -59,7 +79,7 @@ class UniversalProjectile(BaseEntity):
 
         elif p_type == "rotate":
             # 这里的旋转角度是内部维护的
-            angle = pygame.time.get_ticks() * 0.01 * phase.get("rotation_speed", 10)
+            angle = self.player.clock.get_ticks() * 0.01 * phase.get("rotation_speed", 10)
             radius = phase.get("radius", 30)
             self.pos += pygame.Vector2(math.cos(angle), math.sin(angle)) * radius * dt
 
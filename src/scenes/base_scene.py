@@ -1,4 +1,5 @@
 import pygame
+from src.core.event_bus import bus
 
 class BaseScene:
     """所有场景的基类：菜单、战斗、结算都继承自它"""
@@ -9,5 +10,18 @@ class BaseScene:
     def update(self, dt):
         pass
 
-    def draw(self):
-        pass
\ No newline at end of file
+    def draw(self, alpha=1.0):
+        """alpha: 固定步长模式下，上一逻辑帧到当前逻辑帧之间的插值系数"""
+        pass
+
+    def subscribe(self, event_type, callback, batch=False):
+        """规则：场景内的订阅挂在场景作用域上，切场景时自动注销"""
+        return bus.subscribe(event_type, callback, scope=self, batch=batch)
+
+    def on_config_reloaded(self, kind, config):
+        """热重载钩子：kind 为配置类别 (weapons / enemies / ...)，config 为已原地更新的配置字典"""
+        pass
+
+    def close(self):
+        """场景被切走时调用"""
+        bus.drop_scope(self)
\ No newline at end of file
@@ -1,26 +1,62 @@
 # systems/combat_scene.py
 import pygame
-import random
 from src.scenes.base_scene import BaseScene
 from src.core.constants import *
 from src.core.registry import registry
+from src.core.event_bus import bus
 from src.core.camera import CameraGroup
+from src.core.sim_clock import SimClock
+from src.core.random_streams import RandomStreams
 from src.entities.player import Player
 from src.combat.weapon_manager import WeaponManager
 from src.combat.weapon_factory import WeaponFactory
 from src.combat.damage_system import DamageSystem
+from src.combat.run_stats import RunStats
+from src.combat.spatial_hash import EnemyGroup
+from src.combat.collision import CollisionSystem
 from src.entities.enemies.base_enemy import Enemy
+from src.entities.enemies.enemy_swarm import create_swarm
+from src.entities.pickups.exp_gem import ExperienceGem
+from src.entities.pickups.gem_field import create_gem_field
+from src.entities.area_effect import AreaEffectEntity
+from src.core.pool import ObjectPool
+
+
+def _nested_dicts(node):
+    """配置本身及其内部所有层级的字典 (列表里的也算)"""
+    if isinstance(node, dict):
+        yield node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return
+    for child in children:
+        yield from _nested_dicts(child)
 
 
 class CombatScene(BaseScene):
-    def __init__(self, engine, char_config):  # 核心改动：接收从 engine 传来的角色配置
+    def __init__(self, engine, char_config, seed=None):  # 核心改动：接收从 engine 传来的角色配置
         super().__init__(engine)
 
+        # 0. 模拟时钟与随机数流：整局逻辑只认它们，不读墙钟和全局 random
+        self.clock = SimClock()
+        self.rng = RandomStreams(seed)
+        self.run_stats = RunStats()
+
         # 1. 初始化显示与物理组
         self.all_sprites = CameraGroup()
-        self.enemy_group = pygame.sprite.Group()
+        self.swarm = create_swarm()  # 敌人数据集中存放在 NumPy 数组，批量推进 (无 numpy 时为 None)
+        self.enemy_group = EnemyGroup(swarm=self.swarm)  # 自带空间索引，索敌/范围伤害不再线性扫描
         self.projectile_group = pygame.sprite.Group()
         self.gem_group = pygame.sprite.Group()
+        self.enemy_projectile_group = pygame.sprite.Group()  # 预留：敌方弹幕
+
+        # 短命实体对象池：kill() 时自动归还，下次生成直接复用
+        self.pools = {
+            "gems": ObjectPool(ExperienceGem, name="gems"),
+            "area_effects": ObjectPool(AreaEffectEntity, name="area_effects"),
+        }
 
         # 2. 创建玩家：将选中的角色配置(char_config)传给 Player 类
         # 这样 Player 就能根据配置决定自己的血量、速度和样子
@@ -28,10 +64,34 @@ class CombatScene(BaseScene):
             pos=(WIDTH // 2, HEIGHT // 2),
             groups=[self.all_sprites],
             engine=engine,
-            char_config=char_config  # 注入规则
+            char_config=char_config,  # 注入规则
+            clock=self.clock,
+            rng=self.rng
         )
 
+        # 经验宝石场：掉落的宝石存成数组，批量吸附/拾取/合并 (无 numpy 时为 None，退回 gem_group)
+        self.gem_field = create_gem_field(self.player)
+        if self.gem_field is not None:
+            self.all_sprites.add_renderer(self.gem_field)
+
+        # 统一碰撞：各层注册进宽相系统，一次遍历产出所有接触对
+        self.collisions = CollisionSystem(COLLISION_MATRIX)
+        self.collisions.add_layer("player", pygame.sprite.GroupSingle(self.player))
+        self.collisions.add_layer("enemies", self.enemy_group)
+        self.collisions.add_layer("projectiles", self.projectile_group)
+        self.collisions.add_layer("gems", self.gem_group)
+        self.collisions.add_layer("enemy_projectiles", self.enemy_projectile_group)
+        # { 层对: (计时分段名, 处理函数) }：宽相检测统一记在 collide，各处理函数按分段单独计时
+        self.collision_handlers = {
+            ("enemies", "projectile_batches"): ("damage", self._on_batch_hits),
+            ("enemies", "projectiles"): ("damage", self._on_projectile_hits),
+            ("player", "enemies"): ("player_hit", self._on_player_hit),
+            ("player", "gems"): ("pickup", self._on_gem_pickup),
+            ("player", "enemy_projectiles"): ("player_hit", self._on_enemy_projectile_hits),
+        }
+
         self.spawn_timer = 0
+        self.spawn_enabled = True  # 基准场景可关闭自然刷怪，保证负载恒定
 
         # 3. 初始化武器管理器
         self.weapon_manager = WeaponManager(
@@ -39,6 +99,8 @@ class CombatScene(BaseScene):
             self.enemy_group,
             [self.all_sprites, self.projectile_group]
         )
+        # 批量弹丸作为碰撞矩阵的非精灵层接入
+        self.collisions.add_source("projectile_batches", self.weapon_manager.batch_contacts)
 
         # 一劳永逸：根据 JSON 配置自动加载初始武器，而不是写死 "starter_gun"
         init_weapon = char_config.get("starting_weapon_config") or char_config.get("starting_weapon", "starter_gun")
@@ -48,52 +110,181 @@ class CombatScene(BaseScene):
         # 4. 获取 UI 引用
         self.hud = engine.ui_manager.menus['hud']
         self.upgrade_panel = engine.ui_manager.menus['upgrade']
+        self.pending_upgrades = 0  # 已升级但还没选卡的次数 (合成宝石可能一次跨好几级)
+        self.subscribe("RESUME_GAME", self._on_upgrade_chosen)
+        self.subscribe("ENEMY_DIED", self._on_enemies_died, batch=True)
 
         # --- 粘在这里：一劳永逸的初始武器装配 ---
         # 逻辑：优先看 JSON 里有没有起手配置，没有就拿 ID
         init_weapon = char_config.get("starting_weapon_config") or char_config.get("starting_weapon", "starter_gun")
         self.weapon_manager.add_or_upgrade_weapon(init_weapon)
     def update(self, dt):
+        prof = self.engine.profiler  # 各阶段计时 (关闭时几乎零开销)
+        prof.mark()
+
+        # 记录本步开始前的位置，供渲染插值使用
+        self.all_sprites.store_previous_positions()
+        if self.swarm is not None:
+            self.swarm.snapshot()
+        if self.gem_field is not None:
+            self.gem_field.snapshot()
+        self.clock.advance(dt)
+        prof.lap("snapshot")
+
         # 刷怪逻辑 (保持原样)
         self.spawn_timer += dt
-        if self.spawn_timer >= 1.5:
+        if self.spawn_enabled and self.spawn_timer >= 1.5:
             self._spawn_enemy()
             self.spawn_timer = 0
+        prof.lap("spawn")
 
         # 系统更新
         self.all_sprites.update(dt)
+        prof.lap("sprites_update")
+        if self.swarm is not None:
+            # 玩家先移动，集群再整体追击 (与逐个 update 的先后顺序一致)
+            self.swarm.step(self.player.pos, dt)
+        self._leash_enemies()
+        prof.lap("swarm_step")
+        if self.gem_field is not None:
+            self.gem_field.update(dt)
+        prof.lap("gems_update")
+        # 敌人移动完毕后重建一次网格，本步所有武器共享
+        self.enemy_group.rebuild_index()
+        prof.lap("spatial_index")
         self.weapon_manager.update(dt)
+        prof.lap("weapons_update")
+
+        # 碰撞处理：按阶段做宽相检测，每个阶段拿到接触对后按矩阵分发
+        # 规则：玩家侧在伤害结算之后才检测，用的是结算后的敌人 / 宝石
+        for phase in COLLISION_PHASES:
+            contacts = self.collisions.detect(phase)
+            prof.lap("collide")
+            for pair in phase:
+                section, handler = self.collision_handlers[pair]
+                pairs = contacts.get(pair)
+                if pairs:
+                    handler(pairs)
+                prof.lap(section)
+        if self.gem_field is not None:
+            self._on_gem_values(self.gem_field.collect(self.player.rect))
+        prof.lap("pickup")
+
+        # 本步累积的事件 (击杀等) 在结算完成后统一分发
+        bus.flush()
+        prof.lap("events")
+
+    # --- 碰撞回调 (由 collision_handlers 按矩阵分发) ---
 
-        # 碰撞处理：子弹 vs 敌人
-        hits = pygame.sprite.groupcollide(self.enemy_group, self.projectile_group, False, False)
-        for enemy, bullets in hits.items():
-            for bullet in bullets:
-                # 统一调用 apply_damage，数字和掉落会自动处理
-                DamageSystem.handle_collision(bullet, enemy, self.engine)
+    def _on_projectile_hits(self, pairs):
+        for enemy, bullet in pairs:
+            # 统一调用 apply_damage，数字和掉落会自动处理
+            DamageSystem.handle_collision(bullet, enemy, self.engine)
 
-        # 全局死亡检测不需要了，因为 apply_damage 已经处理了
+    def _on_batch_hits(self, pairs):
+        self.weapon_manager.resolve_batch_hits(pairs, self.engine)
 
-        # 玩家受击与捡宝石 (保持原样)
-        if pygame.sprite.spritecollide(self.player, self.enemy_group, False):
+    def _on_player_hit(self, pairs):
+        if any(enemy.alive() for _, enemy in pairs):
             self.player.take_damage(1)
 
-        gems_hit = pygame.sprite.spritecollide(self.player, self.gem_group, True)
-        for gem in gems_hit:
-            self.player.gain_xp(gem.xp_value)
-            if self.player.current_xp >= self.player.xp_required:
+    def _on_gem_pickup(self, pairs):
+        values = []
+        for _, gem in pairs:
+            if not gem.alive(): continue
+            gem.kill()
+            values.append(gem.xp_value)
+        self._on_gem_values(values)
+
+    def _on_gem_values(self, values):
+        """
+        拾取经验 (精灵宝石与宝石场共用)：每颗都检查升级。
+        规则：一颗合成宝石可能跨好几级，每升一级都要选一次卡，选完一张再弹下一张
+        """
+        for xp in values:
+            self.player.gain_xp(xp)
+            while self.player.current_xp >= self.player.xp_required:
                 self.player.perform_level_up()
-                self.engine.state = "UPGRADING"
-                self.upgrade_panel.show()
+                self.pending_upgrades += 1
+        if self.pending_upgrades and self.engine.state != "UPGRADING":
+            self._open_upgrade_panel()
+
+    def _open_upgrade_panel(self):
+        self.pending_upgrades -= 1
+        self.engine.state = "UPGRADING"
+        self.upgrade_panel.show()
+
+    def _on_enemies_died(self, events):
+        """本步的击杀成批送达：按击杀顺序逐个触发击杀者的 on_kill 被动"""
+        for event in events:
+            killer = event.killer
+            if killer is not None and hasattr(killer, 'trigger_passives'):
+                killer.trigger_passives("on_kill")
+
+    def _on_upgrade_chosen(self):
+        """引擎先处理 RESUME_GAME 恢复游戏，这里再检查是否还有没选的升级"""
+        if self.pending_upgrades and self.engine.state == "PLAYING":
+            self._open_upgrade_panel()
+
+    def gem_count(self):
+        """场上宝石总数 (精灵 + 宝石场)"""
+        return len(self.gem_group) + (len(self.gem_field) if self.gem_field is not None else 0)
+
+    def _on_enemy_projectile_hits(self, pairs):
+        for _, shot in pairs:
+            if not shot.alive(): continue
+            self.player.take_damage(getattr(shot, 'damage', 1))
+            if hasattr(shot, 'on_hit'):
+                shot.on_hit()
+
+    def on_config_reloaded(self, kind, config):
+        """
+        规则：热重载只推送给引用了这份配置的在场对象，不重建场景
+        武器的配置可能内嵌在别的配置里 (如角色的 starting_weapon_config)，重载的配置里任何一层字典被武器引用都要刷新
+        """
+        if kind == "upgrades":
+            return
+        nested = {id(node) for node in _nested_dicts(config)}
+        for weapon in self.weapon_manager.weapons.values():
+            if id(weapon.config) in nested:
+                weapon.reload_config()
+        if kind == "enemies":
+            for enemy in self.enemy_group:
+                if enemy.config is config:
+                    enemy.refresh_stats()
+
+    def draw(self, alpha=1.0):
+        prof = self.engine.profiler
+        prof.mark()
 
-    def draw(self):
         # 渲染流水线 (保持原样)
-        self.all_sprites.custom_draw(self.player)
+        self.all_sprites.custom_draw(self.player, alpha)
+        prof.lap("custom_draw")
         self.weapon_manager.draw_weapons(self.screen, self.all_sprites.offset)
+        prof.lap("draw_weapons")
 
     def _spawn_enemy(self):
-        angle = random.uniform(0, 360)
-        dist = 850
+        angle = self.rng.get("spawn").uniform(0, 360)
+        dist = ENEMY_SPAWN_DIST
         spawn_pos = self.player.pos + pygame.math.Vector2(1, 0).rotate(angle) * dist
-        config = registry.enemies.get("basic_grunt")
+        self.spawn_enemy_at("basic_grunt", spawn_pos)
+
+    def _leash_enemies(self):
+        """规则：离玩家超过拴绳距离的敌人放回刷怪圈，人群成本只取决于屏幕附近的数量"""
+        rng = self.rng.get("lod")
+        if self.swarm is not None:
+            self.swarm.leash(self.player.pos, LOD_LEASH_DIST, ENEMY_SPAWN_DIST, rng)
+            return
+        # 逐对象路径：每隔几步检查一次即可
+        if self.clock.frame % LOD_FAR_INTERVAL: return
+        for enemy in self.enemy_group:
+            if self.player.pos.distance_squared_to(enemy.pos) > LOD_LEASH_DIST * LOD_LEASH_DIST:
+                angle = rng.uniform(0, 360)
+                enemy.recycle_to(self.player.pos + pygame.math.Vector2(1, 0).rotate(angle) * ENEMY_SPAWN_DIST)
+
+    def spawn_enemy_at(self, enemy_id, pos):
+        """规则：在指定世界坐标生成一个敌人 (刷怪、基准场景共用)"""
+        config = registry.enemies.get(enemy_id)
         if config:
-            Enemy(spawn_pos, [self.all_sprites, self.enemy_group], config, self.player)
\ No newline at end of file
+            return Enemy(pos, [self.all_sprites, self.enemy_group], config, self.player, swarm=self.swarm)
+        return None
\ No newline at end of file
@@ -38,6 +38,9 @@ class MenuScene(BaseScene):
                                      color=(0, 255, 150))
         self.back_btn = CyberButton("返回主协议", (WIDTH - 250, HEIGHT - 100), (200, 50), self.font_sub)
 
+        # 5. 静态背景 (底色 + 网格) 只画一次
+        self.background = self._build_background()
+
     def update(self, dt):
         mouse_pos = pygame.mouse.get_pos()
         clicked = pygame.mouse.get_pressed()[0]
@@ -87,9 +90,8 @@ class MenuScene(BaseScene):
                 self.state = "MAIN"
                 pygame.time.delay(150)
 
-    def draw(self):
-        self.screen.fill((5, 5, 10))
-        self._draw_background_fx()
+    def draw(self, alpha=1.0):
+        self.screen.blit(self.background, (0, 0))
 
         if self.state == "MAIN":
             self._draw_main_menu()
@@ -105,9 +107,15 @@ class MenuScene(BaseScene):
         if self.state != "MAIN":
             self.back_btn.draw(self.screen)
 
-    def _draw_background_fx(self):
-        for x in range(0, WIDTH, 50): pygame.draw.line(self.screen, (15, 15, 30), (x, 0), (x, HEIGHT))
-        for y in range(0, HEIGHT, 50): pygame.draw.line(self.screen, (15, 15, 30), (0, y), (WIDTH, y))
+    def _build_background(self):
+        surf = pygame.Surface((WIDTH, HEIGHT))
+        surf.fill((5, 5, 10))
+        self._draw_background_fx(surf)
+        return surf.convert() if pygame.display.get_surface() else surf
+
+    def _draw_background_fx(self, surf):
+        for x in range(0, WIDTH, 50): pygame.draw.line(surf, (15, 15, 30), (x, 0), (x, HEIGHT))
+        for y in range(0, HEIGHT, 50): pygame.draw.line(surf, (15, 15, 30), (0, y), (WIDTH, y))
 
     def _draw_main_menu(self):
         title = self.font_title.render("CYBER SURVIVOR", True, (0, 255, 240))
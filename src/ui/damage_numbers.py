@@ -0,0 +1,170 @@
+import pygame
+import random
+from src.core.constants import DAMAGE_TEXT_WINDOW, DAMAGE_TEXT_BIG_HIT
+
+DIGITS = "0123456789"
+
+# 字形样式：0 普通伤害，1 暴击/增幅伤害 (更大、金色)
+STYLE_NORMAL = 0
+STYLE_CRIT = 1
+STYLES = {
+    STYLE_NORMAL: {"size": 24, "color": (255, 255, 255)},
+    STYLE_CRIT: {"size": 30, "color": (255, 210, 60)},
+}
+
+
+class GlyphAtlas:
+    """
+    数字字形图集：0-9 只用字体渲染一次，再按透明度分档各存一份。
+    伤害数字由缓存字形逐位拼接，运行时不再创建字体或渲染文字。
+    """
+
+    def __init__(self, font_name="arial", size=24, bold=True, color=(255, 255, 255), alpha_levels=16):
+        font = pygame.font.SysFont(font_name, size, bold=bold)
+        base = {ch: font.render(ch, True, color) for ch in DIGITS}
+        self.alpha_levels = alpha_levels
+        self.widths = {ch: surf.get_width() for ch, surf in base.items()}
+        self.height = max(surf.get_height() for surf in base.values())
+
+        # levels[i][ch]：第 i 档透明度的字形 (i = 0 最淡，alpha_levels - 1 不透明)
+        self.levels = []
+        for i in range(alpha_levels):
+            alpha = int(255 * (i + 1) / alpha_levels)
+            tier = {}
+            for ch, surf in base.items():
+                glyph = surf.copy()
+                glyph.set_alpha(alpha)
+                tier[ch] = glyph
+            self.levels.append(tier)
+
+    def level_for(self, life):
+        """剩余寿命 (0~1) -> 透明度档位"""
+        i = int(life * self.alpha_levels)
+        if i >= self.alpha_levels: return self.alpha_levels - 1
+        return i if i > 0 else 0
+
+    def text_width(self, text):
+        widths = self.widths
+        return sum(widths[ch] for ch in text)
+
+
+class DamageNumbers:
+    """
+    飘字存储 (Structure of Arrays)：每个字段一个列表，按下标对齐。
+    规则：
+    - 过期的数字在 update 中一次性原地压缩移除，整体 O(n)，不再逐个 list.remove
+    - 绘制时把所有字形拼成一个序列，一次 blits 提交
+    - 同一 key (目标, 来源) 的小额伤害在窗口期内累加，到期后合成一个数字弹出；
+      暴击与大额伤害不合并，立即弹出
+    """
+
+    def __init__(self, life=1.0, rise_speed=60, drift=30,
+                 window=DAMAGE_TEXT_WINDOW, big_hit=DAMAGE_TEXT_BIG_HIT):
+        self.life = life
+        self.rise_speed = rise_speed
+        self.drift = drift
+        self.window = window
+        self.big_hit = big_hit
+        self.atlases = {}  # { 样式: GlyphAtlas }，首次用到时再建 (需要 pygame.font 已初始化)
+
+        self.xs = []
+        self.ys = []
+        self.vxs = []
+        self.texts = []
+        self.lifes = []
+        self.styles = []
+
+        # 合并中的伤害：{ key: [x, y, 累计伤害, 已等待秒数] }
+        self.pending = {}
+        self.merged = 0  # 被合并掉的事件数 (统计用)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, pos, amount, key=None, crit=False):
+        """伤害事件入口：可合并的先挂起，其余立即生成数字"""
+        if key is None or crit or amount >= self.big_hit or self.window <= 0:
+            self.spawn(pos, amount, STYLE_CRIT if crit else STYLE_NORMAL)
+            return
+
+        entry = self.pending.get(key)
+        if entry is None:
+            self.pending[key] = [float(pos[0]), float(pos[1]), amount, 0.0]
+        else:
+            # 数字跟随目标的最新位置
+            entry[0] = float(pos[0])
+            entry[1] = float(pos[1])
+            entry[2] += amount
+            self.merged += 1
+
+    def spawn(self, pos, amount, style=STYLE_NORMAL):
+        if style not in self.atlases:
+            spec = STYLES[style]
+            self.atlases[style] = GlyphAtlas(size=spec["size"], color=spec["color"])
+        self.xs.append(float(pos[0]))
+        self.ys.append(float(pos[1]))
+        self.vxs.append(random.uniform(-self.drift, self.drift))
+        self.texts.append(str(int(amount)))
+        self.lifes.append(self.life)
+        self.styles.append(style)
+
+    def flush(self):
+        """立即弹出所有合并中的数字"""
+        for x, y, total, _ in self.pending.values():
+            self.spawn((x, y), total)
+        self.pending = {}
+
+    def _age_pending(self, dt):
+        if not self.pending: return
+        expired = []
+        for key, entry in self.pending.items():
+            entry[3] += dt
+            if entry[3] >= self.window:
+                expired.append(key)
+        for key in expired:
+            x, y, total, _ = self.pending.pop(key)
+            self.spawn((x, y), total)
+
+    def update(self, dt):
+        self._age_pending(dt)
+        xs, ys, vxs, texts, lifes, styles = self.xs, self.ys, self.vxs, self.texts, self.lifes, self.styles
+        rise = self.rise_speed * dt
+        n = len(texts)
+        keep = 0
+        for i in range(n):
+            life = lifes[i] - dt
+            if life <= 0: continue
+            # 存活的数字前移到 keep 位置 (原地压缩)
+            xs[keep] = xs[i] + vxs[i] * dt
+            ys[keep] = ys[i] - rise
+            vxs[keep] = vxs[i]
+            texts[keep] = texts[i]
+            lifes[keep] = life
+            styles[keep] = styles[i]
+            keep += 1
+        if keep < n:
+            del xs[keep:], ys[keep:], vxs[keep:], texts[keep:], lifes[keep:], styles[keep:]
+
+    def draw(self, surface, offset):
+        if not self.texts: return
+        atlases = self.atlases
+        ox, oy = offset.x, offset.y
+        sw, sh = surface.get_size()
+        seq = []
+        for x, y, text, life, style in zip(self.xs, self.ys, self.texts, self.lifes, self.styles):
+            x -= ox
+            y -= oy
+            atlas = atlases[style]
+            # 屏幕外的数字直接跳过
+            if y < -atlas.height or y > sh or x > sw or x < -64: continue
+            widths = atlas.widths
+            glyphs = atlas.levels[atlas.level_for(life / self.life)]
+            for ch in text:
+                seq.append((glyphs[ch], (x, y)))
+                x += widths[ch]
+        if seq:
+            surface.blits(seq, doreturn=False)
+
+    def clear(self):
+        del self.xs[:], self.ys[:], self.vxs[:], self.texts[:], self.lifes[:], self.styles[:]
+        self.pending = {}
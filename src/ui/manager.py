@@ -1,36 +1,32 @@
 # ui/ui_manager.py (全量替换)
 import pygame
-import random
 from src.core.constants import *
+from src.ui.damage_numbers import DamageNumbers
 
 
 class UIManager:
     def __init__(self, engine):
         self.engine = engine
         self.display_surface = pygame.display.get_surface()
-        self.floating_texts = []
+        self.damage_numbers = DamageNumbers()  # 字形图集 + 紧凑数组存储
         self.menus = {}
 
     def add_menu(self, name, instance):
         self.menus[name] = instance
 
-    def spawn_damage_text(self, pos, amount):
-        font = pygame.font.SysFont("arial", 24, bold=True)
-        txt_surf = font.render(str(int(amount)), True, (255, 255, 255))
-
-        self.floating_texts.append({
-            'pos': pygame.Vector2(pos),
-            'surf': txt_surf,
-            'life': 1.0,
-            'vel': pygame.Vector2(random.uniform(-30, 30), -60)
-        })
+    def spawn_damage_text(self, pos, amount, victim=None, source=None, crit=False):
+        """同一目标、同一来源的连续小额伤害会合并显示 (victim 缺省时不合并)"""
+        if self.engine.headless:
+            return  # 无头模式不渲染伤害数字
+        key = (victim, source) if victim is not None else None
+        self.damage_numbers.add(pos, amount, key, crit)
 
     def update(self, dt):
-        for text in self.floating_texts[:]:
-            text['pos'] += text['vel'] * dt
-            text['life'] -= dt
-            if text['life'] <= 0:
-                self.floating_texts.remove(text)
+        self.damage_numbers.update(dt)
+
+    def clear_scene_state(self):
+        """切场景时丢弃属于旧场景的飘字 (合并中的数字还持有旧敌人的引用)"""
+        self.damage_numbers.clear()
 
     def draw(self, score):
         # 1. 只有在战斗场景时才画伤害数字
@@ -49,8 +45,4 @@ class UIManager:
     def _draw_floating_texts(self):
         # 核心修复点：从当前 scene 获取 all_sprites 的 offset
         offset = self.engine.scene.all_sprites.offset
-        for text in self.floating_texts:
-            alpha = int(text['life'] * 255)
-            text['surf'].set_alpha(alpha)
-            render_pos = text['pos'] - offset
-            self.display_surface.blit(text['surf'], render_pos)
\ No newline at end of file
+        self.damage_numbers.draw(self.display_surface, offset)
\ No newline at end of file
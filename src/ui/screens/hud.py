@@ -43,7 +43,8 @@ class HUD:
         info_surf = self.font.render(info_str, True, (0, 255, 240))
         self.display_surface.blit(info_surf, (WIDTH - 280, 30))
 
-        now_ms = pygame.time.get_ticks() // 1000
+        # 计时读场景的模拟时钟：暂停/升级期间不走表，快进时同步加速
+        now_ms = self.player.clock.get_ticks() // 1000
         time_str = f"{now_ms // 60:02d}:{now_ms % 60:02d}"
         t_surf = self.font.render(time_str, True, (255, 255, 255))
         self.display_surface.blit(t_surf, (WIDTH // 2 - t_surf.get_width() // 2, 20))
@@ -0,0 +1,67 @@
+# src/ui/screens/profiler_overlay.py
+import pygame
+from src.core.constants import *
+
+
+class ProfilerOverlay:
+    """性能浮层 (F3 开关)：帧耗时分位数、各阶段耗时、各精灵组实体数"""
+
+    def __init__(self, engine, refresh_frames=15):
+        self.engine = engine
+        self.profiler = engine.profiler
+        self.display_surface = pygame.display.get_surface()
+        self.font = pygame.font.SysFont("consolas", 14)
+
+        # 文字渲染本身也有开销：每 refresh_frames 帧才重排一次
+        self.refresh_frames = refresh_frames
+        self._frame_counter = 0
+        self._lines = []
+
+    def _entity_counts(self):
+        """
+        一劳永逸：自动发现场景上所有精灵组，新增组无需改这里
+        批量弹丸 / 宝石场这类非精灵层不在组里，计入对应的组，否则数组化之后浮层上的数量会大幅偏低
+        """
+        scene = self.engine.scene
+        counts = {}
+        for name, value in vars(scene).items():
+            if isinstance(value, pygame.sprite.AbstractGroup):
+                counts[name] = len(value)
+
+        weapon_manager = getattr(scene, 'weapon_manager', None)
+        if weapon_manager is not None and 'projectile_group' in counts:
+            counts['projectile_group'] += weapon_manager.batched_projectile_count()
+        if hasattr(scene, 'gem_count') and 'gem_group' in counts:
+            counts['gem_group'] = scene.gem_count()
+        return counts
+
+    def _rebuild_lines(self):
+        summary = self.profiler.summary()
+        frame = summary["frame_ms"]
+        lines = [
+            f"FRAME  p50 {frame['p50']:5.2f}  p95 {frame['p95']:5.2f}  p99 {frame['p99']:5.2f}  max {frame['max']:5.2f} ms",
+        ]
+        # 按均值从高到低，瓶颈一眼可见
+        sections = sorted(summary["sections_ms"].items(), key=lambda kv: kv[1]["mean"], reverse=True)
+        for name, stat in sections:
+            lines.append(f"{name:<16} {stat['mean']:6.2f}  (p95 {stat['p95']:5.2f})")
+        for name, n in self._entity_counts().items():
+            lines.append(f"#{name:<15} {n:6d}")
+
+        self._lines = [self.font.render(text, True, (0, 255, 150)) for text in lines]
+
+    def draw(self):
+        if self._frame_counter % self.refresh_frames == 0:
+            self._rebuild_lines()
+        self._frame_counter += 1
+
+        if not self._lines: return
+        width = max(s.get_width() for s in self._lines) + 16
+        height = len(self._lines) * 16 + 12
+        panel = pygame.Rect(WIDTH - width - 10, HEIGHT - height - 20, width, height)
+
+        bg = pygame.Surface(panel.size, pygame.SRCALPHA)
+        bg.fill((0, 0, 0, 170))
+        self.display_surface.blit(bg, panel.topleft)
+        for i, surf in enumerate(self._lines):
+            self.display_surface.blit(surf, (panel.x + 8, panel.y + 6 + i * 16))
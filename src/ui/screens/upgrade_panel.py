@@ -66,9 +66,10 @@ class UpgradePanel:
 
                 pool.append({"type": cand['type'], "name": w_name, "desc": w_desc, "raw_data": cand})
 
-        # 随机抽取 3 个
+        # 随机抽取 3 个 (战斗场景内走种子化的升级流，保证可复现)
         count = min(3, len(pool))
-        self.options = random.sample(pool, count)
+        rng = scene.rng.get("upgrades") if hasattr(scene, 'rng') else random
+        self.options = rng.sample(pool, count)
 
     def reroll(self):
         # 维度 5: 检测玩家特权标签
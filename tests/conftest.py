@@ -0,0 +1,11 @@
+# tests/conftest.py
+import os
+import sys
+
+# 无头运行：pygame 不需要真实的显示 / 音频设备
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,81 @@
+import pygame
+from src.core.random_streams import RandomStreams
+from src.combat.collision import CollisionSystem
+
+MATRIX = [("enemies", "projectiles"), ("player", "enemies"), ("player", "gems")]
+
+
+class Box(pygame.sprite.Sprite):
+    def __init__(self, group, x, y, w, h):
+        super().__init__(group)
+        self.rect = pygame.Rect(x, y, w, h)
+
+
+def _scatter(rng, group, count, size):
+    for _ in range(count):
+        Box(group, rng.randint(-400, 400), rng.randint(-400, 400), *size)
+
+
+def _build(seed):
+    rng = RandomStreams(seed).get("collision")
+    layers = {name: pygame.sprite.Group() for name in ("enemies", "projectiles", "player", "gems")}
+    _scatter(rng, layers["enemies"], 300, (40, 40))
+    _scatter(rng, layers["projectiles"], 120, (10, 10))
+    _scatter(rng, layers["gems"], 80, (12, 12))
+    Box(layers["player"], -30, -30, 60, 60)
+    system = CollisionSystem(MATRIX)
+    for name, group in layers.items():
+        system.add_layer(name, group)
+    return system, layers
+
+
+def _brute_force(layers, pair):
+    return {(a, b) for a in layers[pair[0]] for b in layers[pair[1]] if a.rect.colliderect(b.rect)}
+
+
+def test_detect_matches_brute_force_once_per_pair():
+    system, layers = _build(3)
+    contacts = system.detect()
+    assert set(contacts) == set(MATRIX)
+    for pair in MATRIX:
+        found = contacts[pair]
+        assert len(found) == len(set(found))  # 跨格子的一对只报一次
+        assert set(found) == _brute_force(layers, pair)
+    assert contacts[("enemies", "projectiles")]  # 种子下确实有接触，避免空对空通过
+
+
+def test_detect_subset_only_reports_requested_pairs():
+    system, layers = _build(5)
+    contacts = system.detect([("player", "gems")])
+    assert list(contacts) == [("player", "gems")]
+    assert set(contacts[("player", "gems")]) == _brute_force(layers, ("player", "gems"))
+
+
+def test_detect_is_reproducible():
+    first, _ = _build(11)
+    second, _ = _build(11)
+    a = first.detect()
+    b = second.detect()
+    for pair in MATRIX:
+        assert [(x.rect.topleft, y.rect.topleft) for x, y in a[pair]] == \
+               [(x.rect.topleft, y.rect.topleft) for x, y in b[pair]]
+
+
+def test_source_layer_is_dispatched_with_its_partner_layer():
+    system, layers = _build(7)
+    calls = []
+
+    def batch_contacts(enemies):
+        calls.append(enemies)
+        return [(next(iter(enemies)), 0)]
+
+    system.matrix.insert(0, ("enemies", "batches"))
+    system.add_source("batches", batch_contacts)
+    contacts = system.detect([("enemies", "batches"), ("enemies", "projectiles")])
+
+    assert calls == [layers["enemies"]]
+    assert contacts[("enemies", "batches")] == [(next(iter(layers["enemies"])), 0)]
+    assert set(contacts[("enemies", "projectiles")]) == _brute_force(layers, ("enemies", "projectiles"))
+    # 不在本次检测范围内的层对不调用数据源
+    system.detect([("player", "gems")])
+    assert len(calls) == 1
@@ -0,0 +1,63 @@
+import pytest
+import pygame
+from src.core.random_streams import RandomStreams
+
+pytest.importorskip("numpy")
+from src.entities.enemies.enemy_swarm import EnemySwarm
+
+
+class Member:
+    def __init__(self):
+        self.config = {"id": "basic_grunt"}
+        self.rect = pygame.Rect(0, 0, 10, 10)
+        self.slot = None
+
+
+def _fill(swarm, rng, count):
+    expected = {}
+    for _ in range(count):
+        enemy = Member()
+        pos = (rng.uniform(-500, 500), rng.uniform(-500, 500))
+        hp = float(rng.randint(1, 100))
+        enemy.slot = swarm.add(enemy, pos, hp, 100.0)
+        expected[enemy] = (pos, hp)
+    return expected
+
+
+def _check_rows(swarm, expected):
+    assert swarm.count == len(swarm.members) == len(expected)
+    for slot, enemy in enumerate(swarm.members):
+        assert enemy.slot == slot
+        pos, hp = expected[enemy]
+        assert tuple(swarm.pos[slot]) == pos
+        assert swarm.hp[slot] == hp
+
+
+def test_tail_swap_keeps_rows_with_their_members():
+    rng = RandomStreams(99).get("swarm")
+    swarm = EnemySwarm(capacity=4)  # 小容量：顺带覆盖扩容时的整列拷贝
+    expected = _fill(swarm, rng, 40)
+    assert swarm.capacity >= 40
+    _check_rows(swarm, expected)
+
+    while expected:
+        enemy = rng.choice(swarm.members)
+        final_pos, final_hp = swarm.remove(enemy)
+        assert (final_pos, final_hp) == expected.pop(enemy)
+        _check_rows(swarm, expected)
+
+
+def test_remove_last_and_only_member():
+    swarm = EnemySwarm(capacity=2)
+    rng = RandomStreams(1).get("swarm")
+    expected = _fill(swarm, rng, 2)
+    last = swarm.members[-1]
+    swarm.remove(last)
+    expected.pop(last)
+    _check_rows(swarm, expected)
+
+    only = swarm.members[0]
+    swarm.remove(only)
+    assert swarm.count == 0 and swarm.members == []
+    # 删空后再加从第 0 行开始
+    assert swarm.add(Member(), (1.0, 2.0), 5.0, 100.0) == 0
@@ -0,0 +1,71 @@
+from src.core.random_streams import RandomStreams
+from src.core.event_bus import EventBus, EnemyDied
+
+
+def test_drop_scope_only_removes_that_scope():
+    bus = EventBus()
+    scene, engine = object(), object()
+    calls = []
+    bus.subscribe("PING", lambda: calls.append("scene"), scope=scene)
+    bus.subscribe("PING", lambda: calls.append("engine"), scope=engine)
+    bus.subscribe("PING", lambda: calls.append("global"))
+
+    bus.drop_scope(scene)
+    bus.emit("PING")
+    assert calls == ["engine", "global"]
+    assert scene not in bus.scopes and engine in bus.scopes
+
+
+def test_unsubscribe_releases_scope_entry():
+    bus = EventBus()
+    scope = object()
+    sub = bus.subscribe("PING", print, scope=scope)
+    bus.unsubscribe(sub)
+    assert bus.scopes == {}  # 作用域不再持有已注销的订阅
+    assert bus.listeners["PING"] == []
+
+    def callback():
+        pass
+
+    bus.subscribe("PING", callback, scope=scope)
+    bus.unsubscribe("PING", callback)
+    assert bus.scopes == {}
+
+
+def test_scoped_subscriptions_stay_consistent_under_random_churn():
+    rng = RandomStreams(8).get("event_bus")
+    bus = EventBus()
+    scopes = [object() for _ in range(4)]
+    live = []
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.5 or not live:
+            live.append(bus.subscribe(rng.choice(("A", "B")), print, scope=rng.choice(scopes + [None])))
+        elif action < 0.85:
+            sub = live.pop(rng.randrange(len(live)))
+            bus.unsubscribe(sub)
+        else:
+            scope = rng.choice(scopes)
+            bus.drop_scope(scope)
+            live = [s for s in live if s.scope is not scope]
+
+        listed = [s for subs in bus.listeners.values() for s in subs]
+        assert sorted(map(id, listed)) == sorted(map(id, live))
+        scoped = [s for subs in bus.scopes.values() for s in subs]
+        assert sorted(map(id, scoped)) == sorted(id(s) for s in live if s.scope is not None)
+        assert all(bus.scopes.values())  # 没有空作用域残留
+
+
+def test_batch_subscriber_gets_one_list_per_flush():
+    bus = EventBus()
+    batches, singles = [], []
+    bus.subscribe("ENEMY_DIED", batches.append, batch=True)
+    bus.subscribe("ENEMY_DIED", singles.append)
+    events = [EnemyDied(i, None) for i in range(3)]
+    for event in events:
+        bus.post(event)
+    bus.flush()
+    assert batches == [events]
+    assert singles == events
+    bus.flush()
+    assert len(batches) == 1
@@ -0,0 +1,88 @@
+import os
+import pytest
+import pygame
+from src.core.random_streams import RandomStreams
+from src.core.constants import GEM_MERGE_CELL
+
+pytest.importorskip("numpy")
+from src.entities.pickups.gem_field import GemField
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Stat:
+    def __init__(self, value):
+        self.value = value
+
+
+class Stats:
+    pickup_range = Stat(0)
+
+
+class Holder:
+    def __init__(self):
+        self.pos = pygame.math.Vector2(0, 0)
+        self.stats = Stats()
+
+
+@pytest.fixture
+def field():
+    pygame.init()
+    return GemField(Holder(), capacity=4)
+
+
+def test_merge_sums_value_at_weighted_centre(field):
+    cs = GEM_MERGE_CELL
+    field.add((10, 10), 10)
+    field.add((cs + 5, 5), 7)  # 另一个格子，保持不动
+    field.add((30, 10), 30)
+    field.add((20, 40), 20)
+    field.magnet[3] = True  # 已被吸附的不参与合并
+    assert field.merge() == 1
+    assert field.count == 3
+    assert list(field.value[:3]) == [40, 7, 20]
+    assert tuple(field.pos[0]) == pytest.approx(((10 * 10 + 30 * 30) / 40, 10))
+    assert field.merged == 1
+
+
+def test_merge_and_collect_conserve_experience(field):
+    rng = RandomStreams(5).get("gems")
+    for _ in range(300):
+        field.add((rng.uniform(-400, 400), rng.uniform(-400, 400)), rng.randint(1, 5))
+    total = field.value[:field.count].sum()
+    removed = field.merge()
+    assert removed > 0 and field.count == 300 - removed
+    assert field.value[:field.count].sum() == total
+
+    picked = field.collect(pygame.Rect(-200, -200, 400, 400))
+    assert picked
+    assert sum(picked) + field.value[:field.count].sum() == total
+    assert field.collect(pygame.Rect(-200, -200, 400, 400)) == []
+
+
+@pytest.fixture
+def combat(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    from src.core.engine import GameEngine
+    from src.core.registry import registry
+    engine = GameEngine(headless=True, seed=3)
+    engine.switch_scene("COMBAT", registry.characters["cypher_ghost"])
+    return engine
+
+
+def test_one_merged_gem_can_cross_several_levels(combat):
+    scene = combat.scene
+    player = scene.player
+    # 100 + 130 + 169 = 399：刚好连升三级
+    scene._on_gem_values([399])
+    assert player.level == 4
+    assert combat.state == "UPGRADING"
+    assert scene.pending_upgrades == 2  # 第一张卡已经弹出
+
+    picks = 0
+    while combat.state == "UPGRADING":
+        combat.auto_upgrade()
+        picks += 1
+        assert picks <= 3
+    assert picks == 3
+    assert scene.pending_upgrades == 0
@@ -0,0 +1,80 @@
+import math
+import pytest
+import pygame
+from src.core.random_streams import RandomStreams
+from src.core.sim_clock import SimClock
+from src.core.constants import SIM_DT
+
+pytest.importorskip("numpy")
+from src.combat.projectiles.motion_program import MotionProgram, PHASE_LINEAR, PHASE_ROTATE, PHASE_NONE
+from src.combat.projectiles.projectile_batch import ProjectileBatch
+from src.entities.universal_projectile import UniversalProjectile
+
+BOOMERANG = {
+    "id": "test_boomerang",
+    "logic": {"phases": [
+        {"type": "linear", "speed": 700, "duration": 0.3},
+        {"type": "rotate", "radius": 40, "duration": 0.2, "rotation_speed": 15},
+        {"type": "wobble", "duration": 0.1},  # 未知类型：只计时不移动
+        {"type": "homing_player", "speed_start": 300, "accel": 600, "duration": 2.0},
+    ]},
+}
+
+
+class Player:
+    def __init__(self):
+        self.pos = pygame.math.Vector2(0, 0)
+        self.clock = SimClock()
+
+
+def test_program_compiles_defaults_and_sentinel():
+    program = MotionProgram([{"type": "linear"}, {"type": "rotate", "radius": 12}, {"type": "bogus"}])
+    assert program.length == 3
+    assert list(program.kind) == [PHASE_LINEAR, PHASE_ROTATE, PHASE_NONE, PHASE_NONE]
+    assert list(program.speed[:2]) == [600, 600]
+    assert list(program.radius[:2]) == [30, 12]
+    assert list(program.duration) == [1.0, 1.0, 1.0, math.inf]  # 末尾哨兵永不切换
+    assert MotionProgram.from_config({}).length == 1
+
+
+def test_batch_follows_universal_projectile_phase_by_phase():
+    pygame.init()
+    rng = RandomStreams(2024).get("projectiles")
+    player = Player()
+    batch = ProjectileBatch(player, BOOMERANG, capacity=2)
+    group = pygame.sprite.Group()
+    singles = []
+    for _ in range(6):
+        direction = pygame.math.Vector2(1, 0).rotate(rng.uniform(0, 360))
+        start = (rng.uniform(-50, 50), rng.uniform(-50, 50))
+        batch.spawn(start, direction, 10.0)
+        singles.append(UniversalProjectile(start, direction, [group], player, BOOMERANG, damage=10.0))
+
+    for _ in range(400):
+        player.clock.advance(SIM_DT)
+        batch.update(SIM_DT)
+        for shot in list(group):
+            shot.update(SIM_DT)
+        # 存活的行与存活的精灵一一对应 (两边都按原顺序保留)
+        alive = [shot for shot in singles if shot.alive()]
+        assert batch.count == len(alive)
+        for row, shot in enumerate(alive):
+            assert batch.pos[row, 0] == pytest.approx(shot.pos.x, abs=1e-6)
+            assert batch.pos[row, 1] == pytest.approx(shot.pos.y, abs=1e-6)
+            assert batch.phase[row] == shot.current_phase_idx
+        if batch.count == 0:
+            break
+    assert batch.count == 0  # 回旋镖全部飞回玩家身边被回收
+
+
+def test_contacts_only_reports_overlapping_rows():
+    pygame.init()
+    player = Player()
+    batch = ProjectileBatch(player, {"logic": {"phases": [{"type": "linear", "speed": 0, "duration": 5}]}})
+    group = pygame.sprite.Group()
+    enemy = pygame.sprite.Sprite(group)
+    enemy.rect = pygame.Rect(100, 100, 40, 40)
+    batch.spawn((0, 0), (1, 0), 5.0)
+    batch.spawn((110, 115), (1, 0), 5.0)
+    batch.spawn((500, 500), (1, 0), 5.0)
+    assert batch.contacts(group) == [(enemy, 1)]
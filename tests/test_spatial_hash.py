@@ -0,0 +1,69 @@
+import pygame
+from src.core.random_streams import RandomStreams
+from src.combat.spatial_hash import SpatialHash
+
+
+class Dot:
+    def __init__(self, x, y):
+        self.pos = pygame.math.Vector2(x, y)
+
+    def alive(self):
+        return True
+
+
+class CountingCells(dict):
+    """记录被查询过的格子"""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.visited = set()
+
+    def get(self, key, default=None):
+        self.visited.add(key)
+        return super().get(key, default)
+
+
+def _brute_force(items, pos, k):
+    return sorted(items, key=lambda d: (d.pos - pygame.math.Vector2(pos)).length_squared())[:k]
+
+
+def test_k_nearest_matches_linear_scan():
+    rng = RandomStreams(1234).get("spatial_hash")
+    items = [Dot(rng.uniform(-1500, 1500), rng.uniform(-1500, 1500)) for _ in range(400)]
+    grid = SpatialHash(128)
+    grid.rebuild(items)
+    for _ in range(50):
+        pos = (rng.uniform(-1600, 1600), rng.uniform(-1600, 1600))
+        for k in (1, 5, 17):
+            assert grid.k_nearest(pos, k) == _brute_force(items, pos, k)
+
+
+def test_outer_ring_can_beat_same_cell():
+    # 同格的角落比相邻格里的点更远：第 0 圈找到 1 个不能立即返回
+    corner = Dot(127, 127)
+    neighbour = Dot(-10, 5)
+    grid = SpatialHash(128)
+    grid.rebuild([corner, neighbour])
+    assert grid.k_nearest((5, 5), 1) == [neighbour]
+    assert grid.k_nearest((5, 5), 2) == [neighbour, corner]
+
+
+def test_search_stops_before_far_cluster():
+    near = [Dot(10 + i, 20) for i in range(5)]
+    far = [Dot(50 * 128 + i, 50 * 128) for i in range(5)]
+    grid = SpatialHash(128)
+    grid.rebuild(near + far)
+    grid.cells = CountingCells(grid.cells)
+
+    assert grid.k_nearest((0, 0), 3) == near[:3]
+    # 命中的都在第 0 圈，第 1 圈确认没有更近的就停，不会一路扫到 50 圈外
+    assert max(max(abs(cx), abs(cy)) for cx, cy in grid.cells.visited) <= 1
+
+
+def test_max_radius_limits_result():
+    grid = SpatialHash(64)
+    items = [Dot(30, 0), Dot(200, 0), Dot(1000, 0)]
+    grid.rebuild(items)
+    assert grid.k_nearest((0, 0), 3, max_radius=250) == items[:2]
+    assert grid.nearest((900, 0), max_radius=50) is None
+    assert SpatialHash().k_nearest((0, 0), 3) == []
@@ -0,0 +1,59 @@
+import pickle
+import pytest
+from src.core.random_streams import RandomStreams
+from src.combat.weapon_spec import SPEC_DEFAULTS, compile_spec, compile_specs, spec_at
+
+CONFIG = {
+    "id": "test_gun",
+    "logic_type": "projectile",
+    "damage": 12,
+    "max_level": 6,
+    "logic": {"cooldown": 450, "phases": [{"type": "linear", "speed": 900}]},
+    "params": {"count": 1, "angle_spread": 20},
+    "levels": {
+        "1": {"damage": 15},
+        "3": {"damage": 30, "count": 3},
+        "5": {"cooldown": 300},
+    },
+}
+
+
+def test_missing_level_uses_highest_lower_entry():
+    specs = compile_specs(CONFIG)
+    assert len(specs) == 6
+    assert [s.damage for s in specs] == [15, 15, 30, 30, 12, 12]  # LV.5 的条目没写伤害，回退到根节点
+    assert [s.count for s in specs] == [1, 1, 3, 3, 1, 1]
+    assert [s.cooldown for s in specs] == [450, 450, 450, 450, 300, 300]
+    assert specs[5].angle_spread == 20
+    assert specs[0].base_damage == 12  # 基础伤害只读根节点
+
+
+def test_defaults_and_logic_defaults():
+    spec = compile_spec({"id": "bare", "logic_type": "projectile"}, 1)
+    for name in ("damage", "cooldown", "count", "radius", "is_attached", "tick_interval"):
+        assert getattr(spec, name) == SPEC_DEFAULTS[name]
+    orbital = compile_spec({"id": "orb", "logic_type": "orbital"}, 1)
+    assert orbital.radius == 120
+    assert compile_spec({"id": "orb", "logic_type": "orbital", "radius": 80}, 1).radius == 80
+
+
+def test_spec_at_clamps_and_spec_is_read_only():
+    specs = compile_specs(CONFIG)
+    assert spec_at(specs, 0) is specs[0]
+    assert spec_at(specs, 99) is specs[-1]
+    with pytest.raises(AttributeError):
+        specs[0].damage = 1
+    clone = pickle.loads(pickle.dumps(specs[2]))
+    assert (clone.level, clone.damage, clone.phases) == (3, 30, specs[2].phases)
+
+
+def test_random_level_tables_match_manual_lookup():
+    rng = RandomStreams(21).get("weapon_spec")
+    for _ in range(30):
+        levels = {str(lv): {"damage": rng.randint(1, 99)} for lv in sorted(rng.sample(range(1, 9), 3))}
+        config = {"id": "rand", "logic_type": "projectile", "damage": 7, "max_level": 8, "levels": levels}
+        specs = compile_specs(config)
+        for level in range(1, 9):
+            lower = [int(k) for k in levels if int(k) <= level]
+            expected = levels[str(max(lower))]["damage"] if lower else 7
+            assert spec_at(specs, level).damage == expected